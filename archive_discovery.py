@@ -31,6 +31,8 @@ if sys.platform.startswith('win'):
 import requests
 import re
 import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, urljoin
 from PySide6.QtWidgets import (
@@ -39,7 +41,7 @@ from PySide6.QtWidgets import (
     QListWidget, QListWidgetItem, QDialog, QGridLayout, QComboBox,
     QTextEdit, QScrollArea, QFrame, QProgressBar, QCheckBox, QDateEdit,
     QAbstractItemView, QFileDialog, QSpinBox, QInputDialog, QSizePolicy,
-    QProgressDialog, QAbstractButton
+    QProgressDialog, QAbstractButton, QDoubleSpinBox
 )
 from PySide6.QtCore import QThread, Signal, QTimer, Qt, QDate, QPropertyAnimation, QRectF, QSize, QObject, Slot
 from PySide6.QtGui import QFont, QIcon, QPalette, QColor, QLinearGradient, QPainter
@@ -56,6 +58,25 @@ from os.path import basename
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebChannel import QWebChannel
 from element_selector import SelectorDialog as FixedSelectorDialog
+import archive_http
+import async_fetch
+import html_cache
+import extraction_journal
+from snapshot_index import SnapshotIndex
+from discovery_session import DiscoverySession
+from discovery_categorizer import DiscoveryCategorizer
+from snapshot_store import UrlTimeline, capture_url, raw_capture_url, IMAGE_MODIFIER
+from capture_timeline import CaptureTimeline, MONTH_DIVISOR, format_month
+from parallel_categorizer import default_worker_count, PARALLEL_MIN_URLS
+import url_classifier
+import url_canonical
+from url_canonical import canonicalize, url_domain
+
+DEFAULT_URL_REQUEST_BUDGET = 8  # İçerik çekerken bir URL için yapılabilecek en fazla HTTP isteği
+
+# Toplu keşifte bir domainin sonucu; seçim ve çekme için sonradan ana pencereye yüklenir
+BatchDomainResult = namedtuple('BatchDomainResult', ['domain', 'session', 'categories', 'total_snapshots', 'used_snapshots',
+                                                     'start_date', 'end_date', 'elapsed', 'error'])
 
 class QSwitch(QAbstractButton):
     def __init__(self, parent=None, label=None):
@@ -132,281 +153,144 @@ class QSwitch(QAbstractButton):
 class ArchiveDiscovery(QThread):
     """Archive.org'dan domain keşfi yapan thread"""
     progress = Signal(str)
+    partial_results = Signal(object)  # İndirme sürerken (categories, toplam, kullanılan, ilk URL süresi)
     discovery_complete = Signal(object)
     error = Signal(str)
     
-    def __init__(self, domain, start_date=None, end_date=None, timeout_settings=None):
+    def __init__(self, domain, start_date=None, end_date=None, timeout_settings=None, session=None):
         super().__init__()
         self.domain = domain
         self.start_date = start_date
         self.end_date = end_date
         self.timeout_settings = timeout_settings or {'api_timeout': 60, 'retry_count': 3}
-    
+        self.session = session  # Domain analizinden gelen DiscoverySession
+        self.stop_requested = False
+        self.categorizer = DiscoveryCategorizer(self.timeout_settings, self.progress.emit)
+
+    # Sonuç sayaçları kategorize eden yardımcıda tutulur (toplu keşif sonucundan açılan keşifte dışarıdan atanır)
+    @property
+    def total_snapshots(self):
+        return self.categorizer.total_snapshots
+
+    @total_snapshots.setter
+    def total_snapshots(self, value):
+        self.categorizer.total_snapshots = value
+
+    @property
+    def used_snapshots(self):
+        return self.categorizer.used_snapshots
+
+    @used_snapshots.setter
+    def used_snapshots(self, value):
+        self.categorizer.used_snapshots = value
+
+    @property
+    def time_to_first_url(self):
+        """Keşif başlangıcından ilk URL'lerin listelenmesine kadar geçen süre (sn)"""
+        return self.categorizer.time_to_first_url
+
     def get_all_snapshots(self):
-        """Tüm domain için tek seferde tüm snapshot'ları çeker"""
-        try:
-            self.progress.emit("Archive.org API'sine bağlanılıyor...")
-            cdx_url = f"https://web.archive.org/cdx/search/cdx"
-            params = {
-                'url': self.domain + '/*',
-                'output': 'json',
-                'fl': 'timestamp,original',
-                'limit': 100000
-            }
-            
-            # Timeout ayarlarını kullan
-            api_timeout = self.timeout_settings.get('api_timeout', 60)
-            retry_count = self.timeout_settings.get('retry_count', 3)
-            
-            # Daha kısa timeout ve retry mekanizması
-            for attempt in range(retry_count):
-                try:
-                    self.progress.emit(f"Snapshot'lar alınıyor... (Deneme {attempt + 1}/{retry_count})")
-                    response = requests.get(cdx_url, params=params, timeout=api_timeout)
-                    if response.status_code == 200:
-                        break
-                    elif response.status_code == 429:  # Rate limit
-                        self.progress.emit("Rate limit! 30 saniye bekleniyor...")
-                        time.sleep(30)
-                    else:
-                        self.progress.emit(f"HTTP Hatası: {response.status_code}")
-                except requests.exceptions.Timeout:
-                    self.progress.emit(f"Timeout! Deneme {attempt + 1}/{retry_count} başarısız")
-                    if attempt == retry_count - 1:
-                        raise Exception(f"Archive.org yanıt vermiyor (timeout: {api_timeout}s)")
-                except requests.exceptions.ConnectionError:
-                    self.progress.emit(f"Bağlantı hatası! Deneme {attempt + 1}/{retry_count}")
-                    if attempt == retry_count - 1:
-                        raise Exception("İnternet bağlantısı hatası")
-            
-            if response.status_code != 200:
-                return []
-                
-            self.progress.emit("Veriler işleniyor...")
-            data = response.json()
-            if len(data) <= 1:
-                return []
-                
-            snapshots = []
-            total_rows = len(data) - 1
-            for i, row in enumerate(data[1:], 1):
-                if i % 1000 == 0:  # Her 1000 satırda bir ilerleme
-                    self.progress.emit(f"Snapshot'lar işleniyor... {i}/{total_rows}")
-                    
-                if len(row) >= 2:
-                    timestamp = row[0]
-                    original_url = row[1]
-                    archive_url = f"https://web.archive.org/web/{timestamp}/{original_url}"
-                    snapshots.append({
-                        'url': original_url,
-                        'archive_url': archive_url,
-                        'timestamp': timestamp,
-                        'original_url': original_url  # Port dahil orijinal URL'yi sakla
-                    })
-            
-            self.progress.emit(f"Toplam {len(snapshots)} snapshot alındı!")
-            self.last_total_snapshots = len(snapshots)
-            return snapshots
-        except Exception as e:
-            print(f"Snapshot alma hatası: {e}")
-            return []
+        """Tüm domain için snapshot'ları sütun bazlı depo olarak döndürür"""
+        return self.load_session().snapshots
+
+    def load_session(self, stop_check=None, progressive=True):
+        """Snapshot'ları oturuma yükler; domain analizinde indirildiyse CDX'e tekrar gidilmez.
+
+        progressive=True iken indirme sürerken ara kategoriler partial_results ile gönderilir.
+        """
+        session = self.session
+        if session is None or not session.matches(self.domain, self.timeout_settings):
+            # Paylaşılan oturum yoksa (veya ayarlar değiştiyse) bu keşif için yeni oturum aç
+            session = DiscoverySession(self.domain, self.timeout_settings, self.start_date, self.end_date)
+            self.session = session
+        return self.categorizer.load(session, self.start_date, self.end_date,
+                                     stop_check or (lambda: self.stop_requested),
+                                     progressive, self.partial_results.emit)
 
     def get_min_max_dates(self, snapshots):
-        """Snapshot listesinden min ve max yıl-ay döndürür"""
-        if not snapshots:
-            return None, None
-        timestamps = [s['timestamp'] for s in snapshots if len(s['timestamp']) >= 6]
-        if not timestamps:
+        """Snapshot deposundan min ve max yıl-ay döndürür"""
+        timeline = CaptureTimeline(snapshots.timestamps)
+        if not len(timeline):
             return None, None
-        min_ts = min(timestamps)
-        max_ts = max(timestamps)
-        min_date = f"{min_ts[:4]}-{min_ts[4:6]}"
-        max_date = f"{max_ts[:4]}-{max_ts[4:6]}"
-        return min_date, max_date
+        return format_month(timeline.min() // MONTH_DIVISOR), format_month(timeline.max() // MONTH_DIVISOR)
+
+    def build_categories(self, report_progress=True):
+        """Oturumdaki depoyu seçili tarih aralığına göre dilimleyip kategorize eder"""
+        return self.categorizer.build_categories(self.session, self.start_date, self.end_date, report_progress)
+
+    def can_refilter(self):
+        """Tamamlanmış keşif, tarih aralığı değişince CDX'e gitmeden bellekte yeniden filtrelenebilir mi?"""
+        return (not self.isRunning() and self.session is not None
+                and self.session.loaded and self.session.covers_all_dates())
+
+    def refilter(self, start_date, end_date):
+        """Yeni tarih aralığını bellekteki snapshot'lara uygular ve keşif sonucunu döndürür"""
+        self.start_date = start_date
+        self.end_date = end_date
+        categories = self.build_categories(report_progress=False)
+        return categories, self.total_snapshots, self.used_snapshots
 
     def run(self):
         try:
             self.progress.emit("Archive.org'dan domain bilgileri alınıyor...")
-            all_snapshots = self.get_all_snapshots()
-            if not all_snapshots:
+            store = self.load_session().snapshots
+            if not len(store):
+                self.total_snapshots = 0
                 self.error.emit("Bu domain için hiç arşiv bulunamadı!")
                 return
-            min_date, max_date = self.get_min_max_dates(all_snapshots)
+            categories = self.build_categories()
+            categorizer = self.categorizer
+            if categorizer.time_to_first_url is None:
+                # İndirme ara sonuç üretmeden bitti (oturum hazırdı veya kısa sürdü)
+                categorizer.time_to_first_url = time.perf_counter() - categorizer.load_started
+            min_date, max_date = self.get_min_max_dates(store)
             self.available_dates = [min_date, max_date]
             self.progress.emit(f"Arşiv aralığı: {min_date} - {max_date}")
-            # Tarih aralığı seçildiyse filtrele
-            if self.start_date and self.end_date:
-                filtered = []
-                for snap in all_snapshots:
-                    snap_date = datetime.strptime(snap['timestamp'][:6], "%Y%m")
-                    # datetime.date ile datetime.datetime karşılaştırması için date() kullan
-                    snap_date_only = snap_date.date()
-                    if self.start_date <= snap_date_only <= self.end_date:
-                        filtered.append(snap)
-                used_snapshots = filtered
-            else:
-                used_snapshots = all_snapshots
-            self.progress.emit(f"Toplam {len(used_snapshots)} snapshot bulundu, kategorize ediliyor...")
-            categories = self.categorize_and_group_urls(used_snapshots)
             
             # Otomatik tespit artık URL listesinde buton ile yapılıyor
             
-            self.progress.emit(f"Keşif tamamlandı! {len(used_snapshots)} snapshot bulundu")
+            self.progress.emit(f"Keşif tamamlandı! {self.used_snapshots} snapshot bulundu (ilk URL'ler {self.time_to_first_url:.2f} sn'de)")
             # --- YENİ: Toplam çekilen snapshot sayısını da gönder ---
-            self.discovery_complete.emit((categories, len(all_snapshots), len(used_snapshots)))
+            self.discovery_complete.emit((categories, self.total_snapshots, self.used_snapshots))
             # --- SON YENİ ---
         except Exception as e:
             self.error.emit(f"Keşif hatası: {str(e)}")
     
     def normalize_url(self, url):
-        """URL'yi normalize eder"""
-        # Port numarasını kaldır - liste için normalize et
-        parsed = urlparse(url)
-        if parsed.port:
-            netloc = parsed.netloc.split(':')[0]
-            url = url.replace(f":{parsed.port}", "")
-        return url
+        """URL'yi normalize eder (port numarası kaldırılır)"""
+        return canonicalize(url).normalized
     
-    def categorize_and_group_urls(self, snapshots):
-        """URL'leri kategorilere ayırır ve aynı URL'nin tüm snapshot'larını gruplayarak döner (O(n) optimizasyonlu)"""
-        categories = {
-            'blog_posts': {},  # url: [snapshot, snapshot, ...]
-            'pages': {},
-            'images': {},
-            'documents': {},
-            'other': {}
-        }
-        # 1. Tüm snapshot'ları smart_url_key ile grupla
-        url_to_snapshots = {}
-        for snap in snapshots:
-            url = self.normalize_url(snap['url'])
-            if self.is_junk_url(url) or self.is_extra_junk(url):
-                continue
-            key = self.smart_url_key(url)
-            url_to_snapshots.setdefault(key, []).append(snap)
-        total = sum(len(snaps) for snaps in url_to_snapshots.values())
-        processed = 0
-        # 2. Her grup için kategorize et
-        for key, snaps in url_to_snapshots.items():
-            for snap in snaps:
-                url = self.normalize_url(snap['url'])
-                url_info = {
-                    'url': key,
-                    'archive_url': snap['archive_url'],
-                    'timestamp': snap['timestamp'],
-                    'all_snapshots': [s['timestamp'] for s in snaps],
-                    'original_url': snap.get('original_url', snap['url'])  # Port dahil orijinal URL
-                }
-                if self.is_image(url):
-                    categories['images'].setdefault(key, []).append(url_info)
-                elif self.is_document(url):
-                    categories['documents'].setdefault(key, []).append(url_info)
-                elif self.is_blog_post(url):
-                    categories['blog_posts'].setdefault(key, []).append(url_info)
-                elif self.is_page(url):
-                    categories['pages'].setdefault(key, []).append(url_info)
-                else:
-                    categories['other'].setdefault(key, []).append(url_info)
-                processed += 1
-                if processed % 1000 == 0 or processed == total:
-                    msg = f"Kategorize ediliyor... {processed}/{total}"
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
-                    if hasattr(self, 'progress'):
-                        self.progress.emit(msg)
-                    time.sleep(0.001)
-        # Blog postları en güncel snapshot'a göre sırala ve grupla
-        for key, snaps in categories['blog_posts'].items():
-            snaps_sorted = sorted(snaps, key=lambda s: s['timestamp'], reverse=True)
-            categories['blog_posts'][key] = snaps_sorted
-        print('KATEGORİ DAĞILIMI:')
-        for k, v in categories.items():
-            print(f"  {k}: {len(v)}")
-        return categories
+    def categorize_and_group_urls(self, snapshots, indices=None, report_progress=True):
+        """URL'leri kategorilere ayırır ve aynı URL'nin tüm snapshot'larını gruplar (DiscoveryCategorizer)"""
+        return self.categorizer.categorize_and_group_urls(snapshots, indices, report_progress)
     
     def is_junk_url(self, url):
         """İstenmeyen/sistem URL'lerini filtreler"""
-        junk_patterns = [
-            r'wp-login\.php', r'wp-admin', r'/feed/', r'/comments/feed/', 
-            r'/sitemap\.xml', r'/robots\.txt', r'\.json$', r'\.xml$', r'\.css$', r'\.js$',
-            r'\?replytocom', r'\.gz$', r'\.zip$', r'\.rar$', r'\.tar\.gz$'
-        ]
-        return any(re.search(pattern, url, re.IGNORECASE) for pattern in junk_patterns)
+        return url_classifier.is_junk_url(url)
     
     def is_blog_post(self, url):
         """Blog yazısı olup olmadığını kontrol eder (daha gevşek mantık)"""
-        parsed_url = urlparse(url)
-        path = parsed_url.path.lower()
-        # .html, .php, .asp, .aspx, .htm ile bitenler
-        if re.search(r'\.(html|php|asp|aspx|htm)$', path):
-            return True
-        # /YYYY/MM/DD/ veya /YYYY/MM/ ile başlayanlar ve sonrasında bir şey olanlar
-        if re.match(r'^/\d{4}/\d{2}/\d{2}/.+', path) or re.match(r'^/\d{4}/\d{2}/.+', path):
-            return True
-        # /blog/, /post/, /yazi/, /makale/, /haber/, /entry/, /story/ içerenler
-        if any(x in path for x in ['/blog/', '/post/', '/yazi/', '/makale/', '/haber/', '/entry/', '/story/']):
-            return True
-        # Son segmenti sayı olmayanlar (ve path uzunluğu > 1)
-        segments = [s for s in path.split('/') if s]
-        if segments and not re.match(r'^\d+$', segments[-1]) and len(segments) > 1:
-            return True
-        return False
+        return url_classifier.is_blog_post(url)
     
     def is_image(self, url):
         """Görsel olup olmadığını kontrol eder"""
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg', '.ico']
-        return any(url.lower().endswith(ext) for ext in image_extensions)
+        return url_classifier.is_image(url)
     
     def is_document(self, url):
         """Doküman olup olmadığını kontrol eder"""
-        doc_extensions = ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.xls', '.xlsx', '.ppt', '.pptx']
-        return any(url.lower().endswith(ext) for ext in doc_extensions)
+        return url_classifier.is_document(url)
     
     def is_page(self, url):
         """Sayfa olup olmadığını kontrol eder (Tarih bazlı arşivler dahil)"""
-        parsed_url = urlparse(url)
-        path = parsed_url.path.lower()
-        page_patterns = [
-            r'/page/', r'/sayfa/', r'/index', r'/home',
-            r'^/$', r'^/index\.html$', r'^/index\.php$',
-            r'/kategori/', r'/category/', r'/etiket/', r'/tag/',
-            r'/author/', r'/yazar/', r'/arsiv/', r'/archive/',
-            r'/search/', r'\?s=', r'^/\d{4}/\d{2}(/\d{2})?/?$'
-        ]
-        return any(re.search(pattern, path) for pattern in page_patterns)
+        return url_classifier.is_page(url)
     
     def is_extra_junk(self, url):
-        import re
-        extra_junk_patterns = [
-            r'wp-json', r'wp-includes', r'wp-content', r'contact-form-7', r'oembed',
-            r'\.js$', r'\.css$', r'\.jpg$', r'\.jpeg$', r'\.png$', r'\.gif$', r'\.svg$', r'\.ico$', r'\.xml$', r'\.json$', r'\.woff$', r'\.ttf$', r'\.pdf$', r'\.zip$', r'\.gz$', r'\.tar$', r'\.mp4$', r'\.mp3$', r'\.webp$', r'\.avi$', r'\.mov$', r'\.wmv$', r'\.flv$', r'\.mkv$', r'\.apk$', r'\.exe$', r'\.bin$', r'\.dmg$', r'\.msi$', r'\.tar\.gz$', r'\.rar$'
-        ]
-        return any(re.search(pattern, url, re.IGNORECASE) for pattern in extra_junk_patterns)
+        return url_classifier.is_extra_junk(url)
     
     # Otomatik tespit artık URL listesinde buton ile yapılıyor
 
     def smart_url_key(self, url):
-        from urllib.parse import urlparse
-        import re
-        parsed = urlparse(url)
-        path = parsed.path
-        # Varyasyonları (feed, amp, embed, print, trackback) ana yazıya bağla
-        for suffix in ['/feed', '/amp', '/embed', '/print', '/trackback']:
-            if path.endswith(suffix):
-                path = path[:-len(suffix)]
-        # Sonunda / varsa kaldır (kök dizin hariç)
-        if path.endswith('/') and path != '/':
-            path = path[:-1]
-        # index.html, index.php, index.htm kaldır
-        for idx in ['index.html', 'index.php', 'index.htm']:
-            if path.endswith('/'+idx):
-                path = path[:-(len(idx)+1)]
-        # .html, .htm kaldır
-        for ext in ['.html', '.htm']:
-            if path.endswith(ext):
-                path = path[:-len(ext)]
-        # www kaldır
-        netloc = parsed.netloc.replace('www.', '')
-        return f"{netloc}{path}".lower()
+        return url_canonical.smart_url_key(url)
 
 class ContentExtractor(QThread):
     """Seçilen içerikleri çeken thread"""
@@ -422,64 +306,225 @@ class ContentExtractor(QThread):
         self.timeout_settings = timeout_settings or {'content_timeout': 20, 'retry_count': 2}
         self.mainwindow = mainwindow
         self.stop_requested = False
+        self.journal = None  # extraction_journal.ExtractionJob (run başında açılır)
+        self.resumed_content = []  # Günlükten yüklenen içerikler (soup'ları çekim sonunda eklenir)
+        self.concurrent = False  # Eşzamanlı modda request_delay beklenmez, sadece ortak hız denetleyicisi uygulanır
     
     def run(self):
         try:
             total = len(self.selected_urls)
             self.progress.emit(f"Toplam 0/{total} içerik çekilecek...")
+            pending = self.resume_from_journal()
+            workers = self.timeout_settings.get('extract_workers', 1)
+            if workers > 1 and len(pending) > 1:
+                self.run_concurrent(min(workers, len(pending)), pending)
+                return
             delay = self.timeout_settings.get('request_delay', 3)
-            for i, url_info in enumerate(self.selected_urls, 1):
+            for i, url_info in pending:
+                if self.stop_requested:
+                    break
                 self.progress.emit(f"Çekiliyor ({i}/{total}): {url_info['url']}")
+                self.journal.mark_fetching(url_info['url'])
                 try:
                     content = self.extract_single_content(url_info)
-                    if content:
-                        self.extracted_content.append(content)
-                        self.content_extracted.emit(content)
-                        self.progress.emit(f"✅ Başarılı: {url_info['url']}")
-                    else:
-                        self.progress.emit(f"❌ Başarısız: {url_info['url']}")
                 except Exception as e:
+                    self.journal.mark_failed(url_info['url'], str(e))
                     self.progress.emit(f"❌ Hata: {url_info['url']} - {e}")
                     continue
+                self.record_result(url_info, content)
                 time.sleep(delay)
             self.progress.emit(f"Çekme tamamlandı! {len(self.extracted_content)} içerik başarıyla çekildi!")
+            self.report_cache_stats()
+            self.restore_resumed_soups()
             self.extraction_complete.emit(self.extracted_content)
         except Exception as e:
             self.error.emit(f"Çekme hatası: {str(e)}")
+
+    def resume_from_journal(self):
+        """Seçim için çekme günlüğünü açar; önceki çalışmada tamamlanan içerikleri anında
+        yayınlar ve çekilecek (sıra, url_info) listesini döndürür.
+
+        Bekleyen, yarıda kesilen (çekiliyor) ve başarısız URL'ler yeniden çekilir.
+        """
+        resume = self.timeout_settings.get('resume_extraction', True)
+        self.journal = extraction_journal.open_job([u['url'] for u in self.selected_urls],
+                                                   self.extraction_settings_key(), resume=resume)
+        if self.journal.invalidated:
+            self.progress.emit("♻️ Selector'lar, çekme ayarları veya snapshot'lar değiştiği için önceki çalışmanın sonuçları kullanılmayacak")
+        completed = self.journal.completed() if resume else {}
+        pending = []
+        for position, url_info in enumerate(self.selected_urls, 1):
+            content = completed.get(url_info['url'])
+            if content is None:
+                pending.append((position, url_info))
+                continue
+            self.resumed_content.append(content)
+            self.extracted_content.append(content)
+            self.content_extracted.emit(content)
+        if completed:
+            self.progress.emit(f"♻️ Önceki çalışmadan {len(self.extracted_content)} içerik yüklendi, {len(pending)} URL çekilecek")
+        return pending
+
+    def extraction_settings_key(self):
+        """Çekim sonucunu etkileyen ayarların günlük parmak izi; değişirse önceki sonuçlar kullanılmaz"""
+        settings = {key: self.timeout_settings.get(key) for key in
+                    ('raw_captures', 'url_request_budget', 'retry_count')}
+        settings['global_selectors'] = getattr(self.mainwindow, 'global_selectors', None)
+        settings['domain_selectors'] = getattr(self.mainwindow, 'domain_selectors', None)
+        return extraction_journal.settings_key(settings, self.selected_urls)
+
+    def restore_resumed_soups(self):
+        """Günlükten yüklenen içeriklere taze çekimdekiyle aynı tam sayfa soup'unu ekler.
+
+        Sayfa HTML önbelleğinden alınır (istek yapılmaz), aynı parser ile ayrıştırılıp
+        extract_main_content'ten geçirilir. Önbellekte olmayanların soup'u extraction_finished'da
+        ana içerikten oluşturulur.
+        """
+        raw_captures = self.timeout_settings.get('raw_captures', True)
+        missing = 0
+        for content in self.resumed_content:
+            original_url = content.get('original_url', content['url'])
+            response = archive_http.cached_response(capture_url(content['timestamp'], original_url, raw=raw_captures))
+            if response is None:
+                missing += 1
+                continue
+            if response.encoding == 'ISO-8859-1':
+                response.encoding = 'utf-8'
+            soup = self.parse_page(response.text)
+            self.extract_main_content(soup, (content['timestamp'], original_url) if raw_captures else None)
+            content['soup'] = soup
+        if missing:
+            self.progress.emit(f"⚠️ Önceki çalışmadan yüklenen {missing} içeriğin sayfası önbellekte yok; kategoriler sadece ana içerikten çıkarılacak")
+
+    def record_result(self, url_info, content):
+        """Çekim sonucunu günlüğe yazar ve yayınlar"""
+        if content:
+            self.journal.mark_done(url_info['url'], content)
+            self.extracted_content.append(content)
+            self.content_extracted.emit(content)
+            self.progress.emit(f"✅ Başarılı: {url_info['url']}")
+        else:
+            self.journal.mark_failed(url_info['url'], "içerik çekilemedi")
+            self.progress.emit(f"❌ Başarısız: {url_info['url']}")
+
+    def run_concurrent(self, workers, pending):
+        """URL'leri işçi havuzunda eşzamanlı çeker.
+
+        Tüm işçiler istek başına ortak hız denetleyicisinden hak alır (request_delay beklenmez);
+        sonuçlar tamamlanma sırasına bakılmadan seçim sırasıyla yayınlanır.
+        """
+        total = len(self.selected_urls)
+        self.concurrent = True
+        controller = archive_http.RATE_CONTROLLER
+        self.progress.emit(f"Eşzamanlı çekim: {workers} işçi, {controller.rate:.2g} istek/sn ile başlanıyor (en fazla {controller.max_rate:g})")
+
+        def extract(position, url_info):
+            if self.stop_requested:
+                return None
+            self.progress.emit(f"Çekiliyor ({position}/{total}): {url_info['url']}")
+            self.journal.mark_fetching(url_info['url'])
+            try:
+                return self.extract_single_content(url_info)
+            except Exception as e:
+                self.progress.emit(f"❌ Hata: {url_info['url']} - {e}")
+                return None
+
+        # Havuz sadece bu çekim boyunca işçi sayısına büyütülür, sonra ayardaki boyuta döner
+        with archive_http.pool_size_at_least(workers), ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(extract, position, url_info) for position, url_info in pending]
+            try:
+                for (_, url_info), future in zip(pending, futures):
+                    # Sıradaki URL bitene kadar bekle; sonraki URL'ler bu sırada çekilmeye devam eder
+                    content = future.result()
+                    if self.stop_requested:
+                        break  # Yarıda kalan URL'ler günlükte bitmemiş kalır, sonraki çalışmada çekilir
+                    self.record_result(url_info, content)
+            finally:
+                for future in futures:
+                    future.cancel()
+        self.progress.emit(f"Çekme tamamlandı! {len(self.extracted_content)} içerik başarıyla çekildi!")
+        self.report_cache_stats()
+        self.restore_resumed_soups()
+        self.extraction_complete.emit(self.extracted_content)
+
+    def parse_page(self, html_content):
+        """Sayfayı lxml ile ayrıştırır; .cat-links bulunamazsa html.parser dener"""
+        soup = BeautifulSoup(html_content, 'lxml')
+        if not soup.select('.cat-links'):
+            print(f"[DEBUG] lxml parser ile .cat-links bulunamadı, html.parser deneniyor")
+            soup = BeautifulSoup(html_content, 'html.parser')
+        return soup
+
+    def report_cache_stats(self):
+        stats = html_cache.summary()
+        if stats:
+            self.progress.emit(f"💾 {stats}")
+
+    def wait_for_request_slot(self, first_request):
+        """Sıralı modda istekler arasında request_delay kadar bekler.
+
+        Hız sınırı (ve 429 sonrası bekleme) her istekte archive_http içinde ayrıca uygulanır.
+        """
+        if not self.concurrent and not first_request:
+            time.sleep(self.timeout_settings.get('request_delay', 3))
+        return not self.stop_requested
     
     def extract_single_content(self, url_info):
         """Tek bir URL'den içerik çıkarır"""
         try:
             retry_count = self.timeout_settings.get('retry_count', 3)
             content_timeout = self.timeout_settings.get('content_timeout', 30)
-            archive_dates = url_info.get('all_snapshots', [url_info['timestamp']])
-            archive_dates = sorted(archive_dates, reverse=True)
+            raw_captures = self.timeout_settings.get('raw_captures', True)
+            request_budget = self.timeout_settings.get('url_request_budget', DEFAULT_URL_REQUEST_BUDGET)
+            requests_made = 0
+            timeline = url_info.get('all_snapshots', [url_info['timestamp']])
+            if isinstance(timeline, UrlTimeline):
+                # Non-200, HTML olmayan, çok küçük ve aynı digest'li capture'lar istek yapılmadan atlanır;
+                # kalanlar beklenen kaliteye göre (200, büyük, yeni) sıralı, kendi orijinal URL'leriyle gelir
+                captures, skipped = timeline.extraction_captures()
+                if skipped:
+                    reasons = ', '.join(f"{reason}: {count}" for reason, count in
+                                        sorted(skipped.items(), key=lambda item: -item[1])[:5])
+                    self.progress.emit(f"🚫 {sum(skipped.values())} snapshot CDX bilgisine göre atlandı ({reasons})")
+                if not captures:
+                    self.progress.emit(f"❌ Başarısız: {url_info['url']} - İçerik çekmeye uygun snapshot yok")
+                    url_info['failed'] = True
+                    url_info['fail_reason'] = "Uygun snapshot yok (CDX: durum/mimetype/boyut)"
+                    return None
+            else:
+                page_url = url_info.get('original_url', url_info['url'])
+                captures = [(timestamp, page_url) for timestamp in sorted(timeline, reverse=True)]
             last_error = None
-            self.progress.emit(f"🔍 {url_info['url']} için {len(archive_dates)} snapshot deneniyor")
+            self.progress.emit(f"🔍 {url_info['url']} için {len(captures)} snapshot deneniyor")
 
-            for date_index, archive_date in enumerate(archive_dates):
+            for date_index, (archive_date, original_url) in enumerate(captures):
+                if requests_made >= request_budget:
+                    self.progress.emit(f"⛔ İstek bütçesi doldu ({request_budget} istek), kalan {len(captures) - date_index} snapshot denenmeyecek")
+                    last_error = f"{last_error or 'Bilinmeyen hata'} (istek bütçesi doldu)"
+                    break
                 self.progress.emit(f"🕒 Yeni snapshot deneniyor: {archive_date}")
                 for attempt in range(retry_count):
                     if getattr(self, 'stop_requested', False):
                         return None
+                    if requests_made >= request_budget:
+                        break
                     self.progress.emit(f"🔄 Deneme {attempt+1}/{retry_count} - Tarih: {archive_date}")
                     try:
-                        # Her snapshot için doğru archive URL'sini oluştur
-                        original_url = url_info.get('original_url', url_info['url'])
-                        archive_url = f"https://web.archive.org/web/{archive_date}/{original_url}"
-                        print(f"[DEBUG] Archive URL: {archive_url}")
+                        # Her snapshot kendi orijinal URL'siyle istenir; ham modda sayfa id_ adresinden
+                        # (araç çubuğu, enjekte script'ler ve yeniden yazılmış bağlantılar olmadan) çekilir
+                        archive_url = capture_url(archive_date, original_url)
+                        fetch_url = capture_url(archive_date, original_url, raw=raw_captures)
+                        print(f"[DEBUG] Archive URL: {fetch_url}")
                         print(f"[DEBUG] Original URL: {original_url}")
                         print(f"[DEBUG] Normalized URL: {url_info['url']}")
                         print(f"[DEBUG] Using snapshot date: {archive_date}")
                         
-                        headers = {
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                        }
-                        
-                        if attempt > 0 or date_index > 0:
-                            time.sleep(self.timeout_settings.get('request_delay', 3))
+                        if not self.wait_for_request_slot(attempt == 0 and date_index == 0):
+                            return None
                         
-                        response = requests.get(archive_url, headers=headers, timeout=content_timeout)
+                        requests_made += 1
+                        response = archive_http.get(fetch_url, timeout=content_timeout,
+                                                    stop_check=lambda: self.stop_requested)
                         
                         print(f"[DEBUG] Response status: {response.status_code}")
                         print(f"[DEBUG] Content length: {len(response.content)} bytes")
@@ -487,9 +532,11 @@ class ContentExtractor(QThread):
                         if getattr(self, 'stop_requested', False):
                             return None
                         
-                        if response.status_code == 429:
-                            self.progress.emit(f"⚠️ Rate limit! 30 saniye bekleniyor...")
-                            time.sleep(30)
+                        if response.status_code in archive_http.THROTTLE_STATUSES:
+                            # Hız denetleyicisi hızı düşürdü; sonraki istek Retry-After dolunca yapılır
+                            last_error = f"HTTP {response.status_code}"
+                            self.progress.emit(f"⚠️ Rate limit! Hız {archive_http.RATE_CONTROLLER.rate:.2g} istek/sn'ye düşürüldü, "
+                                               f"{archive_http.RATE_CONTROLLER.pause_remaining():.0f} saniye bekleniyor...")
                             continue
                         
                         if response.status_code == 200:
@@ -499,8 +546,9 @@ class ContentExtractor(QThread):
                             
                             content_length = len(response.content)
                             if content_length < 1000:
+                                # Capture'lar değişmez; aynı snapshot'ı tekrar istemek aynı sonucu verir
                                 last_error = f"İçerik çok küçük ({content_length} bytes)"
-                                continue
+                                break
                             
                             # BeautifulSoup ile parse et - encoding'i düzelt
                             if response.encoding == 'ISO-8859-1':
@@ -511,11 +559,7 @@ class ContentExtractor(QThread):
                             print(f"[DEBUG] Raw HTML contains 'cat-links': {'cat-links' in html_content}")
                             print(f"[DEBUG] Raw HTML contains 'tags-links': {'tags-links' in html_content}")
                             
-                            # Farklı parser'ları dene
-                            soup = BeautifulSoup(html_content, 'lxml')
-                            if not soup.select('.cat-links'):
-                                print(f"[DEBUG] lxml parser ile .cat-links bulunamadı, html.parser deneniyor")
-                                soup = BeautifulSoup(html_content, 'html.parser')
+                            soup = self.parse_page(html_content)
                             
                             # Debug: Parse edilen HTML'de .cat-links var mı kontrol et
                             print(f"[DEBUG] Parsed HTML contains 'cat-links': {'cat-links' in str(soup)}")
@@ -525,7 +569,7 @@ class ContentExtractor(QThread):
                             title = self.extract_title(soup, url_info)
                             if not title or title in ["Başlık Bulunamadı", "Başlık Çıkarılamadı"]:
                                 last_error = "Başlık çıkarılamadı"
-                                continue
+                                break
                             
                             # Kategori ve etiketler - İÇERİK ÇIKARMADAN ÖNCE YAP!
                             # Başarılı olan archive URL'sini kullan - selector'lar bu URL ile kaydediliyor
@@ -533,10 +577,10 @@ class ContentExtractor(QThread):
                             categories, tags = self.extract_categories_and_tags_from_url(archive_url, soup, self.mainwindow)
                             
                             # İçerik çıkar - KATEGORİ ÇIKARMADAN SONRA YAP!
-                            content = self.extract_main_content(soup)
+                            content = self.extract_main_content(soup, (archive_date, original_url) if raw_captures else None)
                             if not content or len(content.strip()) < 200:
                                 last_error = f"Yetersiz içerik ({len(content) if content else 0} karakter)"
-                                continue
+                                break
                             
                             # Meta description çıkar
                             meta_description = self.extract_meta_description(soup)
@@ -549,7 +593,7 @@ class ContentExtractor(QThread):
                                 self.progress.emit(f"⚠️ Kategori/etiket bulunamadı: {url_info['url']}")
                             
                             # Öne çıkan resim
-                            featured_image = self.extract_featured_image(soup, url_info)
+                            featured_image = self.extract_featured_image(soup, url_info, archive_url)
                             if featured_image:
                                 self.progress.emit(f"🖼️ Öne çıkan resim bulundu: {featured_image}")
                             else:
@@ -563,6 +607,7 @@ class ContentExtractor(QThread):
                             return {
                                 'url': url_info['url'],
                                 'archive_url': archive_url,  # Başarılı olan archive URL'sini kullan
+                                'original_url': original_url,  # Başarılı capture'ın orijinal URL'si
                                 'timestamp': archive_date,   # Başarılı olan timestamp'i kullan
                                 'title': title,
                                 'content': content,
@@ -576,6 +621,8 @@ class ContentExtractor(QThread):
                             }
                         else:
                             last_error = f"HTTP {response.status_code}"
+                            if response.status_code < 500:
+                                break  # 404 vb. kalıcıdır, sonraki snapshot'a geç
                             continue
                         
                     except requests.Timeout:
@@ -612,23 +659,8 @@ class ContentExtractor(QThread):
         
         print(f"[DEBUG] extract_categories_and_tags_from_url called with URL: {url}")
         
-        # URL'den domain'i çıkar (port dahil)
-        from urllib.parse import urlparse
-        parsed_url = urlparse(url if url.startswith('http') else f'http://{url}')
-        
-        # Eğer archive.org URL'si ise, orijinal domain'i çıkar
-        if 'web.archive.org' in parsed_url.netloc:
-            # Archive URL'den orijinal URL'yi çıkar
-            path_parts = parsed_url.path.split('/')
-            if len(path_parts) > 5:
-                # /web/timestamp/http/www.domain.com/path formatından orijinal URL'yi al
-                original_url = 'http://' + '/'.join(path_parts[5:])
-                parsed_original = urlparse(original_url)
-                domain = parsed_original.netloc
-            else:
-                domain = parsed_url.netloc
-        else:
-            domain = parsed_url.netloc  # Bu port'u da içerir
+        # URL'den domain'i çıkar (port dahil, archive.org URL'lerinde orijinal domain) - önbellekli
+        domain = url_domain(url)
         
         print(f"[DEBUG] Extracted domain: {domain}")
         
@@ -638,8 +670,9 @@ class ContentExtractor(QThread):
         
         # Genel selector'ları al (URL'ye özel değil)
         if mainwindow and hasattr(mainwindow, 'global_selectors'):
-            selected_categories = mainwindow.global_selectors.get('category', [])
-            selected_tags = mainwindow.global_selectors.get('tag', [])
+            # Kopya alınır: aşağıda domain selector'ları eklenir, ortak liste (eşzamanlı işçiler) değişmemeli
+            selected_categories = list(mainwindow.global_selectors.get('category', []))
+            selected_tags = list(mainwindow.global_selectors.get('tag', []))
             print(f"[DEBUG] Global selectors - Categories: {selected_categories}, Tags: {selected_tags}")
         else:
             selected_categories = []
@@ -1123,8 +1156,12 @@ class ContentExtractor(QThread):
             print(f"Başlık çıkarma hatası: {e}")
             return "Başlık Çıkarılamadı"
     
-    def extract_main_content(self, soup):
-        """Ana içerik çıkarır - HTML formatını koruyarak"""
+    def extract_main_content(self, soup, capture=None):
+        """Ana içerik çıkarır - HTML formatını koruyarak
+
+        capture ham (id_) sayfanın (timestamp, orijinal URL) bilgisidir; verilirse görseller
+        bu capture'a göre archive.org adreslerine çevrilir.
+        """
         try:
             # Gereksiz elementleri temizle ama resimleri koru
             for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form', 'noscript', 'iframe']):
@@ -1152,7 +1189,7 @@ class ContentExtractor(QThread):
                         unwanted.decompose()
                     
                     # Resimleri Archive.org URL'lerine çevir
-                    self.fix_image_urls(content_element, soup)
+                    self.fix_image_urls(content_element, soup, capture)
                     
                     # HTML formatını koru
                     html_content = str(content_element)
@@ -1167,7 +1204,7 @@ class ContentExtractor(QThread):
                     element.decompose()
                 
                 # Resimleri Archive.org URL'lerine çevir
-                self.fix_image_urls(body, soup)
+                self.fix_image_urls(body, soup, capture)
                 
                 # HTML formatını koru
                 html_content = str(body)
@@ -1191,9 +1228,12 @@ class ContentExtractor(QThread):
             print(f"İçerik çıkarma hatası: {e}")
             return "<p>İçerik çıkarılırken hata oluştu</p>"
     
-    def fix_image_urls(self, element, soup):
+    def fix_image_urls(self, element, soup, capture=None):
         """Resim URL'lerini Archive.org URL'lerine çevirir"""
         images = element.find_all('img')
+        if capture is not None:
+            self.fix_raw_image_urls(images, soup, capture)
+            return
         for img in images:
             src = img.get('src', '')
             if src and not src.startswith('http'):
@@ -1226,9 +1266,43 @@ class ContentExtractor(QThread):
                         archive_url = f"https://web.archive.org/web/{archive_timestamp}/{original_url}"
                         img['src'] = archive_url
     
-    def extract_featured_image(self, soup, url_info):
-        """Her yazı için öne çıkan görseli Archive.org'dan doğru şekilde bulur"""
-        archive_url = url_info.get('url', '')
+    def fix_raw_image_urls(self, images, soup, capture):
+        """Ham (id_) sayfadaki görselleri capture'ın zamanına göre im_ adreslerine çevirir.
+
+        Wayback ham sayfada bağlantıları yeniden yazmadığı için mutlak adresler de orijinal
+        (çoğu zaman kapanmış) domaine işaret eder; archive.org dışındaki tüm src/srcset
+        adresleri sayfanın orijinal URL'sine (varsa <base>'e) göre çözülüp çevrilir.
+        """
+        timestamp, page_url = capture
+        base = soup.find('base', href=True)
+        if base:
+            page_url = urljoin(page_url, base['href'])
+
+        def to_archive(src):
+            if src.startswith('data:') or 'web.archive.org' in src:
+                return src
+            return capture_url(timestamp + IMAGE_MODIFIER, urljoin(page_url, src))
+
+        for img in images:
+            src = img.get('src', '').strip()
+            if src:
+                img['src'] = to_archive(src)
+            srcset = img.get('srcset', '').strip()
+            if srcset:
+                candidates = []
+                for candidate in srcset.split(','):
+                    parts = candidate.split()
+                    if parts:
+                        candidates.append(' '.join([to_archive(parts[0])] + parts[1:]))
+                img['srcset'] = ', '.join(candidates)
+
+    def extract_featured_image(self, soup, url_info, archive_url=None):
+        """Her yazı için öne çıkan görseli Archive.org'dan doğru şekilde bulur.
+
+        archive_url sayfanın çekildiği capture adresidir; ham (id_) sayfalardaki orijinal
+        görsel adresleri bu capture'ın zamanına göre archive.org adresine çevrilir.
+        """
+        archive_url = archive_url or url_info.get('url', '')
         title = url_info.get('title', 'Bilinmeyen Başlık')
         
         # Debug: Başlangıç log'u
@@ -1319,7 +1393,7 @@ class ContentExtractor(QThread):
                 # Buradan timestamp'i al
                 parts = archive_url.split('/web/')
                 if len(parts) > 1:
-                    timestamp_part = parts[1].split('/')[0]
+                    timestamp_part = re.match(r'\d*', parts[1]).group()  # id_/im_ gibi modlar atılır
                     original_url_part = '/'.join(parts[1].split('/')[1:])
                     
                     # Eğer img_url relative ise
@@ -1516,6 +1590,7 @@ class ContentExtractor(QThread):
 class UrlSelectionWindow(QDialog):
     def __init__(self, category_name, urls_with_snapshots, is_blog_post_func, parent=None):
         super().__init__(parent)
+        self.category_name = category_name
         self.setWindowTitle(f"{category_name} - URL'leri Seç")
         self.setGeometry(200, 200, 1000, 700)
         self.urls_with_snapshots = urls_with_snapshots # {url: [snapshot1, snapshot2, ...]}
@@ -2041,6 +2116,23 @@ class UrlSelectionWindow(QDialog):
             item.setData(Qt.UserRole, url)
             self.url_list_widget.addItem(item)
 
+    def update_urls(self, urls_with_snapshots):
+        """Keşif sürerken gelen güncel URL listesini gösterir; seçim ve kaydırma konumu korunur"""
+        selected = {item.data(Qt.UserRole) for item in self.url_list_widget.selectedItems()}
+        scroll_value = self.url_list_widget.verticalScrollBar().value()
+        self.urls_with_snapshots = urls_with_snapshots
+        self.url_to_snapshots = urls_with_snapshots
+        self.url_list_widget.blockSignals(True)
+        self.filter_urls()
+        if selected:
+            for row in range(self.url_list_widget.count()):
+                item = self.url_list_widget.item(row)
+                if item.data(Qt.UserRole) in selected:
+                    item.setSelected(True)
+        self.url_list_widget.blockSignals(False)
+        self.url_list_widget.verticalScrollBar().setValue(scroll_value)
+        self.setWindowTitle(f"{self.category_name} - URL'leri Seç ({len(urls_with_snapshots)})")
+
     def add_filter_tag(self):
         text = self.search_input.text().strip()
         if text and text not in self.active_filters:
@@ -2318,24 +2410,15 @@ class UrlSelectionWindow(QDialog):
             
             # Snapshot'ları özel sıralama: önce seçili URL'ye en yakın olanlar
             def sort_key(snap):
-                original_url = snap['original_url']
+                # Keşifte kullanılan önbellekten gelir, tekrar ayrıştırılmaz
+                canonical = canonicalize(snap['original_url'])
                 
                 # 1. Öncelik: Tam eşleşme (normalize edilmiş URL ile)
-                # normalize_url metodunu burada tanımla
-                def normalize_url(url):
-                    parsed = urlparse(url)
-                    if parsed.port:
-                        netloc = parsed.netloc.split(':')[0]
-                        url = url.replace(f":{parsed.port}", "")
-                    return url
-                
-                normalized_original = normalize_url(original_url)
-                if normalized_original == selected_url:
+                if canonical.normalized == selected_url:
                     return (0, -int(snap['timestamp']))  # En yeni timestamp'i önce göster
                 
                 # 2. Öncelik: Port numarası olmayan versiyon
-                parsed_original = urlparse(original_url)
-                if parsed_original.port is None:
+                if canonical.port is None:
                     return (1, -int(snap['timestamp']))  # En yeni timestamp'i önce göster
                 else:
                     return (2, -int(snap['timestamp']))  # En yeni timestamp'i önce göster
@@ -2661,12 +2744,17 @@ class MainWindow(QMainWindow):
         self.discovery_thread = None
         self.extraction_thread = None
         self.analysis_thread = None
+        self.discovery_session = None  # Analiz ve keşif arasında paylaşılan CDX verisi
+        self.batch_thread = None
+        self.batch_results = {}  # {domain: BatchDomainResult} - toplu keşifte biten domainler
         
         # Veri
         self.extracted_content = []
         self.available_dates = []
         
         self.discovered_categories = {}
+        self.category_boxes = {}  # {kategori anahtarı: (QGroupBox, açıklama QLabel, kategori adı)}
+        self.first_partial_logged = False
         self.final_extracted_data = [] # İçerik çekildikten sonraki tam veriyi tutar
         
         # Selector storage - global kategori ve etiket selector'larını saklar (domain fark etmez)
@@ -2888,6 +2976,36 @@ class MainWindow(QMainWindow):
         self.analyze_button.clicked.connect(self.analyze_domain)
         domain_layout.addWidget(self.analyze_button)
         
+        # Toplu keşif: domain listesi kuyruğa alınır, sonuçlar domain bazında saklanır
+        self.batch_button = QPushButton("📋 TOPLU KEŞİF")
+        self.batch_button.setToolTip("Birden fazla domaini (her satıra bir tane) kuyruğa alıp eşzamanlı keşfeder.\nBiten domainlerin sonuçları aşağıdaki listeden açılıp seçim ve çekme yapılabilir.")
+        self.batch_button.setStyleSheet("""
+            QPushButton {
+                background-color: #34495e;
+                color: white;
+                border: 2px solid #4ecdc4;
+                padding: 10px;
+                font-size: 13px;
+                font-weight: bold;
+                border-radius: 8px;
+            }
+            QPushButton:hover {
+                background-color: #3a5a6b;
+            }
+            QPushButton:disabled {
+                border-color: #7f8c8d;
+                color: #95a5a6;
+            }
+        """)
+        self.batch_button.clicked.connect(self.start_batch_discovery)
+        domain_layout.addWidget(self.batch_button)
+        
+        self.batch_result_combo = QComboBox()
+        self.batch_result_combo.setVisible(False)
+        self.batch_result_combo.setToolTip("Toplu keşifte tamamlanan domainler; seçilen domainin sonuçları yüklenir")
+        self.batch_result_combo.activated.connect(self.load_batch_result)
+        domain_layout.addWidget(self.batch_result_combo)
+        
         # Tarih analizi sonuçları
         self.date_analysis_widget = QWidget()
         self.date_analysis_widget.setVisible(False)
@@ -3045,6 +3163,16 @@ class MainWindow(QMainWindow):
         date_input_layout.addWidget(self.end_date_edit)
         date_layout.addLayout(date_input_layout)
         
+        # Tarih seçimi değişince tamamlanmış keşif CDX'e gitmeden bellekte yeniden filtrelenir
+        self.refilter_timer = QTimer(self)
+        self.refilter_timer.setSingleShot(True)
+        self.refilter_timer.setInterval(300)
+        self.refilter_timer.timeout.connect(self.refilter_discovery)
+        self.start_date_edit.dateChanged.connect(self.schedule_refilter)
+        self.end_date_edit.dateChanged.connect(self.schedule_refilter)
+        self.all_dates_checkbox.toggled.connect(self.schedule_refilter)
+        self.specific_dates_checkbox.toggled.connect(self.schedule_refilter)
+        
         date_selection_layout.addWidget(date_group)
         domain_layout.addWidget(self.date_selection_widget)
         
@@ -3213,6 +3341,240 @@ class MainWindow(QMainWindow):
         tag_switch_layout.addWidget(tag_info)
         timeout_layout.addLayout(tag_switch_layout, 7, 0, 1, 2)
         
+        # Sayfalı CDX keşfi (büyük domainler için)
+        paged_layout = QHBoxLayout()
+        self.paged_discovery_checkbox = QCheckBox("Sayfalı CDX Keşfi")
+        self.paged_discovery_checkbox.setChecked(True)  # Default açık
+        self.paged_discovery_checkbox.setMinimumWidth(300)
+        self.paged_discovery_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        paged_layout.addWidget(self.paged_discovery_checkbox)
+        
+        paged_info = QLabel("ℹ️")
+        paged_info.setToolTip("Açık: Snapshot'lar sayfa sayfa çekilir, limit yoktur. Timeout veya rate limit olursa tekrar 'Keşfet' dediğinizde kaldığı sayfadan devam eder.\nKapalı: Tek istekte en fazla 100.000 snapshot çekilir.")
+        paged_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        paged_layout.addWidget(paged_info)
+        timeout_layout.addLayout(paged_layout, 8, 0, 1, 2)
+        
+        # Sunucu tarafı CDX filtreleri
+        server_filter_layout = QHBoxLayout()
+        self.server_filters_checkbox = QCheckBox("Sunucu Tarafı Filtreleme")
+        self.server_filters_checkbox.setChecked(True)  # Default açık
+        self.server_filters_checkbox.setMinimumWidth(300)
+        self.server_filters_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        server_filter_layout.addWidget(self.server_filters_checkbox)
+        
+        server_filter_info = QLabel("ℹ️")
+        server_filter_info.setToolTip("Açık: Tarih aralığı ve wp-content, feed, js/css gibi gereksiz URL'ler Archive.org tarafında elenir, çok daha az veri indirilir.\nKapalı: Tüm snapshot'lar indirilip bilgisayarınızda elenir.")
+        server_filter_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        server_filter_layout.addWidget(server_filter_info)
+        timeout_layout.addLayout(server_filter_layout, 9, 0, 1, 2)
+        
+        # Sadece HTTP 200 / sadece HTML
+        status_layout = QHBoxLayout()
+        self.status_200_checkbox = QCheckBox("Sadece HTTP 200")
+        self.status_200_checkbox.setChecked(False)
+        self.status_200_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        status_layout.addWidget(self.status_200_checkbox)
+        self.html_only_checkbox = QCheckBox("Sadece HTML")
+        self.html_only_checkbox.setChecked(False)
+        self.html_only_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        status_layout.addWidget(self.html_only_checkbox)
+        
+        status_info = QLabel("ℹ️")
+        status_info.setToolTip("Sadece HTTP 200: Yönlendirme ve 404 snapshot'ları hiç indirilmez.\nSadece HTML: Yazı keşfi için; görsel ve doküman snapshot'ları indirilmez.")
+        status_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        status_layout.addWidget(status_info)
+        timeout_layout.addLayout(status_layout, 10, 0, 1, 2)
+        
+        # CDX collapse
+        collapse_label = QLabel("Tekrar Birleştirme")
+        self.collapse_combo = QComboBox()
+        self.collapse_combo.addItem("Yok", None)
+        self.collapse_combo.addItem("Aynı içerik (digest)", 'digest')
+        self.collapse_combo.addItem("URL başına tek (urlkey)", 'urlkey')
+        collapse_info = QLabel("ℹ️")
+        collapse_info.setToolTip("Aynı içerik: Art arda gelen birebir aynı snapshot'lar tek satır olarak indirilir.\nURL başına tek: Her URL için sadece bir snapshot indirilir (en hızlısı, ama çekme sırasında yedek snapshot kalmaz).\nCollapse açıkken yerel indeks kullanılmaz, snapshot'lar her keşifte doğrudan indirilir.")
+        collapse_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(collapse_label, 11, 0)
+        timeout_layout.addWidget(self.collapse_combo, 11, 1)
+        timeout_layout.addWidget(collapse_info, 11, 2)
+        # Paralel CDX isteği
+        self.cdx_workers_spin = QSpinBox()
+        self.cdx_workers_spin.setRange(1, 8)
+        self.cdx_workers_spin.setValue(1)  # Default: sıralı çekim
+        cdx_workers_label = QLabel("CDX Paralel İstek")
+        cdx_workers_label.setWordWrap(True)
+        cdx_workers_info = QLabel("ℹ️")
+        cdx_workers_info.setToolTip("1: Snapshot listesi sıralı çekilir.\n2 ve üzeri: Çok büyük domainlerde CDX sayfaları aynı anda çekilir; toplam istek hızı yine ortak sınırla kısıtlıdır. Tekrar birleştirme açıkken kullanılmaz.")
+        cdx_workers_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(cdx_workers_label, 12, 0)
+        timeout_layout.addWidget(self.cdx_workers_spin, 12, 1)
+        timeout_layout.addWidget(cdx_workers_info, 12, 2)
+        
+        # Paralel kategorize (süreç sayısı)
+        self.categorize_workers_spin = QSpinBox()
+        self.categorize_workers_spin.setRange(1, max(os.cpu_count() or 1, 1))
+        self.categorize_workers_spin.setValue(default_worker_count())
+        categorize_workers_label = QLabel("Kategorize İşlemcisi")
+        categorize_workers_label.setWordWrap(True)
+        categorize_workers_info = QLabel("ℹ️")
+        categorize_workers_info.setToolTip(f"1: URL'ler tek işlemcide kategorize edilir.\n2 ve üzeri: {PARALLEL_MIN_URLS} tekil URL'den büyük keşiflerde sınıflandırma bu kadar işlemciye dağıtılır. Sonuç aynıdır, sadece daha hızlıdır.")
+        categorize_workers_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(categorize_workers_label, 14, 0)
+        timeout_layout.addWidget(self.categorize_workers_spin, 14, 1)
+        timeout_layout.addWidget(categorize_workers_info, 14, 2)
+        
+        # Toplu keşifte eşzamanlı domain sayısı
+        self.batch_workers_spin = QSpinBox()
+        self.batch_workers_spin.setRange(1, 8)
+        self.batch_workers_spin.setValue(2)
+        batch_workers_label = QLabel("Toplu Keşif Eşzamanlılığı")
+        batch_workers_label.setWordWrap(True)
+        batch_workers_info = QLabel("ℹ️")
+        batch_workers_info.setToolTip("Toplu keşifte aynı anda işlenen domain sayısı.\nTüm domainlerin CDX istekleri ortak hız sınırını paylaşır; bu değer archive.org'a giden toplam istek hızını artırmaz, bekleme sürelerini örtüştürür.")
+        batch_workers_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(batch_workers_label, 15, 0)
+        timeout_layout.addWidget(self.batch_workers_spin, 15, 1)
+        timeout_layout.addWidget(batch_workers_info, 15, 2)
+        
+        # Alt alan adları (blog., m., en. ...)
+        subdomain_layout = QHBoxLayout()
+        self.subdomains_checkbox = QCheckBox("Alt Alan Adlarını Dahil Et")
+        self.subdomains_checkbox.setChecked(False)
+        self.subdomains_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        subdomain_layout.addWidget(self.subdomains_checkbox)
+        subdomain_info = QLabel("ℹ️")
+        subdomain_info.setToolTip("Açık: blog., m., en. gibi alt alan adları da bulunur ve her biri ayrı istekle eşzamanlı çekilir.\nURL'ler host adıyla gruplanır, farklı host'lardaki aynı yollar karışmaz.")
+        subdomain_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        subdomain_layout.addWidget(subdomain_info)
+        timeout_layout.addLayout(subdomain_layout, 16, 0, 1, 3)
+        
+        # URL başına istek bütçesi
+        self.url_request_budget_spin = QSpinBox()
+        self.url_request_budget_spin.setRange(1, 100)
+        self.url_request_budget_spin.setValue(DEFAULT_URL_REQUEST_BUDGET)
+        url_request_budget_label = QLabel("URL Başına İstek Bütçesi")
+        url_request_budget_label.setWordWrap(True)
+        url_request_budget_info = QLabel("ℹ️")
+        url_request_budget_info.setToolTip("Bir içerik çekilirken tüm snapshot ve denemeler için yapılabilecek en fazla istek.\nAynı içerikli (aynı digest) snapshot'lar zaten tek sefer denenir; bütçe dolunca URL başarısız sayılır.")
+        url_request_budget_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(url_request_budget_label, 17, 0)
+        timeout_layout.addWidget(self.url_request_budget_spin, 17, 1)
+        timeout_layout.addWidget(url_request_budget_info, 17, 2)
+        
+        # Paylaşılan HTTP oturumunda host başına açık tutulan bağlantı sayısı
+        self.http_pool_spin = QSpinBox()
+        self.http_pool_spin.setRange(1, 64)
+        self.http_pool_spin.setValue(archive_http.DEFAULT_POOL_SIZE)
+        self.http_pool_spin.valueChanged.connect(lambda value: archive_http.configure(pool_size=value))
+        http_pool_label = QLabel("HTTP Bağlantı Havuzu")
+        http_pool_label.setWordWrap(True)
+        http_pool_info = QLabel("ℹ️")
+        http_pool_info.setToolTip("Archive.org'a açık tutulan (yeniden kullanılan) bağlantı sayısı.\nTüm keşif, tespit ve içerik istekleri bu bağlantıları paylaşır; her istekte yeni TCP/TLS el sıkışması yapılmaz.\nEşzamanlı istek sayısından az olmamalıdır.")
+        http_pool_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(http_pool_label, 18, 0)
+        timeout_layout.addWidget(self.http_pool_spin, 18, 1)
+        timeout_layout.addWidget(http_pool_info, 18, 2)
+        
+        # Eşzamanlı içerik çekme
+        self.extract_workers_spin = QSpinBox()
+        self.extract_workers_spin.setRange(1, 32)
+        self.extract_workers_spin.setValue(1)
+        extract_workers_label = QLabel("Eşzamanlı İçerik Çekimi")
+        extract_workers_label.setWordWrap(True)
+        extract_workers_info = QLabel("ℹ️")
+        extract_workers_info.setToolTip("1: İçerikler sırayla çekilir, her istek arasında 'Bekleme' kadar beklenir.\n2 ve üzeri: Bu kadar URL aynı anda çekilir; bekleme yerine aşağıdaki toplam istek hızı uygulanır. Sonuçlar yine seçim sırasıyla gelir.")
+        extract_workers_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(extract_workers_label, 19, 0)
+        timeout_layout.addWidget(self.extract_workers_spin, 19, 1)
+        timeout_layout.addWidget(extract_workers_info, 19, 2)
+        
+        self.extract_rate_spin = QDoubleSpinBox()
+        self.extract_rate_spin.setRange(0.1, 20.0)
+        self.extract_rate_spin.setSingleStep(0.5)
+        self.extract_rate_spin.setDecimals(1)
+        self.extract_rate_spin.setValue(archive_http.DEFAULT_MAX_RATE)
+        # Ayar değiştiği anda ortak hız denetleyicisinin üst sınırı olur (tüm iş parçacıkları için)
+        self.extract_rate_spin.valueChanged.connect(lambda value: archive_http.RATE_CONTROLLER.set_max_rate(value))
+        extract_rate_label = QLabel("İstek Hızı (istek/sn)")
+        extract_rate_label.setWordWrap(True)
+        extract_rate_info = QLabel("ℹ️")
+        extract_rate_info.setToolTip("archive.org'a giden tüm isteklerin (içerik, tespit, CDX) toplam hız üst sınırı (saniyede), değiştiği anda uygulanır.\nHız düşük başlar, yanıtlar sağlıklıyken bu sınıra kadar kademeli artırılır, 429/503 gelince yarıya düşürülür ve sunucunun istediği (Retry-After) kadar beklenir.")
+        extract_rate_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(extract_rate_label, 20, 0)
+        timeout_layout.addWidget(self.extract_rate_spin, 20, 1)
+        timeout_layout.addWidget(extract_rate_info, 20, 2)
+        
+        # Asenkron istek motoru (aiohttp)
+        async_fetch_layout = QHBoxLayout()
+        self.async_fetch_checkbox = QCheckBox("Asenkron İstek Motoru")
+        self.async_fetch_checkbox.setChecked(False)
+        self.async_fetch_checkbox.setEnabled(async_fetch.is_available())
+        self.async_fetch_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        self.async_fetch_checkbox.toggled.connect(self.toggle_async_fetch)
+        async_fetch_layout.addWidget(self.async_fetch_checkbox)
+        async_fetch_info = QLabel("ℹ️")
+        async_fetch_info.setToolTip("Açık: İçerik ve tespit istekleri tek bir arka plan iş parçacığında (asyncio/aiohttp) yürütülür; yüzlerce istek aynı anda beklemede olabilir.\nOtomatik tespit tüm sayfaları önceden, aynı anda ister. Hız sınırı değişmez.\n" + ("" if async_fetch.is_available() else "aiohttp kurulu değil: pip install aiohttp"))
+        async_fetch_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        async_fetch_layout.addWidget(async_fetch_info)
+        timeout_layout.addLayout(async_fetch_layout, 21, 0, 1, 3)
+        
+        # Ham HTML önbelleği (MB, 0: kapalı)
+        self.html_cache_spin = QSpinBox()
+        self.html_cache_spin.setRange(0, 20000)
+        self.html_cache_spin.setSingleStep(100)
+        self.html_cache_spin.setValue(html_cache.DEFAULT_MAX_MB)
+        self.html_cache_spin.valueChanged.connect(html_cache.configure)
+        html_cache_label = QLabel("HTML Önbelleği (MB)")
+        html_cache_label.setWordWrap(True)
+        html_cache_info = QLabel("ℹ️")
+        html_cache_info.setToolTip("İndirilen arşiv sayfaları sıkıştırılarak diskte saklanır; aynı snapshot tespit, içerik çekme, tekrar deneme veya selector penceresinde bir daha indirilmez.\nSınır dolunca en uzun süredir kullanılmayan sayfalar silinir. 0: kapalı.")
+        html_cache_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 8px; margin-right: 0px; background: transparent;")
+        timeout_layout.addWidget(html_cache_label, 22, 0)
+        timeout_layout.addWidget(self.html_cache_spin, 22, 1)
+        timeout_layout.addWidget(html_cache_info, 22, 2)
+        
+        # Ham snapshot (id_) modu
+        raw_captures_layout = QHBoxLayout()
+        self.raw_captures_checkbox = QCheckBox("Ham Snapshot (id_)")
+        self.raw_captures_checkbox.setChecked(True)  # Default açık
+        self.raw_captures_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        raw_captures_layout.addWidget(self.raw_captures_checkbox)
+        raw_captures_info = QLabel("ℹ️")
+        raw_captures_info.setToolTip("Açık: İçerik çekme ve otomatik tespit sayfayı Wayback araç çubuğu, enjekte edilen script'ler ve yeniden yazılmış bağlantılar olmadan (id_) ister; daha az veri iner, sayfa daha hızlı ayrıştırılır.\nGörseller yine archive.org adreslerine çevrilir.")
+        raw_captures_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        raw_captures_layout.addWidget(raw_captures_info)
+        timeout_layout.addLayout(raw_captures_layout, 23, 0, 1, 3)
+
+        # Çekme günlüğü ile kaldığı yerden devam
+        resume_extraction_layout = QHBoxLayout()
+        self.resume_extraction_checkbox = QCheckBox("Kaldığı Yerden Devam")
+        self.resume_extraction_checkbox.setChecked(True)  # Default açık
+        self.resume_extraction_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        resume_extraction_layout.addWidget(self.resume_extraction_checkbox)
+        resume_extraction_info = QLabel("ℹ️")
+        resume_extraction_info.setToolTip("Açık: Her URL'nin çekim durumu ve içeriği diske yazılır. Uygulama kapanır veya çekim durdurulursa aynı seçimle tekrar başlatıldığında tamamlanan içerikler anında yüklenir, sadece bitmemiş ve başarısız URL'ler çekilir. Selector'lar, ham snapshot/istek bütçesi ayarları veya snapshot'lar değiştiyse seçim baştan çekilir.\nKapalı: Seçim her seferinde baştan çekilir.")
+        resume_extraction_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        resume_extraction_layout.addWidget(resume_extraction_info)
+        timeout_layout.addLayout(resume_extraction_layout, 24, 0, 1, 3)
+        
+        # Yerel snapshot indeksi
+        local_index_layout = QHBoxLayout()
+        self.local_index_checkbox = QCheckBox("Yerel Snapshot İndeksi")
+        self.local_index_checkbox.setChecked(True)  # Default açık
+        self.local_index_checkbox.setStyleSheet("QCheckBox { font-size: 12px; }")
+        local_index_layout.addWidget(self.local_index_checkbox)
+        self.clear_index_button = QPushButton("Temizle")
+        self.clear_index_button.setStyleSheet("background-color: #34495e; color: white; font-weight: bold; border-radius: 6px; padding: 4px 10px;")
+        self.clear_index_button.clicked.connect(self.clear_local_index)
+        local_index_layout.addWidget(self.clear_index_button)
+        
+        local_index_info = QLabel("ℹ️")
+        local_index_info.setToolTip("Açık: Keşfedilen snapshot'lar bilgisayarınızda saklanır. Aynı domain tekrar keşfedildiğinde sadece son keşiften sonraki yeni snapshot'lar indirilir.\nTemizle: Girilen domainin yerel indeksini siler, sonraki keşif her şeyi baştan indirir.")
+        local_index_info.setStyleSheet("color: #4ecdc4; font-size: 16px; margin-left: 5px; background: transparent;")
+        local_index_layout.addWidget(local_index_info)
+        timeout_layout.addLayout(local_index_layout, 13, 0, 1, 3)
+        
         # Kategori/Etiket Atama Seçeneği
         # cat_tag_label = QLabel("Kategori/Etiket Atama")
         # cat_tag_label.setStyleSheet("color: white; font-weight: bold; font-size: 13px; margin-top: 10px;")
@@ -3602,12 +3964,7 @@ class MainWindow(QMainWindow):
             return
         
         # Domain'i temizle
-        if domain.startswith('http://'):
-            domain = domain[7:]
-        elif domain.startswith('https://'):
-            domain = domain[8:]
-        if domain.startswith('www.'):
-            domain = domain[4:]
+        domain = self.clean_domain(domain)
         
         self.add_log_message(f"Domain analizi başlatılıyor: {domain}", "INFO")
         self.reset_stats()
@@ -3630,6 +3987,9 @@ class MainWindow(QMainWindow):
         self.final_extracted_data = []
         self.discovered_categories = {}
         self.available_dates = []
+        self.first_partial_logged = False
+        # Analiz ve keşif aynı CDX indirmesini paylaşır
+        self.discovery_session = DiscoverySession(domain, self.get_timeout_settings())
         
         # UI'yi temizle
         self.category_widget.setVisible(False)
@@ -3651,12 +4011,100 @@ class MainWindow(QMainWindow):
         
         # Domain analysis thread'ini başlat
         self.current_analysis_id += 1
-        self.analysis_thread = DomainAnalysisThread(domain, self.current_analysis_id)
+        self.analysis_thread = DomainAnalysisThread(self.discovery_session, self.current_analysis_id)
         self.analysis_thread.progress.connect(self.update_progress_label)
+        self.analysis_thread.partial_results.connect(self.discovery_partial)
         self.analysis_thread.analysis_complete.connect(self.domain_analysis_finished)
         self.analysis_thread.error.connect(self.domain_analysis_error)
         self.analysis_thread.start()
     
+    def start_batch_discovery(self):
+        """Domain listesini alıp toplu keşif kuyruğunu başlatır"""
+        text, ok = QInputDialog.getMultiLineText(self, "Toplu Keşif", "Keşfedilecek domainler (her satıra bir tane):")
+        if not ok:
+            return
+        domains = [self.clean_domain(line) for line in text.splitlines() if line.strip()]
+        if not domains:
+            self.add_log_message("Toplu keşif için domain girilmedi!", "ERROR")
+            return
+        start_date = None
+        end_date = None
+        if self.specific_dates_checkbox.isChecked():
+            start_date = self.start_date_edit.date().toPython()
+            end_date = self.end_date_edit.date().toPython()
+        self.batch_thread = BatchDiscoveryThread(domains, self.get_timeout_settings(), start_date, end_date)
+        self.batch_thread.progress.connect(self.update_progress_label)
+        self.batch_thread.domain_finished.connect(self.batch_domain_finished)
+        self.batch_thread.batch_complete.connect(self.batch_discovery_finished)
+        self.batch_button.setEnabled(False)
+        self.batch_button.setText(f"Toplu Keşif Sürüyor (0/{len(self.batch_thread.domains)})...")
+        self.add_log_message(f"Toplu keşif başlatıldı: {len(self.batch_thread.domains)} domain", "INFO")
+        self.batch_thread.start()
+
+    def batch_domain_finished(self, domain, result):
+        """Toplu keşifte bir domain bittiğinde sonucunu saklar ve listeye ekler"""
+        self.batch_results[domain] = result
+        done = len(self.batch_thread.results) if self.batch_thread else len(self.batch_results)
+        total = len(self.batch_thread.domains) if self.batch_thread else done
+        self.batch_button.setText(f"Toplu Keşif Sürüyor ({done}/{total})...")
+        if result.error:
+            self.add_log_message(f"[{domain}] Toplu keşif hatası: {result.error}", "ERROR")
+            return
+        unique_urls = sum(len(cat) for cat in result.categories.values())
+        self.add_log_message(
+            f"[{domain}] {result.used_snapshots}/{result.total_snapshots} snapshot, {unique_urls} benzersiz URL ({result.elapsed:.1f} sn)",
+            "SUCCESS")
+        label = f"{domain} ({unique_urls} URL)"
+        index = self.batch_result_combo.findData(domain)
+        if index >= 0:
+            self.batch_result_combo.setItemText(index, label)
+        else:
+            self.batch_result_combo.addItem(label, domain)
+        self.batch_result_combo.setVisible(True)
+
+    def batch_discovery_finished(self, results):
+        """Toplu keşif kuyruğu bittiğinde çağrılır"""
+        failed = [domain for domain, result in results.items() if result.error]
+        self.batch_button.setEnabled(True)
+        self.batch_button.setText("📋 TOPLU KEŞİF")
+        msg = f"Toplu keşif tamamlandı: {len(results) - len(failed)}/{len(results)} domain hazır"
+        if failed:
+            msg += f" (başarısız: {', '.join(failed)})"
+        self.progress_label.setText(msg + "\nSonuçları açmak için listeden domain seçin.")
+        self.add_log_message(msg, "SUCCESS" if not failed else "WARNING")
+
+    def load_batch_result(self, index):
+        """Toplu keşifte biten bir domainin sonuçlarını seçim ve çekme için ana pencereye yükler"""
+        domain = self.batch_result_combo.itemData(index)
+        result = self.batch_results.get(domain)
+        if result is None or result.error:
+            return
+        self.domain_input.setText(domain)
+        self.discovery_session = result.session
+        # Tarih aralığı değişince bellekte yeniden filtreleyebilmek için oturuma bağlı keşif nesnesi
+        self.discovery_thread = ArchiveDiscovery(domain, result.start_date, result.end_date,
+                                                 result.session.timeout_settings, session=result.session)
+        self.discovery_thread.progress.connect(self.update_progress_label)
+        self.discovery_thread.total_snapshots = result.total_snapshots
+        self.discovery_thread.used_snapshots = result.used_snapshots
+        self.available_dates = result.session.available_months()
+        self.discover_button.setEnabled(bool(self.available_dates))
+        self.show_categories_for_selection(result.categories)
+        self.progress_label.setText(f"{domain}: {result.used_snapshots} snapshot, "
+                                    f"{sum(len(cat) for cat in result.categories.values())} benzersiz URL yüklendi")
+        self.add_log_message(f"[{domain}] Toplu keşif sonuçları yüklendi", "INFO")
+
+    def clean_domain(self, domain):
+        """Domain girişinden protokolü ve www. önekini temizler"""
+        domain = domain.strip()
+        if domain.startswith('http://'):
+            domain = domain[7:]
+        elif domain.startswith('https://'):
+            domain = domain[8:]
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        return domain
+    
     def start_discovery(self):
         """Keşif işlemini başlatır"""
         if not self.available_dates:
@@ -3685,13 +4133,45 @@ class MainWindow(QMainWindow):
         self.discover_button.setEnabled(False)
         self.discover_button.setText("Keşif Yapılıyor...")
         
-        # Discovery thread'ini başlat
-        self.discovery_thread = ArchiveDiscovery(self.domain_input.text().strip(), start_date, end_date, timeout_settings)
+        # Discovery thread'ini başlat - domain analizinde indirilen snapshot'lar tekrar kullanılır
+        self.first_partial_logged = False
+        domain = self.clean_domain(self.domain_input.text())
+        self.discovery_thread = ArchiveDiscovery(domain, start_date, end_date, timeout_settings, session=self.discovery_session)
         self.discovery_thread.progress.connect(self.update_progress_label)
+        self.discovery_thread.partial_results.connect(self.discovery_partial)
         self.discovery_thread.discovery_complete.connect(self.discovery_finished)
         self.discovery_thread.error.connect(self.discovery_error)
         self.discovery_thread.start()
     
+    def schedule_refilter(self, *args):
+        """Tarih seçimi değiştiğinde yeniden filtrelemeyi kısa bir gecikmeyle planlar"""
+        self.refilter_timer.start()
+
+    def refilter_discovery(self):
+        """Son keşfi yeni tarih aralığıyla, snapshot'ları tekrar indirmeden yeniden kategorize eder"""
+        thread = getattr(self, 'discovery_thread', None)
+        if thread is None or not thread.can_refilter():
+            return
+        if thread.domain != self.clean_domain(self.domain_input.text()):
+            return
+        start_date = None
+        end_date = None
+        if self.specific_dates_checkbox.isChecked():
+            start_date = self.start_date_edit.date().toPython()
+            end_date = self.end_date_edit.date().toPython()
+        if (start_date, end_date) == (thread.start_date, thread.end_date):
+            return
+        started = time.perf_counter()
+        categories, total_snapshots_all, total_snapshots_used = thread.refilter(start_date, end_date)
+        elapsed = time.perf_counter() - started
+        range_text = f"{start_date} - {end_date}" if start_date else "tüm tarihler"
+        unique_urls = sum(len(cat) for cat in categories.values())
+        self.add_log_message(
+            f"Tarih aralığı bellekte uygulandı ({range_text}): {total_snapshots_used}/{total_snapshots_all} snapshot, "
+            f"{unique_urls} benzersiz URL ({elapsed:.2f} sn)", "INFO")
+        self.progress_label.setText(f"Tarih aralığı güncellendi: {total_snapshots_used} snapshot, {unique_urls} benzersiz URL")
+        self.show_categories_for_selection(categories)
+
     def toggle_extraction(self):
         if hasattr(self, 'extraction_thread') and self.extraction_thread and self.extraction_thread.isRunning():
             # Durdur
@@ -3787,6 +4267,16 @@ class MainWindow(QMainWindow):
         dots = dots.ljust(4)  # 4 karakterlik sabit genişlik
         self.progress_label.setText(self.base_message + dots)
     
+    def discovery_partial(self, result):
+        """CDX indirmesi sürerken gelen ara keşif sonuçlarını gösterir"""
+        categories, total_snapshots_all, total_snapshots_used, time_to_first_url = result
+        if not self.first_partial_logged:
+            self.first_partial_logged = True
+            self.add_log_message(f"İlk URL'ler {time_to_first_url:.2f} sn'de listelendi (indirme sürüyor)", "INFO")
+        self.show_categories_for_selection(categories)
+        unique_urls = sum(len(cat) for cat in categories.values())
+        self.progress_label.setText(f"Keşif sürüyor... {total_snapshots_all} snapshot alındı, {unique_urls} benzersiz URL listelendi")
+
     def discovery_finished(self, result):
         """Keşif tamamlandığında çağrılır"""
         # Timer'ı durdur
@@ -3820,6 +4310,9 @@ class MainWindow(QMainWindow):
             msg += f"Filtrelenip kategorize edilen snapshot: {total_snapshots_used}\n"
         msg += f"Kategorilere ayrılan (kullanılabilir) snapshot: {total_snapshots_categorized}\n"
         msg += f"Benzersiz URL: {unique_urls}"
+        if self.discovery_thread.time_to_first_url is not None:
+            msg += f"\nİlk URL'ler: {self.discovery_thread.time_to_first_url:.2f} sn"
+            self.add_log_message(f"Keşif tamamlandı, ilk URL'ler {self.discovery_thread.time_to_first_url:.2f} sn'de listelendi", "SUCCESS")
         self.progress_label.setText(msg)
         QMessageBox.information(self, "Keşif Tamamlandı", msg)
         # Kategorileri göster
@@ -3836,7 +4329,23 @@ class MainWindow(QMainWindow):
         QMessageBox.critical(self, "Keşif Hatası", error_message)
     
     def show_categories_for_selection(self, categories):
-        """Kategorileri UI'da gösterir ve seçim butonu ekler"""
+        """Kategorileri UI'da gösterir ve seçim butonu ekler.
+
+        Aynı kategoriler zaten gösteriliyorsa (keşif sürerken gelen ara sonuçlar)
+        kutular yeniden kurulmaz, sadece sayılar ve açık URL pencereleri güncellenir.
+        """
+        self.discovered_categories = categories
+        self.update_url_selection_windows(categories)
+        visible_keys = [key for key, urls in categories.items() if urls]
+        if visible_keys and visible_keys == list(self.category_boxes) and self.category_widget.isVisible():
+            for category_key in visible_keys:
+                group, description, category_name = self.category_boxes[category_key]
+                group.setTitle(f"{category_name} ({len(categories[category_key])})")
+                description.setText(f"Bu kategoride {len(categories[category_key])} URL bulundu")
+            total_snapshots = sum(len(urls) for urls in categories.values())
+            self.progress_label.setText(f"Keşif tamamlandı! Toplam {total_snapshots} snapshot bulundu.")
+            return
+        self.category_boxes = {}
         # Mevcut widget'ları temizle
         for i in reversed(range(self.category_grid.count())):
             item = self.category_grid.itemAt(i)
@@ -3920,8 +4429,10 @@ class MainWindow(QMainWindow):
                     background-color: #d35400;
                 }
             """)
-            select_button.clicked.connect(lambda checked, key=category_key, urls=urls_with_snapshots: self.open_url_selection_window(key, urls))
+            # Liste tıklandığı anda güncel sonuçlardan alınır (keşif sürerken büyüyebilir)
+            select_button.clicked.connect(lambda checked, key=category_key: self.open_url_selection_window(key, self.discovered_categories.get(key, {})))
             group_layout.addWidget(select_button)
+            self.category_boxes[category_key] = (group, description, category_name)
             
             # Grid'e ekle
             self.category_grid.addWidget(group, row, col)
@@ -3932,6 +4443,13 @@ class MainWindow(QMainWindow):
                 col = 0
                 row += 1
     
+    def update_url_selection_windows(self, categories):
+        """Açık URL seçim pencerelerine kendi kategorilerinin güncel listesini verir"""
+        for dialog in self.url_selection_windows:
+            category_key = getattr(dialog, 'category_key', None)
+            if category_key is not None and categories.get(category_key) is not dialog.urls_with_snapshots:
+                dialog.update_urls(categories.get(category_key, {}))
+
     def content_extracted(self, content):
         # Progress bar'ı güncelle
         current_value = self.progress_bar.value()
@@ -4370,6 +4888,7 @@ class MainWindow(QMainWindow):
         def is_blog_post(url):
             return True
         dialog = UrlSelectionWindow(category_name, urls_with_snapshots, is_blog_post, parent=self)
+        dialog.category_key = category_key  # Keşif sürerken liste bu anahtarla güncellenir
         dialog.setModal(False)  # Non-modal yap
         
         # Açılan pencereyi listeye ekle
@@ -4491,7 +5010,11 @@ class MainWindow(QMainWindow):
         
         if available_dates:
             date_range = f"{available_dates[0]} - {available_dates[-1]}"
-            date_info = f"📅 Domain {len(available_dates)} farklı tarihte arşivlenmiş\n📆 Tarih aralığı: {date_range}\n✅ Analiz tamamlandı, şimdi tarih seçimi yapabilirsiniz"
+            # Aylık capture histogramı oturumdaki zaman çizelgesinden gelir
+            histogram = self.discovery_session.month_histogram() if self.discovery_session else {}
+            busiest = max(histogram.items(), key=lambda item: item[1]) if histogram else None
+            busiest_info = f"\n📊 {sum(histogram.values())} snapshot, en yoğun ay: {busiest[0]} ({busiest[1]})" if busiest else ""
+            date_info = f"📅 Domain {len(available_dates)} farklı tarihte arşivlenmiş\n📆 Tarih aralığı: {date_range}{busiest_info}\n✅ Analiz tamamlandı, şimdi tarih seçimi yapabilirsiniz"
             self.date_analysis_label.setText(date_info)
             self.date_analysis_widget.setVisible(True)
             self.date_selection_widget.setVisible(True)
@@ -4536,9 +5059,53 @@ class MainWindow(QMainWindow):
             'api_timeout': self.api_timeout_spin.value(),
             'content_timeout': self.content_timeout_spin.value(),
             'retry_count': self.retry_spin.value(),
-            'request_delay': self.request_delay_spin.value()
+            'request_delay': self.request_delay_spin.value(),
+            'paged_discovery': self.paged_discovery_checkbox.isChecked(),
+            'server_filters': self.server_filters_checkbox.isChecked(),
+            'status_200_only': self.status_200_checkbox.isChecked(),
+            'html_only': self.html_only_checkbox.isChecked(),
+            'cdx_collapse': self.collapse_combo.currentData(),
+            'cdx_workers': self.cdx_workers_spin.value(),
+            'use_local_index': self.local_index_checkbox.isChecked(),
+            'categorize_workers': self.categorize_workers_spin.value(),
+            'batch_workers': self.batch_workers_spin.value(),
+            'include_subdomains': self.subdomains_checkbox.isChecked(),
+            'url_request_budget': self.url_request_budget_spin.value(),
+            'http_pool_size': self.http_pool_spin.value(),
+            'extract_workers': self.extract_workers_spin.value(),
+            'extract_rate': self.extract_rate_spin.value(),
+            'async_fetch': self.async_fetch_checkbox.isChecked(),
+            'html_cache_mb': self.html_cache_spin.value(),
+            'raw_captures': self.raw_captures_checkbox.isChecked(),
+            'resume_extraction': self.resume_extraction_checkbox.isChecked()
         }
 
+    def toggle_async_fetch(self, enabled):
+        """Asenkron istek motorunu başlatır/kapatır; açıkken archive_http istekleri motora gider"""
+        try:
+            if enabled:
+                async_fetch.enable()
+                self.add_log_message("Asenkron istek motoru açıldı (aiohttp)", "INFO")
+            else:
+                async_fetch.disable()
+                self.add_log_message("Asenkron istek motoru kapatıldı", "INFO")
+        except Exception as e:
+            self.add_log_message(f"Asenkron istek motoru başlatılamadı: {e}", "ERROR")
+            self.async_fetch_checkbox.setChecked(False)
+
+    def clear_local_index(self):
+        """Girilen domainin yerel snapshot indeksini siler"""
+        domain = self.clean_domain(self.domain_input.text())
+        if not domain:
+            self.add_log_message("Domain girilmedi!", "ERROR")
+            return
+        index = SnapshotIndex()
+        try:
+            removed = index.clear_domain(domain)
+        finally:
+            index.close()
+        self.add_log_message(f"{domain} için yerel indeks temizlendi ({removed} sorgu)", "INFO")
+
     def retry_failed_urls(self):
         """Seçili başarısız URL'leri tekrar çek"""
         selected_items = self.failed_urls_list.selectedItems()
@@ -4557,6 +5124,24 @@ class MainWindow(QMainWindow):
         self.content_timeout_spin.setValue(60)  # İçerik timeout'u artır
         self.retry_spin.setValue(3)  # Retry sayısını azalt (çok fazla deneme yapıyor)
         self.request_delay_spin.setValue(1)  # Request delay'i azalt
+        self.paged_discovery_checkbox.setChecked(True)  # Büyük domainler için sayfalı keşif
+        self.server_filters_checkbox.setChecked(True)  # Gereksiz URL'leri sunucuda ele
+        self.status_200_checkbox.setChecked(False)
+        self.html_only_checkbox.setChecked(False)
+        self.collapse_combo.setCurrentIndex(0)
+        self.cdx_workers_spin.setValue(1)
+        self.local_index_checkbox.setChecked(True)
+        self.categorize_workers_spin.setValue(default_worker_count())
+        self.batch_workers_spin.setValue(2)
+        self.subdomains_checkbox.setChecked(False)
+        self.url_request_budget_spin.setValue(DEFAULT_URL_REQUEST_BUDGET)
+        self.http_pool_spin.setValue(archive_http.DEFAULT_POOL_SIZE)
+        self.extract_workers_spin.setValue(1)
+        self.extract_rate_spin.setValue(archive_http.DEFAULT_MAX_RATE)
+        self.async_fetch_checkbox.setChecked(False)
+        self.html_cache_spin.setValue(html_cache.DEFAULT_MAX_MB)
+        self.raw_captures_checkbox.setChecked(True)
+        self.resume_extraction_checkbox.setChecked(True)
         self.add_log_message("Timeout ayarları varsayılan değerlere sıfırlandı", "INFO")
 
     def update_extracted_list(self):
@@ -4919,8 +5504,15 @@ class MainWindow(QMainWindow):
             self.extraction_thread.wait(5000)  # 5 saniye bekle
         
         if hasattr(self, 'analysis_thread') and self.analysis_thread and self.analysis_thread.isRunning():
+            self.analysis_thread.stop_requested = True
             self.analysis_thread.wait(5000)  # 5 saniye bekle
         
+        if self.batch_thread and self.batch_thread.isRunning():
+            self.batch_thread.stop_requested = True
+            self.batch_thread.wait(5000)  # 5 saniye bekle
+        
+        async_fetch.disable()
+        
         # Timer'ları durdur
         if hasattr(self, 'progress_timer') and self.progress_timer.isActive():
             self.progress_timer.stop()
@@ -5238,15 +5830,17 @@ class AutoDetectionThread(QThread):
         super().__init__()
         self.url_to_snapshots = url_to_snapshots
         self.parent_window = parent_window
+        # Ayar arayüz iş parçacığında okunur (widget'lara thread içinden erişilmez)
+        settings = parent_window.get_timeout_settings() if hasattr(parent_window, 'get_timeout_settings') else {}
+        self.raw_captures = settings.get('raw_captures', True)
     
     def run(self):
         """Otomatik tespit işlemini yapar"""
         try:
             # Önce internet bağlantısını kontrol et
             self.progress.emit("🌐 İnternet bağlantısı kontrol ediliyor...")
-            import requests
             try:
-                test_response = requests.get("https://web.archive.org", timeout=10)
+                test_response = archive_http.get("https://web.archive.org", timeout=10)
                 if test_response.status_code != 200:
                     self.progress.emit("❌ Archive.org'a erişilemiyor! İnternet bağlantınızı kontrol edin.")
                     return
@@ -5260,11 +5854,14 @@ class AutoDetectionThread(QThread):
             processed = 0
             successful = 0
             
-            # Akıllı retry mekanizması
-            base_delay = 2
-            max_delay = 60
-            consecutive_errors = 0
-            max_consecutive_errors = 5
+            # İstek hızı ve 429/503 sonrası bekleme ortak hız denetleyicisinde (archive_http)
+            # Asenkron motor açıksa tüm sayfalar önceden aynı anda istenir, sırayla işlenir
+            engine = archive_http.get_engine()
+            prefetched = None
+            if engine is not None:
+                latest_urls = [self.fetch_url(max(snapshots, key=lambda s: s['timestamp'])['archive_url'])
+                               for snapshots in self.url_to_snapshots.values() if snapshots]
+                prefetched = engine.iter_fetch(latest_urls, timeout=15)
             
             for url, snapshots in self.url_to_snapshots.items():
                 try:
@@ -5274,9 +5871,10 @@ class AutoDetectionThread(QThread):
                     if snapshots:
                         latest_snapshot = max(snapshots, key=lambda s: s['timestamp'])
                         archive_url = latest_snapshot['archive_url']
+                        first_response = next(prefetched)[1] if prefetched is not None else None
                         
                         # Akıllı retry ile HTML çek
-                        soup = self.fetch_with_retry(archive_url)
+                        soup = self.fetch_with_retry(self.fetch_url(archive_url), first_response=first_response)
                         
                         if soup:
                             # Kategori ve etiket tespiti
@@ -5290,56 +5888,51 @@ class AutoDetectionThread(QThread):
                             self.parent_window.detected_categories_cache[url]['tags'] = tags
                             
                             successful += 1
-                            consecutive_errors = 0  # Başarılı istek
                             
                             if categories or tags:
                                 self.progress.emit(f"✅ {url[:30]}... - {len(categories)} kategori, {len(tags)} etiket")
                             else:
                                 self.progress.emit(f"⚠️ {url[:30]}... - Kategori/etiket bulunamadı")
                         else:
-                            consecutive_errors += 1
                             self.progress.emit(f"❌ {url[:30]}... - HTML çekilemedi")
                         
-                        # Akıllı bekleme
-                        if consecutive_errors >= max_consecutive_errors:
-                            delay = min(base_delay * (2 ** consecutive_errors), max_delay)
-                            self.progress.emit(f"⚠️ Çok fazla hata! {delay} saniye bekleniyor...")
-                            import time
-                            time.sleep(delay)
-                        else:
-                            import time
-                            time.sleep(base_delay)
-                        
                     processed += 1
                     
                 except Exception as e:
-                    consecutive_errors += 1
                     print(f"❌ URL tespit hatası ({url}): {e}")
                     processed += 1
                     continue
             
             self.progress.emit(f"🎯 Tespit tamamlandı! {successful}/{total_urls} URL başarılı")
+            stats = html_cache.summary()
+            if stats:
+                self.progress.emit(f"💾 {stats}")
             
         except Exception as e:
             print(f"❌ Otomatik tespit hatası: {e}")
             self.progress.emit(f"Hata: {str(e)}")
     
-    def fetch_with_retry(self, archive_url, max_retries=3):
-        """Akıllı retry ile HTML çeker"""
+    def fetch_url(self, archive_url):
+        """Ham snapshot modu açıksa (varsayılan) sayfa id_ adresinden istenir"""
+        if self.raw_captures:
+            return raw_capture_url(archive_url)
+        return archive_url
+
+    def fetch_with_retry(self, archive_url, max_retries=3, first_response=None):
+        """Akıllı retry ile HTML çeker (first_response: asenkron motorun önceden çektiği ilk deneme)"""
         import requests
         from bs4 import BeautifulSoup
         import time
         
         for attempt in range(max_retries):
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8',
-                    'Connection': 'keep-alive'
-                }
-                
-                response = requests.get(archive_url, headers=headers, timeout=15)
+                if attempt == 0 and first_response is not None:
+                    if isinstance(first_response, Exception):
+                        raise first_response
+                    response = first_response
+                else:
+                    # Ortak başlıklar ve açık bağlantılar paylaşılan oturumdan gelir
+                    response = archive_http.get(archive_url, timeout=15)
                 
                 if response.status_code == 200:
                     # Encoding'i düzelt
@@ -5349,14 +5942,13 @@ class AutoDetectionThread(QThread):
                     soup = BeautifulSoup(response.content, 'html.parser')
                     return soup
                     
-                elif response.status_code == 429:
-                    # Rate limit
-                    delay = (attempt + 1) * 5
-                    self.progress.emit(f"⚠️ Rate limit! {delay} saniye bekleniyor...")
-                    time.sleep(delay)
+                elif response.status_code in archive_http.THROTTLE_STATUSES:
+                    # Hız denetleyicisi hızı düşürdü ve Retry-After kadar yeni isteği bekletecek
+                    self.progress.emit(f"⚠️ Rate limit ({response.status_code})! "
+                                       f"{archive_http.RATE_CONTROLLER.pause_remaining():.0f} saniye bekleniyor...")
                     continue
                     
-                elif response.status_code in [502, 503, 504]:
+                elif response.status_code in [502, 504]:
                     # Server hatası
                     delay = (attempt + 1) * 10
                     self.progress.emit(f"⚠️ Server hatası {response.status_code}! {delay} saniye bekleniyor...")
@@ -5456,13 +6048,16 @@ class AutoDetectionThread(QThread):
 class DomainAnalysisThread(QThread):
     """Domain analizi yapan thread"""
     progress = Signal(str)
+    partial_results = Signal(object)  # CDX indirilirken tüm tarihler için ara keşif sonuçları
     analysis_complete = Signal(list, int)
     error = Signal(str)
     
-    def __init__(self, domain, analysis_id):
+    def __init__(self, session, analysis_id):
         super().__init__()
-        self.domain = domain
+        self.session = session  # Keşif adımıyla paylaşılan DiscoverySession
+        self.domain = session.domain
         self.analysis_id = analysis_id
+        self.stop_requested = False
     
     def run(self):
         try:
@@ -5481,33 +6076,65 @@ class DomainAnalysisThread(QThread):
             self.error.emit(f"Analiz hatası: {str(e)}")
     
     def get_available_dates(self):
-        """Domain'in hangi tarihlerde arşivlendiğini bulur (tüm domain için)"""
+        """Domain'in hangi aylarda arşivlendiğini bulur; snapshot'lar keşifte tekrar kullanılmak üzere oturumda kalır.
+
+        İndirme sırasında gelen URL'ler indirme bitmeden kategorilere düşer (tüm tarihler).
+        """
+        categorizer = DiscoveryCategorizer(self.session.timeout_settings, self.progress.emit)
+        categorizer.load(self.session, stop_check=lambda: self.stop_requested, on_partial=self.partial_results.emit)
+        if categorizer.time_to_first_url is not None:
+            categorizer.emit_partial_results(self.session, on_partial=self.partial_results.emit)  # Son durum: tüm snapshot'lar
+        return self.session.available_months()
+
+class BatchDiscoveryThread(QThread):
+    """Domain listesini kuyruktan alıp birkaçını eşzamanlı keşfeden thread.
+
+    Tüm CDX istekleri archive_http'deki ortak hız denetleyicisinden geçtiği için eşzamanlı
+    domain sayısı arttıkça archive.org'a giden toplam istek hızı artmaz.
+    """
+    progress = Signal(str)
+    domain_finished = Signal(str, object)  # domain, BatchDomainResult
+    batch_complete = Signal(object)  # {domain: BatchDomainResult}
+
+    def __init__(self, domains, timeout_settings=None, start_date=None, end_date=None):
+        super().__init__()
+        self.domains = list(dict.fromkeys(domains))  # Tekrarlananları at, sırayı koru
+        self.timeout_settings = timeout_settings or {'api_timeout': 60, 'retry_count': 3}
+        self.start_date = start_date
+        self.end_date = end_date
+        self.results = {}
+        self.stop_requested = False
+
+    def run(self):
+        workers = max(1, min(self.timeout_settings.get('batch_workers', 2), len(self.domains)))
+        self.progress.emit(f"Toplu keşif: {len(self.domains)} domain, {workers} eşzamanlı")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.discover_domain, domain): domain for domain in self.domains}
+            for future in as_completed(futures):
+                domain = futures[future]
+                result = future.result()
+                self.results[domain] = result
+                self.domain_finished.emit(domain, result)
+        self.batch_complete.emit(self.results)
+
+    def discover_domain(self, domain):
+        """Tek domaini indirip kategorize eder; hata kuyruğu durdurmaz, sonuçta saklanır"""
+        started = time.perf_counter()
+        if self.stop_requested:
+            return BatchDomainResult(domain, None, {}, 0, 0, self.start_date, self.end_date, 0.0, "Toplu keşif durduruldu")
+        session = DiscoverySession(domain, self.timeout_settings, self.start_date, self.end_date)
+        categorizer = DiscoveryCategorizer(self.timeout_settings, lambda message: self.progress.emit(f"[{domain}] {message}"))
         try:
-            cdx_url = f"https://web.archive.org/cdx/search/cdx"
-            params = {
-                'url': self.domain + '/*',
-                'output': 'json',
-                'fl': 'timestamp',
-                'collapse': 'timestamp:4'
-            }
-            response = requests.get(cdx_url, params=params, timeout=60)
-            if response.status_code != 200:
-                return []
-            data = response.json()
-            if len(data) <= 1:
-                return []
-            dates = []
-            for row in data[1:]:
-                if row:
-                    timestamp = row[0]
-                    if len(timestamp) >= 8:
-                        year = timestamp[:4]
-                        month = timestamp[4:6]
-                        dates.append(f"{year}-{month}")
-            return sorted(list(set(dates)))
+            categorizer.load(session, stop_check=lambda: self.stop_requested, progressive=False)
+            if not len(session.snapshots):
+                return BatchDomainResult(domain, session, {}, 0, 0, self.start_date, self.end_date,
+                                         time.perf_counter() - started, "Bu domain için hiç arşiv bulunamadı!")
+            categories = categorizer.build_categories(session, self.start_date, self.end_date, report_progress=False)
         except Exception as e:
-            print(f"Tarih alma hatası: {e}")
-            return []
+            return BatchDomainResult(domain, session, {}, 0, 0, self.start_date, self.end_date,
+                                     time.perf_counter() - started, str(e))
+        return BatchDomainResult(domain, session, categories, categorizer.total_snapshots, categorizer.used_snapshots,
+                                 self.start_date, self.end_date, time.perf_counter() - started, None)
 
 def test_url_selection_window():
     from PySide6.QtWidgets import QApplication
@@ -5623,4 +6250,7 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Paketlenmiş (frozen) uygulamada paralel kategorize süreçleri için gerekli
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+Ortak HTTP istemcisi
+web.archive.org'a giden tüm istekler (CDX, içerik çekme, otomatik tespit) tek bir
+bağlantı havuzlu requests.Session üzerinden yapılır; TCP/TLS bağlantıları istekler
+arasında açık tutulup yeniden kullanılır, ortak başlıklar tek yerde tanımlanır.
+Tüm istekler ortak bir AIMD hız denetleyicisinden geçer: hız düşük bir değerden başlar,
+yanıtlar sağlıklıyken kullanıcının üst sınırına kadar adım adım artırılır, 429/503 geldiğinde yarıya indirilir ve Retry-After kadar beklenir.
+Asenkron motor (async_fetch) etkinse akış olmayan istekler ona yönlendirilir.
+Wayback capture istekleri önce HTML önbelleğine (html_cache) bakar
+"""
+
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import html_cache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive'
+}
+POOL_HOSTS = 4  # Bağlantı havuzu tutulan farklı host sayısı (web.archive.org, archive.org ...)
+DEFAULT_POOL_SIZE = 10  # Host başına açık tutulan bağlantı sayısı
+DEFAULT_START_RATE = 1.0  # Tüm isteklerin başlangıç toplam hızı (istek/sn)
+DEFAULT_MAX_RATE = 5.0  # Hızın sağlıklı yanıtlarla çıkabileceği varsayılan üst sınır (istek/sn)
+MIN_RATE = 0.1  # Hız bunun altına düşürülmez (10 saniyede bir istek)
+RATE_INCREASE = 0.1  # Her sağlıklı yanıtta hıza eklenen miktar (istek/sn)
+RATE_DECREASE = 0.5  # 429/503 geldiğinde hızın çarpıldığı oran
+DECREASE_COOLDOWN = 2.0  # Aynı anda gelen yanıtlar hızı art arda düşürmesin diye iki düşüş arası en az süre (sn)
+MAX_RETRY_AFTER = 300  # Sunucunun istediği bekleme bundan uzunsa bu kadar beklenir (sn)
+THROTTLE_STATUSES = (429, 503)
+
+_session = None
+_pool_size = DEFAULT_POOL_SIZE  # Kullanıcı ayarı (HTTP havuz boyutu)
+_pool_demands = []  # Süren eşzamanlı işlerin geçici olarak istediği bağlantı sayıları
+_session_pool_size = None  # Mevcut oturumun host başına bağlantı sayısı
+_lock = threading.Lock()
+_engine = None  # Etkinse async_fetch.AsyncFetchEngine
+
+
+def _build_session(pool_size):
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    _mount_adapter(session, pool_size)
+    return session
+
+
+def _mount_adapter(session, pool_size):
+    """Oturuma verilen boyutta yeni bir bağlantı havuzu takar ve öncekini döndürür.
+
+    Adaptör sözlüğü tek atamayla değiştirilir; başka iş parçacıklarında süren
+    get_adapter çağrıları değişen bir sözlük üzerinde dolaşmaz.
+    """
+    previous = session.adapters.get('https://')
+    # Havuz doluysa istek beklemez, geçici bağlantı açılır (pool_block=False)
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size)
+    session.adapters = OrderedDict([('https://', adapter), ('http://', adapter)])
+    return previous
+
+
+def _effective_pool_size():
+    return max([_pool_size] + _pool_demands)
+
+
+def _refresh_session():
+    """Gereken bağlantı sayısı değiştiyse oturumun havuzu yeniden boyutlandırılır (kilit tutulurken çağrılır).
+
+    Oturum aynı kalır, sadece adaptörü değişir. Eski adaptör kapatılır: boştaki
+    bağlantıları hemen kapanır, süren isteklerin bağlantıları istek bitince kapanır.
+    """
+    global _session_pool_size
+    pool_size = _effective_pool_size()
+    if _session is None or _session_pool_size == pool_size:
+        return
+    previous = _mount_adapter(_session, pool_size)
+    _session_pool_size = pool_size
+    if previous is not None:
+        previous.close()
+
+
+def get_session():
+    """Paylaşılan oturumu döndürür (ilk çağrıda oluşturulur)"""
+    global _session, _session_pool_size
+    with _lock:
+        if _session is None:
+            _session_pool_size = _effective_pool_size()
+            _session = _build_session(_session_pool_size)
+        return _session
+
+
+def configure(pool_size=None):
+    """Host başına bağlantı sayısı ayarını değiştirir"""
+    global _pool_size
+    with _lock:
+        if pool_size is None or pool_size == _pool_size:
+            return
+        _pool_size = pool_size
+        _refresh_session()
+
+
+@contextmanager
+def pool_size_at_least(pool_size):
+    """Blok süresince havuz en az pool_size bağlantı tutar (eşzamanlı işçiler bağlantı beklemesin).
+
+    Blok bitince havuz kullanıcı ayarına (veya süren diğer işlerin istediğine) döner.
+    """
+    with _lock:
+        _pool_demands.append(pool_size)
+        _refresh_session()
+    try:
+        yield
+    finally:
+        with _lock:
+            _pool_demands.remove(pool_size)
+            _refresh_session()
+
+
+class RequestCancelled(requests.exceptions.RequestException):
+    """Hız sınırı beklenirken durdurma istendiğinde fırlatılır"""
+
+
+def retry_after_seconds(response):
+    """Retry-After başlığını (saniye veya HTTP tarihi) saniyeye çevirir; yoksa None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = int(value)
+    else:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+class FetchResponse:
+    """requests.Response'un içerik çekmede kullanılan kısmıyla uyumlu, tamamen okunmuş yanıt
+    (asenkron motor ve önbellek yanıtları)"""
+
+    def __init__(self, url, status_code, headers, content, encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def close(self):
+        pass
+
+
+def cached_response(url):
+    """URL önbellekteki bir capture ise ağa gitmeden yanıt döndürür, değilse None"""
+    page = html_cache.lookup(url)
+    if page is None:
+        return None
+    headers = {'Content-Type': page.content_type} if page.content_type else {}
+    return FetchResponse(url, 200, headers, page.body, page.encoding)
+
+
+def store_response(url, response):
+    """200 dönen capture yanıtını önbelleğe yazar"""
+    if response.status_code == 200:
+        html_cache.store(url, response.content, response.headers.get('Content-Type'), response.encoding)
+
+
+def set_engine(engine):
+    """Akış olmayan isteklerin yönlendirileceği asenkron motoru ayarlar (None: requests oturumu)"""
+    global _engine
+    _engine = engine
+
+
+def get_engine():
+    return _engine
+
+
+def get(url, stop_check=None, **kwargs):
+    """Paylaşılan oturumla GET isteği yapar (requests.get ile aynı parametreler).
+
+    İstekten önce ortak hız denetleyicisinden hak alınır, yanıt durumu denetleyiciye bildirilir.
+    Asenkron motor etkinse (stream=True olan CDX akışları hariç) istek motorda yapılır.
+    Önbellekteki capture'lar için istek yapılmaz.
+    """
+    engine = _engine
+    buffered = not kwargs.get('stream') and not kwargs.get('params')
+    if engine is not None and not kwargs.get('stream'):
+        return engine.get(url, stop_check=stop_check, **kwargs)
+    if buffered:
+        cached = cached_response(url)
+        if cached is not None:
+            return cached
+    if not RATE_CONTROLLER.acquire(stop_check):
+        raise RequestCancelled("İstek durduruldu")
+    response = get_session().get(url, **kwargs)
+    RATE_CONTROLLER.record(response.status_code, retry_after_seconds(response))
+    if buffered:
+        store_response(url, response)
+    return response
+
+
+class TokenBucket:
+    """İş parçacıkları arasında paylaşılan token bucket hız sınırlayıcı.
+
+    Ortalama saniyede rate istek başlatılır; boşta biriken hak en fazla capacity
+    isteklik ani çıkışa izin verir.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def set_rate(self, rate, capacity=None):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity or max(1.0, rate)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _wait_time(self, now):
+        """Hak varsa birini alıp 0, yoksa beklenecek süreyi döndürür (kilit tutulurken çağrılır)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self, stop_check=None):
+        """Bir istek hakkı alınana kadar bekler; stop_check True dönerse False ile çıkar"""
+        while True:
+            with self.lock:
+                delay = self._wait_time(time.monotonic())
+            if not delay:
+                return True
+            if stop_check and stop_check():
+                return False
+            time.sleep(min(delay, 0.5))  # Durdurma isteği için en geç yarım saniyede bir bak
+
+    async def acquire_async(self, stop_check=None):
+        """acquire'ın asyncio sürümü: beklerken döngüyü bloklamaz"""
+        while True:
+            with self.lock:
+                delay = self._wait_time(time.monotonic())
+            if not delay:
+                return True
+            if stop_check and stop_check():
+                return False
+            await asyncio.sleep(min(delay, 0.5))
+
+
+class AdaptiveRateController(TokenBucket):
+    """AIMD ile hızını kendi ayarlayan token bucket.
+
+    Her 2xx/3xx yanıtta hız RATE_INCREASE kadar artar (max_rate'e kadar); 429/503
+    geldiğinde RATE_DECREASE ile çarpılır ve Retry-After (yoksa bir istek aralığı)
+    boyunca hiçbir isteğe hak verilmez. Diğer 4xx'ler (ölü/eksik capture'ların 404'leri)
+    ve 503 dışındaki 5xx'ler hız hakkında bilgi vermediği için hızı değiştirmez.
+    Böylece hız archive.org'un gerçekte kabul ettiği değere yakınsar.
+    """
+
+    def __init__(self, rate, max_rate=None, min_rate=MIN_RATE):
+        super().__init__(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+
+    def set_max_rate(self, max_rate):
+        """Kullanıcı ayarındaki üst sınırı uygular; mevcut hız bu sınırı aşıyorsa düşürülür"""
+        with self.lock:
+            self.max_rate = max(max_rate, self.min_rate)
+            if self.rate > self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = self.capacity = self.max_rate
+                self.tokens = min(self.tokens, self.capacity)
+
+    def _wait_time(self, now):
+        if now < self.paused_until:
+            return self.paused_until - now
+        return super()._wait_time(now)
+
+    def pause_remaining(self):
+        """Retry-After beklemesinden kalan süre (sn)"""
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def record(self, status_code, retry_after=None):
+        """Yanıt durumuna göre hızı ayarlar"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if status_code in THROTTLE_STATUSES:
+                if now - self.last_decrease >= DECREASE_COOLDOWN:
+                    self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+                    self.capacity = max(1.0, self.rate)
+                    self.last_decrease = now
+                self.tokens = 0
+                wait = retry_after if retry_after is not None else 1 / self.rate
+                self.paused_until = max(self.paused_until, now + wait)
+            elif 200 <= status_code < 400:
+                self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+                self.capacity = max(1.0, self.rate)
+
+
+# Tüm isteklerin (CDX, içerik çekme, otomatik tespit) paylaştığı hız denetleyicisi
+RATE_CONTROLLER = AdaptiveRateController(DEFAULT_START_RATE, DEFAULT_MAX_RATE)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Asenkron istek motoru
+aiohttp ile tek bir iş parçacığındaki asyncio döngüsünde çok sayıda snapshot isteğini
+aynı anda yürütür. Etkinleştirildiğinde archive_http.get istekleri (CDX akışları
+hariç) bu motora yönlendirilir; QThread'ler motoru requests yerine senkron get() ile,
+toplu işler iter_fetch() ile kullanır. Hız sınırı archive_http'deki ortak denetleyicidir.
+"""
+
+import asyncio
+import threading
+
+import requests
+
+import archive_http
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp opsiyonel
+    aiohttp = None
+
+MAX_IN_FLIGHT = 200  # Aynı anda açık en fazla istek (hız sınırı ayrıca uygulanır)
+DEFAULT_TIMEOUT = 30
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def is_available():
+    """aiohttp kuruluysa True"""
+    return aiohttp is not None
+
+
+class AsyncFetchEngine:
+    """Kendi iş parçacığında asyncio döngüsü ve aiohttp oturumu çalıştıran istek motoru"""
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT):
+        if aiohttp is None:
+            raise RuntimeError("Asenkron istek motoru için aiohttp kurulu olmalı")
+        self.max_in_flight = max_in_flight
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='async-fetch', daemon=True)
+        self.thread.start()
+        self.session, self.semaphore = self.call(self._open())
+
+    async def _open(self):
+        headers = {k: v for k, v in archive_http.DEFAULT_HEADERS.items() if k != 'Connection'}
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.max_in_flight)
+        return aiohttp.ClientSession(headers=headers, connector=connector), asyncio.Semaphore(self.max_in_flight)
+
+    def call(self, coroutine):
+        """Bir coroutine'i motorun döngüsünde çalıştırıp sonucunu (çağıran iş parçacığında) bekler"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def fetch(self, url, timeout=DEFAULT_TIMEOUT, params=None, headers=None, stop_check=None):
+        """Tek bir isteği yapar; hatalar mevcut kodun yakaladığı requests istisnalarına çevrilir.
+
+        Capture önbellekteyse istek yapılmaz, başarılı capture yanıtları önbelleğe yazılır.
+        Önbellek (SQLite + zlib) işlemleri döngüyü bloklamasın diye executor'da yapılır.
+        """
+        if params is None:
+            cached = await self.loop.run_in_executor(None, archive_http.cached_response, url)
+            if cached is not None:
+                return cached
+        async with self.semaphore:
+            if not await archive_http.RATE_CONTROLLER.acquire_async(stop_check):
+                raise archive_http.RequestCancelled("İstek durduruldu")
+            try:
+                async with self.session.get(url, params=params, headers=headers,
+                                            timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    content = await response.read()
+                    result = archive_http.FetchResponse(str(response.url), response.status, response.headers,
+                                                        content, response.charset)
+            except asyncio.TimeoutError as e:
+                raise requests.exceptions.Timeout(f"timeout: {timeout}s") from e
+            except aiohttp.ClientError as e:
+                raise requests.exceptions.ConnectionError(str(e)) from e
+        archive_http.RATE_CONTROLLER.record(result.status_code, archive_http.retry_after_seconds(result))
+        if params is None:
+            await self.loop.run_in_executor(None, archive_http.store_response, url, result)
+        return result
+
+    def get(self, url, stop_check=None, timeout=DEFAULT_TIMEOUT, params=None, headers=None):
+        """requests.get yerine kullanılabilen senkron istek (çağıran iş parçacığı yanıtı bekler)"""
+        return self.call(self.fetch(url, timeout, params, headers, stop_check))
+
+    def iter_fetch(self, urls, timeout=DEFAULT_TIMEOUT, stop_check=None):
+        """URL'lerin hepsini aynı anda (hız ve açık istek sınırı içinde) çeker.
+
+        Sonuçlar verilen sırayla (url, yanıt veya istisna) olarak döner; sıradaki
+        beklenirken sonrakiler indirilmeye devam eder. Döngü yarıda bırakılırsa
+        kalan istekler iptal edilir.
+        """
+        futures = [asyncio.run_coroutine_threadsafe(self.fetch(url, timeout, stop_check=stop_check), self.loop)
+                   for url in urls]
+        try:
+            for url, future in zip(urls, futures):
+                try:
+                    yield url, future.result()
+                except Exception as e:
+                    yield url, e
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        """Oturumu kapatıp döngüyü durdurur"""
+        self.call(self.session.close())
+        self.call(self.loop.shutdown_default_executor())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        self.loop.close()
+
+
+def enable(max_in_flight=MAX_IN_FLIGHT):
+    """Paylaşılan motoru başlatıp archive_http isteklerini ona yönlendirir"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AsyncFetchEngine(max_in_flight)
+            archive_http.set_engine(_engine)
+        return _engine
+
+
+def disable():
+    """İstekleri tekrar requests oturumuna döndürür ve motoru kapatır"""
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+        if engine is not None:
+            archive_http.set_engine(None)
+            engine.close()
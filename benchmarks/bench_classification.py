@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+URL sınıflandırma karşılaştırması
+Sentetik bir CDX çıktısı (varsayılan 1.000.000 satır) üretir, eski is_* zinciri ile
+url_classifier.classify_url'yi aynı URL'ler üzerinde çalıştırıp süreleri yazdırır ve
+sonuçların birebir aynı olduğunu doğrular.
+
+Kullanım: python benchmarks/bench_classification.py [--rows 1000000] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from url_classifier import classify_url, CATEGORY_NAMES, URL_JUNK  # noqa: E402
+
+
+# --- Eski sınıflandırma (ArchiveDiscovery'deki önceki hali) ---
+
+def legacy_is_junk_url(url):
+    junk_patterns = [
+        r'wp-login\.php', r'wp-admin', r'/feed/', r'/comments/feed/',
+        r'/sitemap\.xml', r'/robots\.txt', r'\.json$', r'\.xml$', r'\.css$', r'\.js$',
+        r'\?replytocom', r'\.gz$', r'\.zip$', r'\.rar$', r'\.tar\.gz$'
+    ]
+    return any(re.search(pattern, url, re.IGNORECASE) for pattern in junk_patterns)
+
+
+def legacy_is_blog_post(url):
+    parsed_url = urlparse(url)
+    path = parsed_url.path.lower()
+    if re.search(r'\.(html|php|asp|aspx|htm)$', path):
+        return True
+    if re.match(r'^/\d{4}/\d{2}/\d{2}/.+', path) or re.match(r'^/\d{4}/\d{2}/.+', path):
+        return True
+    if any(x in path for x in ['/blog/', '/post/', '/yazi/', '/makale/', '/haber/', '/entry/', '/story/']):
+        return True
+    segments = [s for s in path.split('/') if s]
+    if segments and not re.match(r'^\d+$', segments[-1]) and len(segments) > 1:
+        return True
+    return False
+
+
+def legacy_is_image(url):
+    image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg', '.ico']
+    return any(url.lower().endswith(ext) for ext in image_extensions)
+
+
+def legacy_is_document(url):
+    doc_extensions = ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.xls', '.xlsx', '.ppt', '.pptx']
+    return any(url.lower().endswith(ext) for ext in doc_extensions)
+
+
+def legacy_is_page(url):
+    parsed_url = urlparse(url)
+    path = parsed_url.path.lower()
+    page_patterns = [
+        r'/page/', r'/sayfa/', r'/index', r'/home',
+        r'^/$', r'^/index\.html$', r'^/index\.php$',
+        r'/kategori/', r'/category/', r'/etiket/', r'/tag/',
+        r'/author/', r'/yazar/', r'/arsiv/', r'/archive/',
+        r'/search/', r'\?s=', r'^/\d{4}/\d{2}(/\d{2})?/?$'
+    ]
+    return any(re.search(pattern, path) for pattern in page_patterns)
+
+
+def legacy_is_extra_junk(url):
+    import re
+    extra_junk_patterns = [
+        r'wp-json', r'wp-includes', r'wp-content', r'contact-form-7', r'oembed',
+        r'\.js$', r'\.css$', r'\.jpg$', r'\.jpeg$', r'\.png$', r'\.gif$', r'\.svg$', r'\.ico$', r'\.xml$', r'\.json$', r'\.woff$', r'\.ttf$', r'\.pdf$', r'\.zip$', r'\.gz$', r'\.tar$', r'\.mp4$', r'\.mp3$', r'\.webp$', r'\.avi$', r'\.mov$', r'\.wmv$', r'\.flv$', r'\.mkv$', r'\.apk$', r'\.exe$', r'\.bin$', r'\.dmg$', r'\.msi$', r'\.tar\.gz$', r'\.rar$'
+    ]
+    return any(re.search(pattern, url, re.IGNORECASE) for pattern in extra_junk_patterns)
+
+
+def legacy_classify(url):
+    if legacy_is_junk_url(url) or legacy_is_extra_junk(url):
+        return URL_JUNK
+    if legacy_is_image(url):
+        return 0
+    if legacy_is_document(url):
+        return 1
+    if legacy_is_blog_post(url):
+        return 2
+    if legacy_is_page(url):
+        return 3
+    return 4
+
+
+# --- Sentetik CDX verisi ---
+
+PATH_TEMPLATES = [
+    '/{y}/{m}/{d}/{slug}/', '/{y}/{m}/{slug}.html', '/{y}/{m}/', '/{y}/{m}/{d}/',
+    '/blog/{slug}', '/haber/{slug}-{n}', '/yazi/{slug}.php', '/{slug}/{n}', '/{slug}/',
+    '/category/{slug}/', '/kategori/{slug}/page/{n}/', '/tag/{slug}', '/etiket/{slug}/',
+    '/author/{slug}/', '/page/{n}/', '/', '/index.php', '/index.html', '/home',
+    '/?s={slug}', '/?p={n}', '/{slug}/feed/', '/{slug}/amp', '/comments/feed/',
+    '/feed/', '/sitemap.xml', '/robots.txt', '/wp-login.php', '/wp-admin/post.php',
+    '/wp-json/wp/v2/posts', '/wp-includes/js/jquery.js', '/wp-content/uploads/{y}/{m}/{slug}.JPG',
+    '/images/{slug}.png', '/img/{slug}.bmp', '/files/{slug}.pdf', '/files/{slug}.docx',
+    '/files/{slug}.xls', '/static/{slug}.css', '/static/{slug}.js?ver={n}', '/media/{slug}.mp4',
+    '/{slug}.ASPX', '/{slug}?replytocom={n}', '/oembed/1.0/embed', '/{n}', '/{slug}/{slug}.txt',
+    '/yazı/{slug}', '/görsel/{slug}.JPG', '/dosyalar/{slug}.Js', '/kategori/ığdır/', '/{y}/{m}/çığ-{n}.html',
+]
+HOSTS = ['http://example.com', 'https://example.com', 'http://www.example.com', 'http://example.com:80']
+SLUG_WORDS = ['arsiv', 'haber', 'yeni', 'post', 'story', 'test', 'ornek', 'deneme', 'Makale', 'spor']
+
+
+def generate_cdx_lines(rows, seed):
+    """CDX metin çıktısı biçiminde (timestamp original) satırlar üretir"""
+    rng = random.Random(seed)
+    # Gerçek CDX çıktısındaki gibi popüler URL'ler çok kez tekrarlanır
+    unique = []
+    for _ in range(max(rows // 20, 1)):
+        template = rng.choice(PATH_TEMPLATES)
+        path = template.format(
+            y=rng.randint(2005, 2024), m=f"{rng.randint(1, 12):02d}", d=f"{rng.randint(1, 28):02d}",
+            slug='-'.join(rng.sample(SLUG_WORDS, 2)), n=rng.randint(1, 500)
+        )
+        unique.append(rng.choice(HOSTS) + path)
+    for _ in range(rows):
+        timestamp = f"{rng.randint(2005, 2024)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}120000"
+        yield f"{timestamp} {rng.choice(unique)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{args.rows} satırlık sentetik CDX verisi üretiliyor...")
+    urls = [line.split(' ', 1)[1] for line in generate_cdx_lines(args.rows, args.seed)]
+
+    start = time.perf_counter()
+    legacy = [legacy_classify(url) for url in urls]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [classify_url(url) for url in urls]
+    compiled_time = time.perf_counter() - start
+
+    mismatches = [(url, a, b) for url, a, b in zip(urls, legacy, compiled) if a != b]
+    assert not mismatches, f"{len(mismatches)} farklı sonuç, ilk örnekler: {mismatches[:5]}"
+
+    counts = {}
+    for code in compiled:
+        name = 'junk' if code == URL_JUNK else CATEGORY_NAMES[code]
+        counts[name] = counts.get(name, 0) + 1
+    print(f"Kategori dağılımı: {counts}")
+    print(f"Eski is_* zinciri : {legacy_time:.2f} sn ({args.rows / legacy_time:,.0f} URL/sn)")
+    print(f"classify_url      : {compiled_time:.2f} sn ({args.rows / compiled_time:,.0f} URL/sn)")
+    print(f"Hızlanma          : {legacy_time / compiled_time:.1f}x (sonuçlar birebir aynı)")
+
+
+if __name__ == '__main__':
+    main()
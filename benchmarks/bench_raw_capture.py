@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Ham (id_) capture karşılaştırması
+Aynı snapshot'ları hem Wayback'in yeniden yazdığı normal adresten hem de ham id_
+adresinden indirip sayfa başına aktarılan bayt, açılmış HTML boyutu, DOM eleman sayısı
+ve BeautifulSoup (lxml) ayrıştırma süresini yazdırır. Önbellek kullanılmaz; istekler
+ortak hız denetleyicisine uyar.
+
+Kullanım: python benchmarks/bench_raw_capture.py --domain example.com [--pages 10] [--repeat 3]
+          python benchmarks/bench_raw_capture.py --url https://web.archive.org/web/20200101000000/http://example.com/
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import archive_http  # noqa: E402
+from cdx_api import CdxClient, build_cdx_query  # noqa: E402
+from snapshot_store import capture_url, raw_capture_url  # noqa: E402
+
+
+def sample_captures(domain, pages):
+    """Domainden durum kodu 200 olan, tekil URL'li HTML capture adreslerini seçer"""
+    params = build_cdx_query(domain, status_200=True, html_only=True, collapse='urlkey')
+    client = CdxClient(progress=print)
+    urls = []
+    for row in client.iter_rows(params + [('limit', pages)]):
+        urls.append(capture_url(row[0], row[1]))
+        if len(urls) >= pages:
+            break
+    return urls
+
+
+def measure(url, repeat):
+    """(aktarılan bayt, HTML baytı, eleman sayısı, ortalama ayrıştırma süresi) döndürür"""
+    archive_http.RATE_CONTROLLER.acquire()
+    response = archive_http.get_session().get(url, timeout=60, stream=True)
+    content = response.content
+    archive_http.RATE_CONTROLLER.record(response.status_code, archive_http.retry_after_seconds(response))
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}: {url}")
+    wire_bytes = response.raw.tell()  # Sıkıştırılmış (ağdan geçen) bayt
+    if response.encoding == 'ISO-8859-1':
+        response.encoding = 'utf-8'
+    html = response.text
+    start = time.perf_counter()
+    for _ in range(repeat):
+        soup = BeautifulSoup(html, 'lxml')
+    parse_time = (time.perf_counter() - start) / repeat
+    return wire_bytes, len(content), len(soup.find_all(True)), parse_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--domain')
+    parser.add_argument('--url', action='append', default=[], help="Normal capture adresi (birden çok verilebilir)")
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3, help="Ayrıştırma ölçümünün tekrar sayısı")
+    args = parser.parse_args()
+
+    urls = list(args.url)
+    if args.domain:
+        urls.extend(sample_captures(args.domain, args.pages))
+    if not urls:
+        parser.error("--domain veya --url gerekli")
+
+    totals = {'normal': [0, 0, 0, 0.0], 'raw': [0, 0, 0, 0.0]}
+    measured = 0
+    print(f"{'mod':<7}{'aktarılan':>12}{'HTML':>12}{'eleman':>9}{'ayrıştırma':>12}  adres")
+    for url in urls:
+        try:
+            results = {'normal': measure(url, args.repeat), 'raw': measure(raw_capture_url(url), args.repeat)}
+        except Exception as e:
+            print(f"atlandı: {e}")
+            continue
+        measured += 1
+        for mode, (wire_bytes, html_bytes, elements, parse_time) in results.items():
+            print(f"{mode:<7}{wire_bytes:>12,}{html_bytes:>12,}{elements:>9,}{parse_time * 1000:>10.1f}ms  {url if mode == 'normal' else ''}")
+            for i, value in enumerate((wire_bytes, html_bytes, elements, parse_time)):
+                totals[mode][i] += value
+
+    if not measured:
+        return
+    normal, raw = totals['normal'], totals['raw']
+    print(f"\n{measured} sayfa, sayfa başına ortalama:")
+    for label, i, unit in (('Aktarılan bayt', 0, ''), ('HTML baytı', 1, ''), ('DOM elemanı', 2, '')):
+        print(f"{label:<15}: normal {normal[i] / measured:>12,.0f}{unit}  ham {raw[i] / measured:>12,.0f}{unit}  "
+              f"(%{(1 - raw[i] / normal[i]) * 100 if normal[i] else 0:.0f} azalma)")
+    print(f"{'Ayrıştırma':<15}: normal {normal[3] / measured * 1000:>10.1f}ms  ham {raw[3] / measured * 1000:>10.1f}ms  "
+          f"({normal[3] / raw[3] if raw[3] else 0:.1f}x hızlı)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Capture zaman çizelgesi
+Snapshot timestamp'lerini (YYYYMMDDhhmmss) int64 dizisinde tutar; tarih aralığı
+maskesi, min/max ve aylık capture histogramını vektörel olarak hesaplar.
+NumPy kurulu değilse aynı sonuçları veren saf Python yoluna düşülür.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsiyonel
+    np = None
+
+from url_classifier import URL_IMAGE, URL_DOCUMENT, MIME_HTML, refine_category
+
+MONTH_DIVISOR = 100000000  # YYYYMMDDhhmmss // MONTH_DIVISOR = YYYYMM
+
+
+def month_bounds(start_date, end_date):
+    """Seçili tarih aralığını kapsayan (ilk, son) timestamp tamsayılarını döndürür.
+
+    Eski filtreyle aynı kural: capture'ın ayının ilk günü start_date ile
+    end_date arasında olmalı.
+    """
+    start_month = start_date.year * 100 + start_date.month
+    if start_date.day > 1:
+        # Ayın ilk günü başlangıçtan önce kalıyor, o ay dahil değil
+        start_month = start_month + 1 if start_date.month < 12 else (start_date.year + 1) * 100 + 1
+    end_month = end_date.year * 100 + end_date.month
+    return start_month * MONTH_DIVISOR, (end_month + 1) * MONTH_DIVISOR - 1
+
+
+def format_month(month):
+    """YYYYMM tamsayısını 'YYYY-MM' metnine çevirir"""
+    return f"{month // 100:04d}-{month % 100:02d}"
+
+
+def capture_categories(store, url_categories, url_page_categories, mimetype_categories):
+    """Capture başına kategori kodu: URL'nin kategorisi, capture'ın CDX mimetype'ıyla düzeltilmiş.
+
+    url_page_categories: URL id -> uzantıya bakılmadan yoldan çıkan kategori
+    mimetype_categories: mimetype id -> mimetype_category sonucu (belirsizse -1)
+    NumPy varsa int8 dizisi, yoksa array('b') döndürür (url_classifier.refine_category ile aynı kural).
+    """
+    if np is None:
+        mime_table = [None if category < 0 else category for category in mimetype_categories]
+        result = array('b')
+        for url_id, mimetype_id in zip(store.url_ids, store.mimetype_ids):
+            mime_category = mime_table[mimetype_id] if mimetype_id >= 0 else None
+            result.append(refine_category(url_categories[url_id], url_page_categories[url_id], mime_category))
+        return result
+    url_ids = np.array(store.url_ids, dtype=np.int64)
+    categories = np.array(url_categories, dtype=np.int8)[url_ids]
+    page_categories = np.array(url_page_categories, dtype=np.int8)[url_ids]
+    # Bilinmeyen mimetype id'si (-1) tablonun son elemanına (-1) düşer
+    mime_table = np.array(list(mimetype_categories) + [-1], dtype=np.int8)
+    mime_categories = mime_table[np.array(store.mimetype_ids, dtype=np.int64)]
+    guessed_from_extension = (categories == URL_IMAGE) | (categories == URL_DOCUMENT)
+    html_categories = np.where(guessed_from_extension, page_categories, categories)
+    return np.where(mime_categories < 0, categories,
+                    np.where(mime_categories == MIME_HTML, html_categories, mime_categories)).astype(np.int8)
+
+
+def group_captures(store, indices, url_key_ids, url_categories, keys, capture_categories=None):
+    """Capture'ları URL anahtarına göre gruplar.
+
+    url_key_ids: URL id -> keys içindeki anahtar sırası (listeye alınmayacak URL'ler için -1)
+    url_categories: URL id -> kategori kodu
+    capture_categories: verilirse capture başına kategori (mimetype ile düzeltilmiş), url_categories yerine kullanılır
+    Grupları anahtarın ilk görüldüğü sırayla (anahtar, zamana göre sıralı
+    capture sıraları, kategori) olarak döndürür. Kategori, gruptaki tüm
+    capture'lar aynıysa tek bir kod, değilse sıralarla hizalı array('b')'dir.
+    """
+    if np is None:
+        return _group_captures_python(store, indices, url_key_ids, url_categories, keys, capture_categories)
+    url_ids = np.array(store.url_ids, dtype=np.int64)
+    key_ids = np.array(url_key_ids, dtype=np.int64)
+    categories = np.array(url_categories, dtype=np.int8)
+    if indices is None:
+        selected = np.arange(len(url_ids), dtype=np.int64)
+    else:
+        selected = np.asarray(indices, dtype=np.int64)
+    capture_keys = key_ids[url_ids[selected]]
+    keep = capture_keys >= 0
+    selected = selected[keep]
+    capture_keys = capture_keys[keep]
+    if not len(selected):
+        return []
+    timestamps = np.array(store.timestamps, dtype=np.int64)[selected]
+    # Önce anahtara, anahtar içinde timestamp'e göre (kararlı) sırala
+    order = np.lexsort((timestamps, capture_keys))
+    sorted_indices = selected[order]
+    sorted_keys = capture_keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ends = np.r_[starts[1:], len(sorted_keys)]
+    if capture_categories is not None:
+        sorted_categories = np.asarray(capture_categories, dtype=np.int8)[sorted_indices]
+    else:
+        sorted_categories = categories[url_ids[sorted_indices]]
+    single = np.minimum.reduceat(sorted_categories, starts) == np.maximum.reduceat(sorted_categories, starts)
+    # Grupları anahtarın seçimde ilk görüldüğü sıraya koy
+    first_seen = np.minimum.reduceat(order, starts)
+    sorted_indices = sorted_indices.astype(np.int32)
+    groups = []
+    for position in np.argsort(first_seen, kind='stable').tolist():
+        start, end = int(starts[position]), int(ends[position])
+        group = array('i')
+        group.frombytes(sorted_indices[start:end].tobytes())
+        if single[position]:
+            category = int(sorted_categories[start])
+        else:
+            category = array('b')
+            category.frombytes(sorted_categories[start:end].tobytes())
+        groups.append((keys[int(sorted_keys[start])], group, category))
+    return groups
+
+
+def _group_captures_python(store, indices, url_key_ids, url_categories, keys, capture_categories=None):
+    url_ids = store.url_ids
+    timestamps = store.timestamps
+    grouped = {}
+    for index in (range(len(url_ids)) if indices is None else indices):
+        key_id = url_key_ids[url_ids[index]]
+        if key_id >= 0:
+            grouped.setdefault(key_id, []).append(index)
+    groups = []
+    for key_id, group in grouped.items():
+        group.sort(key=timestamps.__getitem__)
+        if capture_categories is not None:
+            category = array('b', (capture_categories[index] for index in group))
+        else:
+            category = array('b', (url_categories[url_ids[index]] for index in group))
+        groups.append((keys[key_id], array('i', group), category[0] if min(category) == max(category) else category))
+    return groups
+
+
+class CaptureTimeline:
+    """Bir snapshot deposunun timestamp sütunu üzerinde vektörel sorgular"""
+
+    def __init__(self, timestamps):
+        if np is not None:
+            self.values = np.array(timestamps, dtype=np.int64)
+        else:
+            self.values = array('q', timestamps)
+        self._histogram = None
+        self._order = None
+        self._sorted_values = None
+
+    def sorted_view(self):
+        """(sıralama, sıralı timestamp'ler) çiftini döndürür; ilk aralık sorgusunda bir kez hesaplanır"""
+        if self._order is None:
+            if np is not None:
+                self._order = np.argsort(self.values, kind='stable')
+                self._sorted_values = self.values[self._order]
+            else:
+                values = self.values
+                self._order = array('i', sorted(range(len(values)), key=values.__getitem__))
+                self._sorted_values = array('q', (values[index] for index in self._order))
+        return self._order, self._sorted_values
+
+    def __len__(self):
+        return len(self.values)
+
+    def min(self):
+        if not len(self.values):
+            return None
+        return int(self.values.min()) if np is not None else min(self.values)
+
+    def max(self):
+        if not len(self.values):
+            return None
+        return int(self.values.max()) if np is not None else max(self.values)
+
+    def range_mask(self, first, last):
+        """first <= timestamp <= last olan capture'lar için bool maske"""
+        if np is not None:
+            return (self.values >= first) & (self.values <= last)
+        return [first <= value <= last for value in self.values]
+
+    def indices_in_range(self, first, last):
+        """Aralıktaki capture'ların depo sıralarını (depo sırasıyla) liste olarak döndürür.
+
+        Sıralı timestamp'ler üzerinde ikili arama yapılır; aralık değiştikçe
+        tüm dizi yeniden taranmaz.
+        """
+        order, sorted_values = self.sorted_view()
+        if np is not None:
+            start = np.searchsorted(sorted_values, first, side='left')
+            end = np.searchsorted(sorted_values, last, side='right')
+            return np.sort(order[start:end]).tolist()
+        start = bisect_left(sorted_values, first)
+        end = bisect_right(sorted_values, last)
+        return sorted(order[start:end])
+
+    def month_histogram(self):
+        """{'YYYY-MM': capture sayısı} sözlüğünü aylara göre sıralı döndürür"""
+        if self._histogram is None:
+            if np is not None:
+                months, counts = np.unique(self.values // MONTH_DIVISOR, return_counts=True)
+                pairs = zip(months.tolist(), counts.tolist())
+            else:
+                counter = {}
+                for value in self.values:
+                    month = value // MONTH_DIVISOR
+                    counter[month] = counter.get(month, 0) + 1
+                pairs = sorted(counter.items())
+            self._histogram = {format_month(month): count for month, count in pairs}
+        return self._histogram
+
+    def months(self):
+        """Capture bulunan ayları ('YYYY-MM') sıralı döndürür"""
+        return list(self.month_histogram())
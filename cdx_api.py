@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+CDX API yardımcıları
+Archive.org CDX sunucusundan sayfa sayfa (resumeKey) ve akış halinde
+(satır satır) snapshot çekimi, yarıda kalan indirmelere kaldığı yerden devam edilmesi
+"""
+
+import os
+import re
+import json
+import queue
+import hashlib
+import threading
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+import archive_http
+
+CDX_URL = "https://web.archive.org/cdx/search/cdx"
+CDX_PAGE_SIZE = 50000  # Tek istekte istenecek satır sayısı
+# Keşifte her capture için istenen alanlar; satırlar her yerde (yerel indeks, devam dosyası,
+# oturum) bu sırayla taşınır. Bilinmeyen değerler CDX'teki gibi '-' olur.
+CDX_ROW_FIELDS = ('timestamp', 'original', 'statuscode', 'mimetype', 'length', 'digest')
+CDX_FIELDS = ','.join(CDX_ROW_FIELDS)
+HOST_ENUMERATION_LIMIT = 200000  # Alt alan adı listesi çıkarılırken okunacak en fazla tekil URL
+HOST_FETCH_WORKERS = 4  # Alt alan adı modunda aynı anda çekilen host sayısı
+HOST_QUEUE_ROWS = 20000  # Sırası gelmemiş her host için bellekte bekletilen en fazla satır
+APP_DATA_DIR = os.path.join(os.path.expanduser('~'), '.archive_radar')
+
+
+# Sunucu tarafında elenecek URL desenleri (ArchiveDiscovery.is_junk_url + is_extra_junk ile aynı)
+SERVER_JUNK_PATTERNS = [
+    r'wp-login\.php', r'wp-admin', r'/feed/', r'/sitemap\.xml', r'/robots\.txt', r'\?replytocom',
+    r'wp-json', r'wp-includes', r'wp-content', r'contact-form-7', r'oembed',
+    r'\.(?:js|css|json|xml|jpg|jpeg|png|gif|svg|ico|woff|ttf|pdf|zip|gz|tar|rar|mp4|mp3|webp|avi|mov|wmv|flv|mkv|apk|exe|bin|dmg|msi)$'
+]
+COLLAPSE_MODES = ('urlkey', 'digest')
+
+
+def build_cdx_query(domain, start_date=None, end_date=None, exclude_junk=False,
+                    status_200=False, html_only=False, collapse=None, fields=CDX_FIELDS,
+                    subdomains=False):
+    """Aktif keşif ayarlarını sunucu tarafı CDX parametrelerine çevirir.
+
+    Birden fazla 'filter' parametresi gönderilebilmesi için (anahtar, değer) listesi döndürür.
+    subdomains=True ise sorgu domain ve tüm alt alan adlarını kapsar (matchType=domain).
+    """
+    if subdomains:
+        params = [
+            ('url', domain),
+            ('matchType', 'domain'),
+            ('fl', fields)
+        ]
+    else:
+        params = [
+            ('url', domain + '/*'),
+            ('fl', fields)
+        ]
+    # Tarih aralığı (ay bazında, istemci tarafı filtre daha hassas olanı uygular)
+    if start_date:
+        params.append(('from', start_date.strftime('%Y%m')))
+    if end_date:
+        params.append(('to', end_date.strftime('%Y%m')))
+    if status_200:
+        params.append(('filter', 'statuscode:200'))
+    if html_only:
+        params.append(('filter', 'mimetype:text/html'))
+    if exclude_junk:
+        params.append(('filter', '!original:(?i).*(?:' + '|'.join(SERVER_JUNK_PATTERNS) + ').*'))
+    if collapse in COLLAPSE_MODES:
+        params.append(('collapse', collapse))
+    return params
+
+
+def query_value(params, name):
+    """(anahtar, değer) listesinden ilk eşleşen değeri döndürür"""
+    for key, value in params:
+        if key == name:
+            return value
+    return None
+
+
+def url_host(url):
+    """URL'nin host'unu küçük harfle, port ve baştaki 'www.' olmadan döndürür"""
+    host = urlparse(url if '://' in url else f'http://{url}').hostname or ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def host_query(params, host):
+    """Alt alan adı sorgusunu tek bir host'un 'host/*' sorgusuna çevirir (diğer parametreler aynı kalır)"""
+    query = [(k, v) for k, v in as_param_list(params) if k not in ('url', 'matchType')]
+    return [('url', host + '/*')] + query
+
+
+def as_param_list(params):
+    """dict veya (anahtar, değer) listesi olarak verilen parametreleri listeye çevirir"""
+    if isinstance(params, dict):
+        return list(params.items())
+    return list(params)
+
+
+def app_data_path(*parts):
+    """Uygulama veri klasörü altında bir dosya yolu döndürür (klasörü oluşturur)"""
+    path = os.path.join(APP_DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+class CdxRequestError(Exception):
+    """CDX sunucusu 200 dışında bir yanıt döndürdüğünde fırlatılır"""
+
+
+class CdxTextReader:
+    """CDX text çıktısını satır satır okur; sayfa sonundaki resume key'i ayırır"""
+
+    def __init__(self, response, field_count, original_position=None):
+        self.response = response
+        self.field_count = field_count
+        # Orijinal URL son alan değilse içindeki boşluklar alan sayısını bozmasın diye birleştirilir
+        self.original_position = original_position
+        self.resume_key = None
+
+    def __iter__(self):
+        blank_seen = False
+        for line in self.response.iter_lines(decode_unicode=True):
+            if not line:
+                # Boş satırdan sonra gelen satır resume key'dir
+                blank_seen = True
+                continue
+            if blank_seen:
+                self.resume_key = line.strip()
+                continue
+            # Alanlar boşlukla ayrılır
+            if self.original_position is None or self.original_position == self.field_count - 1:
+                row = line.split(' ', self.field_count - 1)
+            else:
+                row = line.split(' ')
+                extra = len(row) - self.field_count
+                if extra > 0:
+                    position = self.original_position
+                    row[position:position + extra + 1] = [' '.join(row[position:position + extra + 1])]
+            if len(row) == self.field_count:
+                yield row
+
+
+class CdxResumeState:
+    """Sayfalı CDX çekiminin devam imlecini ve o ana kadar alınan satırları diskte tutar"""
+
+    def __init__(self, params):
+        # Aynı sorgu (domain + parametreler) her zaman aynı dosyalara yazılır
+        key_source = json.dumps(sorted((str(k), str(v)) for k, v in params))
+        key = hashlib.sha1(key_source.encode('utf-8')).hexdigest()[:16]
+        self.cursor_path = app_data_path('cdx_resume', f"{key}.json")
+        self.rows_path = app_data_path('cdx_resume', f"{key}.rows")
+        self.rows_file = None
+
+    def load(self):
+        """Kayıtlı (resume_key, satır_sayısı, sayfa_sayısı) döndürür, yoksa (None, 0, 0)"""
+        try:
+            with open(self.cursor_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None, 0, 0
+        # Son tamamlanan sayfadan sonra yazılmış (yarım kalmış) satırları at
+        try:
+            with open(self.rows_path, 'r+b') as f:
+                f.truncate(state.get('offset', 0))
+        except OSError:
+            return None, 0, 0
+        return state.get('resume_key'), state.get('rows', 0), state.get('pages', 0)
+
+    def iter_saved_rows(self):
+        """Önceki çalışmada tamamlanan sayfaların satırlarını döndürür"""
+        try:
+            with open(self.rows_path, 'rb') as f:
+                for line in f:
+                    yield line.decode('utf-8').rstrip('\n').split('\t')
+        except OSError:
+            return
+
+    def write_row(self, row):
+        """Okunan satırı sayfa tamamlanmadan önce diske yazar"""
+        if self.rows_file is None:
+            self.rows_file = open(self.rows_path, 'ab')
+        self.rows_file.write(('\t'.join(row) + '\n').encode('utf-8'))
+
+    def commit_page(self, resume_key, total_rows, pages):
+        """Tamamlanan sayfayı ve yeni imleci kaydeder"""
+        offset = 0
+        if self.rows_file is not None:
+            self.rows_file.flush()
+            offset = self.rows_file.tell()
+        elif os.path.exists(self.rows_path):
+            offset = os.path.getsize(self.rows_path)
+        tmp_path = self.cursor_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'resume_key': resume_key, 'rows': total_rows, 'pages': pages, 'offset': offset}, f)
+        os.replace(tmp_path, self.cursor_path)
+
+    def close(self):
+        if self.rows_file is not None:
+            self.rows_file.close()
+            self.rows_file = None
+
+    def clear(self):
+        """İndirme tamamlandığında devam dosyalarını siler"""
+        self.close()
+        for path in (self.cursor_path, self.rows_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class CdxClient:
+    """CDX sorgularını akış halinde (ve istenirse sayfa sayfa) çeken istemci"""
+
+    def __init__(self, timeout=60, retry_count=3, progress=None, stop_check=None):
+        self.timeout = timeout
+        self.retry_count = max(1, retry_count)
+        self.progress = progress or (lambda message: None)
+        self.stop_check = stop_check or (lambda: False)
+        self.last_resume_key = None
+
+    def open_stream(self, params):
+        """CDX isteğini stream modunda açar; 200 dışı yanıtlarda CdxRequestError fırlatır.
+
+        Hız sınırı archive_http'deki ortak AIMD denetleyicisiyle uygulanır.
+        """
+        response = archive_http.get(CDX_URL, params=params, timeout=self.timeout, stream=True,
+                                    stop_check=self.stop_check)
+        if response.status_code in archive_http.THROTTLE_STATUSES:  # Rate limit
+            response.close()
+            # Ortak hız denetleyicisi hızı düşürdü; tekrar deneme Retry-After dolunca yapılır
+            self.progress(f"Rate limit! {archive_http.RATE_CONTROLLER.pause_remaining():.0f} saniye bekleniyor...")
+            raise CdxRequestError(f"HTTP {response.status_code}")
+        if response.status_code != 200:
+            response.close()
+            self.progress(f"HTTP Hatası: {response.status_code}")
+            raise CdxRequestError(f"HTTP {response.status_code}")
+        if not response.encoding:
+            response.encoding = 'utf-8'
+        return response
+
+    def iter_rows(self, params):
+        """Tek bir CDX isteğinin satırlarını okundukça döndürür.
+
+        Bağlantı yarıda koparsa istek tekrarlanır ve daha önce verilen satırlar atlanır.
+        Bittiğinde sayfa sonundaki resume key self.last_resume_key içindedir.
+        """
+        params = [(k, v) for k, v in as_param_list(params) if k != 'output']  # Varsayılan çıktı satır bazlı text
+        fields = query_value(params, 'fl').split(',')
+        original_position = fields.index('original') if 'original' in fields else None
+        yielded = 0
+        last_error = None
+        self.last_resume_key = None
+        for attempt in range(self.retry_count):
+            if self.stop_check():
+                raise Exception("Keşif durduruldu")
+            try:
+                response = self.open_stream(params)
+                reader = CdxTextReader(response, len(fields), original_position)
+                with closing(response):
+                    for index, row in enumerate(reader):
+                        if index % 1000 == 0 and self.stop_check():
+                            raise Exception("Keşif durduruldu")
+                        if index < yielded:
+                            continue  # Önceki denemede zaten verildi
+                        yielded += 1
+                        yield row
+                self.last_resume_key = reader.resume_key
+                return
+            except CdxRequestError as e:
+                last_error = str(e)
+            except requests.exceptions.Timeout:
+                last_error = f"timeout: {self.timeout}s"
+                self.progress(f"Timeout! Deneme {attempt + 1}/{self.retry_count} başarısız")
+            except requests.exceptions.ConnectionError:
+                last_error = "bağlantı hatası"
+                self.progress(f"Bağlantı hatası! Deneme {attempt + 1}/{self.retry_count}")
+            except requests.exceptions.RequestException as e:
+                last_error = str(e)
+                self.progress(f"Akış hatası! Deneme {attempt + 1}/{self.retry_count}")
+        raise Exception(f"CDX isteği tamamlanamadı ({last_error})")
+
+    def iter_rows_paged(self, params, page_size=CDX_PAGE_SIZE):
+        """CDX sonuçlarını sayfa sayfa, akış halinde döndürür; imleci diskte saklayıp kaldığı yerden devam eder"""
+        params = as_param_list(params)
+        state = CdxResumeState(params)
+        resume_key, saved_rows, pages = state.load()
+        if pages:
+            self.progress(f"Önceki indirmeye devam ediliyor: {pages} sayfa, {saved_rows} satır hazır")
+            yield from state.iter_saved_rows()
+        else:
+            # Temiz başlangıç, eski yarım dosya varsa sil
+            state.clear()
+        total_rows = saved_rows
+        try:
+            while pages == 0 or resume_key:
+                page_params = params + [
+                    ('limit', page_size),
+                    ('showResumeKey', 'true')
+                ]
+                if resume_key:
+                    page_params.append(('resumeKey', resume_key))
+                self.progress(f"CDX sayfası {pages + 1} alınıyor... ({total_rows} satır hazır)")
+                for row in self.iter_rows(page_params):
+                    state.write_row(row)
+                    total_rows += 1
+                    yield row
+                resume_key = self.last_resume_key
+                pages += 1
+                state.commit_page(resume_key, total_rows, pages)
+        finally:
+            state.close()
+        state.clear()
+        self.progress(f"CDX indirmesi tamamlandı: {pages} sayfa, {total_rows} satır")
+
+    def list_hosts(self, params, domain):
+        """matchType=domain sorgusuyla domain altındaki host'ları bulur; ana domain her zaman ilk sıradadır.
+
+        Ana domainin URL'leri sunucuda elenir ve her URL bir kez gelir (collapse=urlkey);
+        yine de en fazla HOST_ENUMERATION_LIMIT satır okunur. (host listesi, liste tam mı)
+        döner; sınıra ulaşıldıysa bazı host'lar eksik olabilir.
+        """
+        query = [(k, v) for k, v in as_param_list(params) if k not in ('fl', 'collapse', 'limit')]
+        query += [
+            ('fl', 'original'),
+            ('collapse', 'urlkey'),
+            ('filter', '!original:(?i)^https?://(?:www\\.)?' + re.escape(domain) + '(?::\\d+)?(?:/.*)?$'),
+            ('limit', HOST_ENUMERATION_LIMIT)
+        ]
+        hosts = set()
+        count = 0
+        for row in self.iter_rows(query):
+            count += 1
+            host = url_host(row[0])
+            if host != domain and host.endswith('.' + domain):
+                hosts.add(host)
+        return [domain] + sorted(hosts), count < HOST_ENUMERATION_LIMIT
+
+    def iter_rows_by_host(self, params, hosts, workers=HOST_FETCH_WORKERS):
+        """Her host'u ayrı (sayfalı, devam ettirilebilir) sorgu olarak eşzamanlı çeker.
+
+        Satırlar host sırasıyla döndürülür: sıradaki host okundukça akar, sonraki
+        host'ların satırları o sırada arka planda birikir. Bellek sabit kalsın diye her host
+        en fazla HOST_QUEUE_ROWS satır biriktirir, kuyruğu dolan işçi sırası gelene kadar
+        bekler (kopan akış iter_rows'ta kaldığı satırdan tekrarlanır). Tüm istekler ortak
+        hız sınırlayıcıdan geçer.
+        """
+        abandoned = threading.Event()
+        done = object()
+
+        def put(rows, item):
+            # Tüketici vazgeçtiyse (hata/durdurma) bekleyen işçi kuyruğu bırakıp çıkar
+            while not abandoned.is_set():
+                try:
+                    rows.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch(host, rows):
+            client = CdxClient(self.timeout, self.retry_count, self.progress,
+                               lambda: abandoned.is_set() or self.stop_check())
+            try:
+                for row in client.iter_rows_paged(host_query(params, host)):
+                    if not put(rows, row):
+                        return
+                put(rows, done)
+            except Exception as e:
+                put(rows, e)
+
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        try:
+            host_rows = [queue.Queue(maxsize=HOST_QUEUE_ROWS) for _ in hosts]
+            for host, rows in zip(hosts, host_rows):
+                pool.submit(fetch, host, rows)
+            total_rows = 0
+            for position, (host, rows) in enumerate(zip(hosts, host_rows), 1):
+                count = 0
+                while True:
+                    row = rows.get()
+                    if row is done:
+                        break
+                    if isinstance(row, Exception):
+                        raise Exception(f"{host}: {row}")
+                    count += 1
+                    yield row
+                total_rows += count
+                self.progress(f"{host}: {count} snapshot alındı ({position}/{len(hosts)} host, toplam {total_rows})")
+        finally:
+            abandoned.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_page_count(self, params):
+        """showNumPages ile sorgunun kaç CDX sayfasından oluştuğunu döndürür"""
+        params = as_param_list(params) + [('showNumPages', 'true')]
+        last_error = None
+        for attempt in range(self.retry_count):
+            try:
+                with closing(self.open_stream(params)) as response:
+                    return int(response.text.strip() or 0)
+            except CdxRequestError as e:
+                last_error = str(e)
+            except ValueError:
+                last_error = "geçersiz sayfa sayısı yanıtı"
+            except requests.exceptions.RequestException as e:
+                last_error = str(e)
+                self.progress(f"Sayfa sayısı alınamadı! Deneme {attempt + 1}/{self.retry_count}")
+        raise Exception(f"CDX sayfa sayısı alınamadı ({last_error})")
+
+    def fetch_page_rows(self, params, page):
+        """Tek bir CDX sayfasının (page=N) tüm satırlarını döndürür"""
+        return list(self.iter_rows(params + [('page', page)]))
+
+    def iter_rows_parallel(self, params, workers=4):
+        """Sorguyu CDX sayfalarına bölüp eşzamanlı çeker, satırları sayfa sırasıyla döndürür.
+
+        Sıra korunduğu için sonuç sıralı çekimle birebir aynıdır; bellekte en fazla
+        workers * 2 sayfa bekler.
+        """
+        params = as_param_list(params)
+        page_count = self.get_page_count(params)
+        self.progress(f"CDX {page_count} sayfa, {workers} paralel istekle çekilecek")
+        if page_count <= 0:
+            return
+        window = max(1, workers) * 2
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        futures = {}
+        try:
+            next_page = 0
+            total_rows = 0
+            for page in range(page_count):
+                # Sıradaki sayfaları pencere dolana kadar kuyruğa ekle
+                while next_page < page_count and next_page < page + window:
+                    futures[next_page] = pool.submit(self.fetch_page_rows, params, next_page)
+                    next_page += 1
+                rows = futures.pop(page).result()
+                total_rows += len(rows)
+                self.progress(f"CDX sayfası {page + 1}/{page_count} alındı ({total_rows} satır)")
+                yield from rows
+        finally:
+            for future in futures.values():
+                future.cancel()
+            pool.shutdown(wait=False)
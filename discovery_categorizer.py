@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Keşif kategorizasyonu
+Bir keşif oturumundaki (DiscoverySession) sütun bazlı snapshot deposunu URL anahtarına
+göre gruplayıp kategorilere ayırır. İçerik keşfi, domain analizi ve toplu keşif aynı
+sınıfı kullanır; QThread değildir, her thread kendi örneğini oluşturup çağırır.
+"""
+
+import time
+from array import array
+from datetime import datetime
+
+from capture_timeline import month_bounds, group_captures, capture_categories
+from parallel_categorizer import classify_urls_parallel, PARALLEL_MIN_URLS
+from snapshot_store import RecordList
+from url_canonical import canonicalize
+from url_classifier import URL_JUNK, CATEGORY_NAMES, mimetype_category
+
+PARTIAL_CHECK_ROWS = 1000  # İndirme sırasında ara sonuç için her bu kadar satırda bir kontrol edilir
+PARTIAL_RESULTS_INTERVAL = 2.0  # Ara sonuçlar arasında en az bu kadar saniye beklenir
+
+
+class DiscoveryCategorizer:
+    """Oturumdaki snapshot'ları (indirme sürerken de) kategorize eden yardımcı.
+
+    URL sınıflandırması aynı depo için saklanır; tarih aralığı değişince yeniden
+    hesaplanmaz, depo büyüdükçe sadece yeni URL'ler işlenir.
+    """
+
+    def __init__(self, timeout_settings=None, progress=None):
+        self.timeout_settings = timeout_settings or {}
+        self.progress = progress or (lambda message: None)
+        self._url_classes = None  # (depo, URL sayısı, classify_store_urls sonucu, anahtar sözlüğü)
+        self._capture_classes = None  # (depo, capture sayısı, mimetype ile düzeltilmiş capture kategorileri)
+        self.load_started = None
+        self.time_to_first_url = None  # Yükleme başlangıcından ilk URL'lerin listelenmesine kadar geçen süre (sn)
+        self.total_snapshots = 0
+        self.used_snapshots = 0
+
+    def load(self, session, start_date=None, end_date=None, stop_check=None, progressive=True, on_partial=None):
+        """Snapshot'ları oturuma yükler; oturum zaten yüklüyse CDX'e tekrar gidilmez.
+
+        progressive=True iken indirme sürerken o ana kadar gelen snapshot'lar aralıklarla
+        kategorize edilip on_partial((kategoriler, toplam, kullanılan, ilk URL süresi)) ile
+        verilir; ilk URL'ler tüm indirmenin bitmesini beklemez.
+        """
+        session.progress = self.progress
+        if stop_check is not None:
+            session.stop_check = stop_check
+        self.load_started = time.perf_counter()
+        if session.loaded or not session.keep_snapshots or not progressive:
+            session.load()
+            return session
+        # Satırlar indirilirken doğrudan sütun bazlı depoya akar, tüm yanıt bellekte tutulmaz
+        interval = PARTIAL_RESULTS_INTERVAL
+        last_emit = self.load_started
+        count = 0
+        for _ in session.iter_load():
+            count += 1
+            if count % PARTIAL_CHECK_ROWS:
+                continue
+            now = time.perf_counter()
+            if self.time_to_first_url is not None and now - last_emit < interval:
+                continue
+            self.emit_partial_results(session, start_date, end_date, on_partial)
+            last_emit = time.perf_counter()
+            # Kategorize süresi depo büyüdükçe artar; indirme süresinin çoğunu ona ayırma
+            interval = max(PARTIAL_RESULTS_INTERVAL, 3 * (last_emit - now))
+        return session
+
+    def emit_partial_results(self, session, start_date=None, end_date=None, on_partial=None):
+        """O ana kadar indirilen snapshot'ları kategorize edip on_partial'a verir"""
+        categories = self.build_categories(session, start_date, end_date, report_progress=False)
+        if not any(categories.values()):
+            return
+        if self.time_to_first_url is None:
+            self.time_to_first_url = time.perf_counter() - self.load_started
+            self.progress(f"İlk URL'ler {self.time_to_first_url:.2f} sn'de listelendi, indirme sürüyor...")
+        if on_partial is not None:
+            on_partial((categories, self.total_snapshots, self.used_snapshots, self.time_to_first_url))
+
+    def build_categories(self, session, start_date=None, end_date=None, report_progress=True):
+        """Oturumdaki depoyu tarih aralığına göre dilimleyip kategorize eder"""
+        store = session.snapshots
+        self.total_snapshots = len(store)
+        # Tarih filtresi sıralı timestamp'ler üzerinde ikili arama ile uygulanır
+        indices = select_used_snapshots(session.timeline, start_date, end_date)
+        self.used_snapshots = self.total_snapshots if indices is None else len(indices)
+        return self.categorize_and_group_urls(store, indices, report_progress=report_progress)
+
+    def categorize_and_group_urls(self, snapshots, indices=None, report_progress=True):
+        """URL'leri kategorilere ayırır ve aynı URL'nin tüm snapshot'larını gruplayarak döner (O(n) optimizasyonlu)
+
+        indices verilirse sadece depodaki o sıralardaki capture'lar kullanılır. Anahtarlar host
+        önekiyle başlar (smart_url_key), alt alan adı modunda farklı host'lar aynı grupta toplanmaz.
+        report_progress=False ile (bellekte yeniden filtrelerken) ilerleme mesajı ve bekleme yapılmaz.
+        """
+        categories = {
+            'blog_posts': {},  # url: [snapshot, snapshot, ...]
+            'pages': {},
+            'images': {},
+            'documents': {},
+            'other': {}
+        }
+        groups = self.group_snapshots(snapshots, indices)
+        total = sum(len(group) for _, group, _ in groups)
+        processed = 0
+        # Her grup için kategorize et
+        for key, group, category in groups:
+            # Her anahtarın tek, sıralı bir zaman çizelgesi var; kayıtlar onu paylaşır (bellek ve süre doğrusal)
+            timeline = snapshots.timeline(group, presorted=True)
+            # Kayıt görünümleri (url_info) listeden okundukça üretilir
+            if isinstance(category, int):
+                # Gruptaki tüm capture'lar aynı kategoride (en sık durum)
+                categories[CATEGORY_NAMES[category]][key] = RecordList(timeline, key)
+            else:
+                split = {}
+                for index, capture_category in zip(group, category):
+                    split.setdefault(capture_category, array('i')).append(index)
+                for split_category, category_indices in split.items():
+                    categories[CATEGORY_NAMES[split_category]][key] = RecordList(timeline, key, category_indices)
+            previous = processed
+            processed += len(group)
+            if report_progress and (processed // 1000 != previous // 1000 or processed == total):
+                msg = f"Kategorize ediliyor... {processed}/{total}"
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
+                self.progress(msg)
+                time.sleep(0.001)
+        # Blog postları en güncel snapshot'a göre sırala (kayıtlar zaman çizelgesi sırasıyla eklendi)
+        for snaps in categories['blog_posts'].values():
+            snaps.reverse()
+        if report_progress:
+            print('KATEGORİ DAĞILIMI:')
+            for k, v in categories.items():
+                print(f"  {k}: {len(v)}")
+        return categories
+
+    def group_snapshots(self, snapshots, indices=None):
+        """Capture'ları smart_url_key ile gruplar; her grup zamana göre sıralı gelir (NumPy varsa vektörel)"""
+        keys, url_key_ids, url_categories, url_page_categories = self.classify_store_urls(snapshots)
+        categories = self.classify_store_captures(snapshots, url_categories, url_page_categories)
+        return group_captures(snapshots, indices, url_key_ids, url_categories, keys, categories)
+
+    def classify_store_captures(self, snapshots, url_categories, url_page_categories):
+        """CDX mimetype'ı olan depolarda capture başına (mimetype ile düzeltilmiş) kategorileri döndürür.
+
+        Mimetype bilgisi yoksa (eski indeks) None döner ve URL kategorisi kullanılır.
+        """
+        if not snapshots.mimetypes:
+            return None
+        cached = self._capture_classes
+        if cached is not None and cached[0] is snapshots and cached[1] == len(snapshots):
+            return cached[2]
+        mimetype_categories = [-1 if category is None else category
+                               for category in map(mimetype_category, snapshots.mimetypes)]
+        categories = capture_categories(snapshots, url_categories, url_page_categories, mimetype_categories)
+        self._capture_classes = (snapshots, len(snapshots), categories)
+        return categories
+
+    def classify_store_urls(self, snapshots):
+        """Depodaki tekil URL'leri bir kez kanonikleştirir: (keys, url_key_ids, url_categories, url_page_categories).
+
+        Sonuç aynı depo için saklanır; tarih aralığı değişince yeniden hesaplanmaz,
+        indirme sürerken depo büyüdükçe sadece yeni URL'ler işlenir.
+        Çok sayıda yeni URL varsa sınıflandırma süreç havuzuna dağıtılır.
+        """
+        urls = snapshots.urls
+        cached = self._url_classes
+        if cached is not None and cached[0] is snapshots:
+            classified, result, key_lookup = cached[1], cached[2], cached[3]
+            if classified == len(urls):
+                return result
+        else:
+            classified, result, key_lookup = 0, ([], array('i'), array('b'), array('b')), {}
+        keys, url_key_ids, url_categories, url_page_categories = result
+        new_urls = urls[classified:]
+        workers = self.timeout_settings.get('categorize_workers', 1)
+        if workers > 1 and len(new_urls) >= PARALLEL_MIN_URLS:
+            self.progress(f"{len(new_urls)} tekil URL {workers} işlemcide kategorize ediliyor...")
+            chunk_keys, chunk_key_ids, chunk_categories, chunk_page_categories = classify_urls_parallel(new_urls, workers)
+            # Parçanın anahtar sıralarını mevcut anahtar listesine çevir
+            remap = []
+            for key in chunk_keys:
+                key_id = key_lookup.get(key)
+                if key_id is None:
+                    key_id = key_lookup[key] = len(keys)
+                    keys.append(key)
+                remap.append(key_id)
+            url_key_ids.extend(remap[key_id] if key_id >= 0 else -1 for key_id in chunk_key_ids)
+            url_categories.extend(chunk_categories)
+            url_page_categories.extend(chunk_page_categories)
+        else:
+            # Tekil URL başına bir kez kanonikleştir; tekrarlanan capture'lar dizi erişimiyle sonuç alır
+            for url in new_urls:
+                canonical = canonicalize(url)
+                if canonical.category == URL_JUNK:
+                    url_key_ids.append(-1)
+                else:
+                    key_id = key_lookup.get(canonical.key)
+                    if key_id is None:
+                        key_id = key_lookup[canonical.key] = len(keys)
+                        keys.append(canonical.key)
+                    url_key_ids.append(key_id)
+                url_categories.append(max(canonical.category, 0))
+                url_page_categories.append(max(canonical.page_category, 0))
+        self._url_classes = (snapshots, len(urls), result, key_lookup)
+        return result
+
+
+def select_used_snapshots(timeline, start_date=None, end_date=None):
+    """Tarih aralığındaki capture sıralarını döndürür (aralık seçilmediyse None = hepsi)"""
+    if not (start_date and end_date):
+        return None
+    first, last = month_bounds(start_date, end_date)
+    return timeline.indices_in_range(first, last)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Keşif oturumu
+Bir domain için CDX'ten tek seferde indirilen snapshot'ları domain analizi ve
+içerik keşfi arasında paylaştırır
+"""
+
+from cdx_api import CdxClient, build_cdx_query, query_value, HOST_FETCH_WORKERS, HOST_ENUMERATION_LIMIT
+from snapshot_index import SnapshotIndex, index_query_key, row_identity, INSERT_BATCH_SIZE
+from snapshot_store import SnapshotStore
+from capture_timeline import CaptureTimeline
+
+
+def uses_local_index(timeout_settings):
+    """Yerel indeks kullanılacak mı?
+
+    collapse açıkken indeks kullanılmaz: artımlı güncelleme 'from' ile sadece yeni satırları
+    ister, collapse ise bu dilimde her URL'nin ilk capture'ını tekrar verir; indeksteki URL'lere
+    ikinci bir "ilk capture" eklenir ve collapse anlamı bozulur.
+    """
+    return timeout_settings.get('use_local_index', True) and not timeout_settings.get('cdx_collapse')
+
+
+def build_session_query(domain, timeout_settings, start_date=None, end_date=None):
+    """Ayarlardan sunucu tarafı filtreli CDX sorgusunu oluşturur"""
+    server_filters = timeout_settings.get('server_filters', True)
+    # Yerel indeks tüm tarihleri tutar, tarih aralığı sadece yerelde uygulanır
+    with_dates = bool(server_filters and start_date and end_date
+                      and not uses_local_index(timeout_settings))
+    return build_cdx_query(
+        domain,
+        start_date=start_date if with_dates else None,
+        end_date=end_date if with_dates else None,
+        exclude_junk=server_filters,
+        status_200=timeout_settings.get('status_200_only', False),
+        html_only=timeout_settings.get('html_only', False),
+        collapse=timeout_settings.get('cdx_collapse'),
+        subdomains=timeout_settings.get('include_subdomains', False)
+    )
+
+
+class DiscoverySession:
+    """Bir domainin CDX snapshot'larını bir kez indirip analiz ve keşif adımlarına dağıtan oturum"""
+
+    def __init__(self, domain, timeout_settings=None, start_date=None, end_date=None, keep_snapshots=True):
+        self.domain = domain
+        self.timeout_settings = timeout_settings or {'api_timeout': 60, 'retry_count': 3}
+        self.params = build_session_query(domain, self.timeout_settings, start_date, end_date)
+        self.keep_snapshots = keep_snapshots
+        self.snapshots = SnapshotStore()
+        self._timeline = None
+        self.loaded = False
+        self.resumable = False
+        self.progress = lambda message: None
+        self.stop_check = lambda: False
+
+    def matches(self, domain, timeout_settings):
+        """Oturumdaki veri verilen domain ve ayarlarla yapılacak sorguyla aynı mı?"""
+        return self.domain == domain and self.params == build_session_query(domain, timeout_settings)
+
+    def covers_all_dates(self):
+        """Sorgu tarih aralığıyla sınırlanmadıysa (tüm arşiv indirildiyse) True"""
+        return query_value(self.params, 'from') is None and query_value(self.params, 'to') is None
+
+    def load(self):
+        """Tüm snapshot'ları indirip oturumda saklar"""
+        for _ in self.iter_load():
+            pass
+        return self.snapshots
+
+    def iter_load(self):
+        """Oturum yüklüyse saklanan CDX satırlarını, değilse CDX'ten okunanları döndürür"""
+        if self.loaded:
+            self.progress(f"Daha önce indirilen {len(self.snapshots)} snapshot kullanılıyor")
+            yield from self.snapshots.iter_rows()
+            return
+        self.snapshots = SnapshotStore()
+        self._timeline = None
+        for row in self.iter_snapshots():
+            if self.keep_snapshots:
+                self.snapshots.append(*row)
+            yield row
+        self.loaded = self.keep_snapshots
+
+    @property
+    def timeline(self):
+        """İndirilen snapshot'ların timestamp sütunu üzerinde vektörel sorgular (yüklemeden sonra bir kez oluşturulur)"""
+        if self._timeline is None or len(self._timeline) != len(self.snapshots):
+            self._timeline = CaptureTimeline(self.snapshots.timestamps)
+        return self._timeline
+
+    def available_months(self):
+        """İndirilen snapshot'lardan arşivlenmiş yıl-ayları (YYYY-MM) sıralı döndürür"""
+        return self.timeline.months()
+
+    def month_histogram(self):
+        """Ay başına capture sayıları ({'YYYY-MM': sayı})"""
+        return self.timeline.month_histogram()
+
+    def iter_snapshots(self):
+        """Snapshot'ları okundukça CDX satırı (CDX_ROW_FIELDS sırasıyla) olarak döndürür (yerel indeks, sayfalı, paralel veya tek istek)"""
+        client = CdxClient(
+            timeout=self.timeout_settings.get('api_timeout', 60),
+            retry_count=self.timeout_settings.get('retry_count', 3),
+            progress=self.progress,
+            stop_check=self.stop_check
+        )
+        if uses_local_index(self.timeout_settings):
+            rows = self.iter_indexed_rows(client, self.params)
+        else:
+            if self.timeout_settings.get('use_local_index', True):
+                self.progress("CDX collapse açık, yerel indeks kullanılmadan doğrudan çekiliyor")
+            rows = self.open_rows(client, self.params)
+        count = 0
+        try:
+            for row in rows:
+                count += 1
+                if count % 10000 == 0:  # Her 10000 satırda bir ilerleme
+                    self.progress(f"Snapshot'lar alınıyor... {count}")
+                # archive_url ve sözlükler depoda gerektiğinde üretilir
+                yield tuple(row)
+        except Exception as e:
+            if self.resumable:
+                raise Exception(f"{e} - {count} snapshot kaydedildi, tekrar denendiğinde kaldığı yerden devam edilecek")
+            raise
+        self.progress(f"Toplam {count} snapshot alındı!")
+
+    def open_rows(self, client, params):
+        """Ayarlara göre CDX satır kaynağını açar (alt alan adları, paralel, sayfalı veya tek istek)"""
+        workers = self.timeout_settings.get('cdx_workers', 1)
+        self.resumable = False
+        if query_value(params, 'matchType') == 'domain':
+            # Önce host'ları bul, sonra her host'u ayrı sorguyla eşzamanlı çek
+            self.progress("Alt alan adları listeleniyor...")
+            hosts, complete = client.list_hosts(params, self.domain)
+            self.resumable = True
+            if not complete:
+                # Liste eksik olabilir; host bazlı sorgular bazı alt alan adlarını kaçırırdı
+                self.progress(f"Alt alan adı listesi {HOST_ENUMERATION_LIMIT} URL sınırına ulaştı, "
+                              f"host'lar tek domain sorgusuyla sayfa sayfa çekilecek")
+                return client.iter_rows_paged(params)
+            self.progress(f"{len(hosts)} host bulundu: {', '.join(hosts[:5])}{' ...' if len(hosts) > 5 else ''}")
+            return client.iter_rows_by_host(params, hosts, workers=max(workers, HOST_FETCH_WORKERS))
+        if workers > 1 and not self.timeout_settings.get('cdx_collapse'):
+            # Sayfa sayısını öğrenip sayfaları eşzamanlı çek (collapse sayfa sınırlarını aşamadığı için sadece collapse kapalıyken)
+            self.progress(f"Archive.org API'sine bağlanılıyor (paralel mod, {workers} istek)...")
+            return client.iter_rows_parallel(params, workers=workers)
+        if self.timeout_settings.get('paged_discovery', True):
+            # resumeKey ile sayfa sayfa, limitsiz
+            self.progress("Archive.org API'sine bağlanılıyor (sayfalı mod)...")
+            self.resumable = True
+            return client.iter_rows_paged(params)
+        self.progress("Archive.org API'sine bağlanılıyor...")
+        return client.iter_rows(params + [('limit', 100000)])
+
+    def iter_indexed_rows(self, client, params):
+        """Yerel indeksteki snapshot'ları döndürür, ardından sadece daha yeni olanları CDX'ten çekip indekse ekler"""
+        index = SnapshotIndex()
+        key = index_query_key(params)
+        try:
+            state = index.get_state(key)
+            newest = None
+            known = set()
+            fetch_params = params
+            if state:
+                newest, cached_count = state
+                self.progress(f"Yerel indeksten {cached_count} snapshot yükleniyor...")
+                yield from index.iter_rows(key)
+                if newest:
+                    # 'from' dahil olduğu için sınırdaki kayıtlar tekrar gelir, onları (aynı kimlikle) atla
+                    known = index.rows_since(key, newest)
+                    fetch_params = params + [('from', newest)]
+                    self.progress(f"{newest} sonrasındaki yeni snapshot'lar isteniyor...")
+            else:
+                index.begin_full(key, self.domain)
+            newest_seen = newest
+            batch = []
+            added = 0
+            for row in self.open_rows(client, fetch_params):
+                if row_identity(row) in known:
+                    continue
+                batch.append(row)
+                added += 1
+                if newest_seen is None or row[0] > newest_seen:
+                    newest_seen = row[0]
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    index.add_rows(key, batch)
+                    batch = []
+                yield row
+            index.add_rows(key, batch)
+            total = index.finish(key, newest_seen)
+            self.progress(f"Yerel indeks güncellendi: {added} yeni, toplam {total} snapshot")
+        finally:
+            index.close()
@@ -7,6 +7,10 @@ from PySide6.QtWidgets import QApplication, QDialog, QVBoxLayout, QHBoxLayout, Q
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtCore import QUrl, Qt
 
+import html_cache
+
+WEB_VIEW_HTML_LIMIT = 2 * 1024 * 1024  # QWebEngineView.setHtml daha büyük içeriği yükleyemez
+
 def debug_log(msg):
     print(f"[DEBUG] {msg}")
 
@@ -229,8 +233,14 @@ class SelectorDialog(QDialog):
         self.selection_mode_active = False
     
     def load_page(self):
-        """Sayfayı yükler"""
+        """Sayfayı yükler (daha önce indirilen capture HTML önbelleğinden verilir)"""
         debug_log(f"URL yükleniyor: {self.url}")
+        page, cached_url = html_cache.lookup_capture(self.url)
+        if page is not None and len(page.body) < WEB_VIEW_HTML_LIMIT:
+            # Göreli bağlantılar ve görseller archive.org'dan yüklenmeye devam etsin diye taban URL capture adresi
+            debug_log(f"Sayfa önbellekten yüklendi ({len(page.body)} bayt): {cached_url}")
+            self.web_view.setHtml(page.body.decode(page.encoding or 'utf-8', errors='replace'), QUrl(cached_url))
+            return
         self.web_view.setUrl(QUrl(self.url))
     
     def load_existing_selectors(self):
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+İçerik çekme günlüğü
+ContentExtractor'ın her URL için durumunu (bekliyor/çekiliyor/tamam/başarısız) ve
+çekilen içeriği SQLite'a yazar. Uygulama çökse veya bilgisayar uykuya geçse bile aynı
+seçimle yeniden başlatılan çekim sadece bitmemiş URL'leri çeker, tamamlananlar
+günlükten anında yüklenir. Çekim sonucunu etkileyen ayarlar (selector'lar, ham capture,
+denenecek capture'lar ...) değiştiyse işin kayıtları geçersiz sayılıp baştan çekilir
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from cdx_api import app_data_path
+
+PENDING = 'pending'
+FETCHING = 'fetching'  # Çekim sırasında kesilen URL'ler bu durumda kalır, devamda yeniden çekilir
+DONE = 'done'
+FAILED = 'failed'
+MAX_JOBS = 20  # Günlükte tutulan en fazla iş; eskiler (en son güncellenen hariç) silinir
+PAYLOAD_EXCLUDE = ('soup',)  # Günlüğe yazılmayan alanlar (soup devamda önbellekteki sayfadan yeniden oluşturulur)
+
+_journal = None
+_lock = threading.Lock()
+
+
+def job_key(urls):
+    """Seçilen URL kümesinden iş anahtarı üretir (sıra farkı aynı iş sayılır)"""
+    return hashlib.sha1(json.dumps(sorted(set(urls))).encode('utf-8')).hexdigest()
+
+
+def settings_key(settings, url_infos):
+    """Çekim sonucunu etkileyen ayarlardan ve URL başına denenecek capture'lardan
+    (tarih aralığı, durum filtreleri) parmak izi üretir"""
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+    for url_info in url_infos:
+        timeline = url_info.get('all_snapshots') or [url_info.get('timestamp', '')]
+        digest.update(f"{url_info['url']}\n{','.join(timeline)}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def encode_payload(content):
+    return json.dumps({k: v for k, v in content.items() if k not in PAYLOAD_EXCLUDE},
+                      ensure_ascii=False, default=str)
+
+
+class ExtractionJournal:
+    """İş bazlı, URL başına durum ve içerik tutan çekme günlüğü; iş parçacıkları arasında paylaşılır"""
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path('extraction_journal.sqlite3')
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job TEXT PRIMARY KEY,
+                total INTEGER NOT NULL,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                settings TEXT
+            )
+        """)
+        self.migrate()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                job TEXT NOT NULL,
+                url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                payload TEXT,
+                updated REAL NOT NULL,
+                PRIMARY KEY (job, url)
+            )
+        """)
+        self.conn.commit()
+
+    def migrate(self):
+        """Ayar parmak izi olmayan eski günlüğe sütunu ekler (eski işler geçersiz sayılır)"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if 'settings' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN settings TEXT")
+
+    def open_job(self, urls, settings=None, resume=True):
+        """Seçim için işi açar (yoksa oluşturur) ve ExtractionJob döndürür.
+
+        settings çekimi etkileyen ayarların parmak izidir (settings_key); önceki çalışmanınkinden
+        farklıysa eski kayıtlar silinir ve job.invalidated True olur. resume=False ise aynı
+        seçimin önceki kayıtları her durumda silinip baştan başlanır.
+        """
+        job = job_key(urls)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT settings FROM jobs WHERE job = ?", (job,)).fetchone()
+            invalidated = row is not None and row[0] != settings
+            if invalidated or not resume:
+                self.conn.execute("DELETE FROM entries WHERE job = ?", (job,))
+            self.conn.execute(
+                "INSERT INTO jobs (job, total, created, updated, settings) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(job) DO UPDATE SET updated = excluded.updated, settings = excluded.settings",
+                (job, len(urls), now, now, settings)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO entries (job, url, position, state, updated) VALUES (?, ?, ?, ?, ?)",
+                [(job, url, position, PENDING, now) for position, url in enumerate(urls)]
+            )
+            self._prune()
+            self.conn.commit()
+        return ExtractionJob(self, job, invalidated and resume)
+
+    def _prune(self):
+        """En eski işleri MAX_JOBS sınırına kadar siler (kilit tutulurken çağrılır)"""
+        stale = [row[0] for row in self.conn.execute(
+            "SELECT job FROM jobs ORDER BY updated DESC LIMIT -1 OFFSET ?", (MAX_JOBS,))]
+        for job in stale:
+            self.conn.execute("DELETE FROM entries WHERE job = ?", (job,))
+            self.conn.execute("DELETE FROM jobs WHERE job = ?", (job,))
+
+    def set_state(self, job, url, state, payload=None, error=None):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE entries SET state = ?, payload = ?, error = ?, updated = ?, "
+                "attempts = attempts + ? WHERE job = ? AND url = ?",
+                (state, payload, error, now, 1 if state == FETCHING else 0, job, url)
+            )
+            self.conn.execute("UPDATE jobs SET updated = ? WHERE job = ?", (now, job))
+            self.conn.commit()
+
+    def completed(self, job):
+        """Tamamlanan URL'lerin içeriklerini {url: içerik} olarak döndürür"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT url, payload FROM entries WHERE job = ? AND state = ?", (job, DONE)
+            ).fetchall()
+        return {url: json.loads(payload) for url, payload in rows}
+
+    def counts(self, job):
+        """Durum başına URL sayısı"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT state, COUNT(*) FROM entries WHERE job = ? GROUP BY state", (job,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class ExtractionJob:
+    """Tek bir seçimin günlük kayıtları"""
+
+    def __init__(self, journal, job, invalidated=False):
+        self.journal = journal
+        self.job = job
+        self.invalidated = invalidated  # Ayarlar değiştiği için önceki kayıtlar silindi
+
+    def completed(self):
+        return self.journal.completed(self.job)
+
+    def counts(self):
+        return self.journal.counts(self.job)
+
+    def mark_fetching(self, url):
+        self.journal.set_state(self.job, url, FETCHING)
+
+    def mark_done(self, url, content):
+        self.journal.set_state(self.job, url, DONE, payload=encode_payload(content))
+
+    def mark_failed(self, url, error=None):
+        self.journal.set_state(self.job, url, FAILED, error=error)
+
+
+def get_journal():
+    """Paylaşılan günlüğü döndürür (ilk çağrıda açılır)"""
+    global _journal
+    with _lock:
+        if _journal is None:
+            _journal = ExtractionJournal()
+        return _journal
+
+
+def open_job(urls, settings=None, resume=True):
+    return get_journal().open_job(urls, settings, resume)
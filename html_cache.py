@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Ham HTML önbelleği
+Wayback capture'ları değişmediği için (timestamp, orijinal URL) anahtarıyla indirilen
+sayfalar zlib ile sıkıştırılıp SQLite'ta saklanır; aynı capture içerik çekme, otomatik
+tespit, tekrar deneme veya selector penceresi için bir daha indirilmez. Toplam boyut
+sınırı aşılınca en uzun süredir kullanılmayan kayıtlar silinir (LRU)
+"""
+
+import re
+import time
+import zlib
+import sqlite3
+import threading
+from collections import namedtuple
+
+from snapshot_store import raw_capture_url
+
+DEFAULT_MAX_MB = 500
+EVICT_TARGET = 0.9  # Sınır aşılınca toplam boyut sınırın bu oranına inene kadar silinir
+COMPRESS_LEVEL = 6
+# Sadece tam (14 haneli) timestamp'li capture'lar değişmez; kısa timestamp en yakın capture'a yönlenir
+WAYBACK_CAPTURE_RE = re.compile(r'^https?://web\.archive\.org/web/(\d{14})([a-z]{2}_)?/(.+)$')
+
+CachedPage = namedtuple('CachedPage', ['body', 'content_type', 'encoding'])
+
+_cache = None
+_max_bytes = DEFAULT_MAX_MB * 1024 * 1024
+_lock = threading.Lock()
+
+
+def capture_key(url):
+    """Wayback capture URL'sinden (timestamp[+mod], orijinal URL) anahtarı üretir; capture değilse None"""
+    match = WAYBACK_CAPTURE_RE.match(url)
+    if not match:
+        return None
+    timestamp, modifier, original = match.groups()
+    return timestamp + (modifier or ''), original
+
+
+class HtmlCache:
+    """Sıkıştırılmış, boyutu sınırlı (LRU) capture önbelleği; iş parçacıkları arasında paylaşılır"""
+
+    def __init__(self, path=None, max_bytes=_max_bytes):
+        if path is None:
+            from cdx_api import app_data_path  # cdx_api -> archive_http -> html_cache döngüsü yüzünden burada
+            path = app_data_path('html_cache.sqlite3')
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                timestamp TEXT NOT NULL,
+                original TEXT NOT NULL,
+                content_type TEXT,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                raw_size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (timestamp, original)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+        self.conn.commit()
+        self.total_size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0  # Önbellekten verilen (indirilmeyen) sıkıştırılmamış bayt
+
+    def get(self, key):
+        """Kayıtlı sayfayı CachedPage olarak döndürür, yoksa None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, content_type, encoding, raw_size FROM pages WHERE timestamp = ? AND original = ?", key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute(
+                "UPDATE pages SET last_access = ? WHERE timestamp = ? AND original = ?", (time.time(), *key)
+            )
+            self.conn.commit()
+            self.hits += 1
+            self.bytes_saved += row[3]
+        return CachedPage(zlib.decompress(row[0]), row[1], row[2])
+
+    def put(self, key, content, content_type=None, encoding=None):
+        """Sayfayı sıkıştırıp saklar; sınır aşılırsa eski kayıtları siler"""
+        body = zlib.compress(content, COMPRESS_LEVEL)
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.conn.execute(
+                "SELECT size FROM pages WHERE timestamp = ? AND original = ?", key
+            ).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (timestamp, original, content_type, encoding, body, size, raw_size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, content_type, encoding, body, len(body), len(content), time.time())
+            )
+            self.total_size += len(body) - (old[0] if old else 0)
+            if self.total_size > self.max_bytes:
+                self._evict(int(self.max_bytes * EVICT_TARGET))
+            self.conn.commit()
+
+    def _evict(self, target):
+        """En eski erişilen kayıtları toplam boyut target'a inene kadar siler (kilit tutulurken çağrılır)"""
+        cursor = self.conn.execute("SELECT timestamp, original, size FROM pages ORDER BY last_access")
+        doomed = []
+        for timestamp, original, size in cursor:
+            if self.total_size <= target:
+                break
+            doomed.append((timestamp, original))
+            self.total_size -= size
+        cursor.close()
+        self.conn.executemany("DELETE FROM pages WHERE timestamp = ? AND original = ?", doomed)
+
+    def set_max_bytes(self, max_bytes):
+        with self.lock:
+            self.max_bytes = max_bytes
+            if self.total_size > max_bytes:
+                self._evict(int(max_bytes * EVICT_TARGET))
+                self.conn.commit()
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.commit()
+            self.total_size = 0
+
+    def stats(self):
+        """İsabet/ıska sayıları, isabet oranı, tasarruf edilen bayt, kayıt sayısı ve disk boyutu"""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes_saved': self.bytes_saved,
+            'entries': entries,
+            'size': self.total_size
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"HTML önbelleği: {stats['hits']} isabet, {stats['misses']} ıska (%{stats['hit_rate'] * 100:.0f}), "
+                f"{stats['bytes_saved'] / 1048576:.1f} MB indirilmedi, {stats['entries']} sayfa / {stats['size'] / 1048576:.1f} MB")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def get_cache():
+    """Paylaşılan önbelleği döndürür (ilk çağrıda açılır); kapalıysa (sınır 0) None"""
+    global _cache
+    with _lock:
+        if _max_bytes <= 0:
+            return None
+        if _cache is None:
+            _cache = HtmlCache(max_bytes=_max_bytes)
+        return _cache
+
+
+def configure(max_mb):
+    """Boyut sınırını MB olarak ayarlar; 0 önbelleği kapatır (kayıtlar silinmez)"""
+    global _max_bytes
+    with _lock:
+        _max_bytes = int(max_mb) * 1024 * 1024
+        if _cache is not None and _max_bytes > 0:
+            _cache.set_max_bytes(_max_bytes)
+
+
+def summary():
+    """Bu oturumdaki önbellek istatistikleri (kapalıysa None)"""
+    cache = get_cache()
+    return cache.summary() if cache is not None else None
+
+
+def lookup(url):
+    """URL bir capture ise ve önbellekteyse CachedPage döndürür"""
+    key = capture_key(url)
+    cache = get_cache() if key else None
+    return cache.get(key) if cache is not None else None
+
+
+def lookup_capture(url):
+    """Capture'ın önbellekteki kopyasını (CachedPage, kayıtlı adres) olarak döndürür, yoksa (None, url).
+
+    İçerik çekme ve otomatik tespit varsayılan olarak ham (id_) adresi indirdiği için önce
+    o anahtar, sonra verilen adresin kendi anahtarı aranır.
+    """
+    for candidate in dict.fromkeys((raw_capture_url(url), url)):
+        page = lookup(candidate)
+        if page is not None:
+            return page, candidate
+    return None, url
+
+
+def store(url, content, content_type=None, encoding=None):
+    """Başarılı bir capture yanıtını önbelleğe yazar (capture değilse bir şey yapmaz)"""
+    key = capture_key(url)
+    cache = get_cache() if key else None
+    if cache is not None:
+        cache.put(key, content, content_type, encoding)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Paralel kategorize
+Çok büyük domainlerde tekil URL tablosunu parçalara bölüp ProcessPoolExecutor ile
+ayrı çekirdeklerde sınıflandırır ve anahtara göre gruplar. URL tablosu işçilere
+pickle yerine paylaşımlı bellek (multiprocessing.shared_memory) üzerinden aktarılır,
+kategori kodları da aynı şekilde geri yazılır. Parça sonuçları parça sırasıyla
+birleştirildiği için çıktı sıralı yolla birebir aynıdır.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from url_canonical import canonicalize
+from url_classifier import URL_JUNK
+
+PARALLEL_MIN_URLS = 50000  # Bundan az tekil URL için süreç başlatmak kazandırmaz
+
+
+def default_worker_count():
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _share(data, size=None):
+    """bytes/array içeriğini (veya size baytlık boş alanı) yeni bir paylaşımlı bellek bloğuna koyar"""
+    raw = memoryview(data).cast('B') if data is not None else None
+    block = shared_memory.SharedMemory(create=True, size=max(size if raw is None else len(raw), 1))
+    if raw is not None:
+        block.buf[:len(raw)] = raw
+    return block
+
+
+def _classify_chunk(blob_name, offsets_name, categories_name, url_count, start, end):
+    """İşçi süreç: [start, end) aralığındaki URL'leri sınıflandırır.
+
+    Kategori ve yol kategorisi kodları paylaşımlı diziye (ilk url_count bayt kategori,
+    sonraki url_count bayt yol kategorisi) yazılır; anahtar -> URL id listesi
+    (anahtarın parçada ilk görüldüğü sırayla) döndürülür. Çöp URL'ler listeye girmez.
+    """
+    blob = shared_memory.SharedMemory(name=blob_name)
+    offsets_block = shared_memory.SharedMemory(name=offsets_name)
+    categories_block = shared_memory.SharedMemory(name=categories_name)
+    offsets = offsets_block.buf[:(url_count + 1) * 8].cast('q')
+    categories = categories_block.buf[:url_count * 2].cast('b')
+    try:
+        grouped = {}
+        for url_id in range(start, end):
+            url = bytes(blob.buf[offsets[url_id]:offsets[url_id + 1]]).decode('utf-8')
+            canonical = canonicalize(url)
+            categories[url_id] = max(canonical.category, 0)
+            categories[url_count + url_id] = max(canonical.page_category, 0)
+            if canonical.category != URL_JUNK:
+                grouped.setdefault(canonical.key, array('i')).append(url_id)
+        return list(grouped.items())
+    finally:
+        offsets.release()
+        categories.release()
+        for block in (blob, offsets_block, categories_block):
+            block.close()
+
+
+def classify_urls_parallel(urls, workers=None):
+    """URL tablosunu süreç havuzunda sınıflandırır.
+
+    Sıralı yoldaki gibi (keys, url_key_ids, url_categories, url_page_categories) döndürür:
+    anahtarlar ilk görüldükleri URL sırasıyla numaralanır, çöp URL'lerin anahtar sırası -1'dir.
+    """
+    workers = workers or default_worker_count()
+    encoded = [url.encode('utf-8') for url in urls]
+    offsets = array('q', [0])
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+    blocks = []
+    try:
+        blob = _share(b''.join(encoded))
+        blocks.append(blob)
+        offsets_block = _share(offsets)
+        blocks.append(offsets_block)
+        categories_block = _share(None, size=len(urls) * 2)
+        blocks.append(categories_block)
+        chunk_size = -(-len(urls) // workers) if urls else 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_classify_chunk, blob.name, offsets_block.name, categories_block.name,
+                            len(urls), start, min(start + chunk_size, len(urls)))
+                for start in range(0, len(urls), chunk_size)
+            ]
+            chunks = [future.result() for future in futures]
+        url_categories = array('b', bytes(categories_block.buf[:len(urls)]))
+        url_page_categories = array('b', bytes(categories_block.buf[len(urls):len(urls) * 2]))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    # Parçaların anahtar haritalarını parça sırasıyla birleştir
+    keys = []
+    key_lookup = {}
+    url_key_ids = array('i', [-1]) * len(urls)
+    for chunk in chunks:
+        for key, url_ids in chunk:
+            key_id = key_lookup.get(key)
+            if key_id is None:
+                key_id = key_lookup[key] = len(keys)
+                keys.append(key)
+            for url_id in url_ids:
+                url_key_ids[url_id] = key_id
+    return keys, url_key_ids, url_categories, url_page_categories
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Yerel snapshot indeksi
+CDX'ten çekilen snapshot'ları domain/sorgu bazında SQLite'ta saklar; tekrar keşifte
+sadece en yeni kayıttan sonraki snapshot'lar istenir
+"""
+
+import json
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+from cdx_api import app_data_path, CDX_ROW_FIELDS
+
+INSERT_BATCH_SIZE = 10000
+BUSY_TIMEOUT = 60  # Başka bir süreç yazarken bekleme süresi (sn)
+# Aynı süreçteki bağlantıların (toplu keşifte her domain kendi bağlantısını açar) yazmaları sıraya
+# alınır; WAL ile okumalar yazmaları beklemez
+_write_lock = threading.Lock()
+# timestamp/original dışındaki CDX alanları; eski indekslere ALTER TABLE ile eklenir
+EXTRA_COLUMNS = CDX_ROW_FIELDS[2:]
+# Aynı timestamp+original farklı durum/digest ile birden fazla CDX satırı olabilir; hepsi ayrı kayıttır
+IDENTITY_FIELDS = ('timestamp', 'original', 'statuscode', 'digest')
+IDENTITY_POSITIONS = tuple(CDX_ROW_FIELDS.index(field) for field in IDENTITY_FIELDS)
+
+
+def row_identity(row):
+    """CDX satırının indeksteki kimliği (timestamp, original, statuscode, digest); eksik alanlar None"""
+    return tuple(row[position] if position < len(row) else None for position in IDENTITY_POSITIONS)
+
+
+def index_query_key(params):
+    """Tarih aralığı hariç CDX sorgusundan indeks anahtarı üretir.
+
+    İndeks domainin tüm tarihlerini tutar; tarih aralığı yerelde uygulanır.
+    """
+    stable = sorted((str(k), str(v)) for k, v in params if k not in ('from', 'to'))
+    return hashlib.sha1(json.dumps(stable).encode('utf-8')).hexdigest()
+
+
+class SnapshotIndex:
+    """Domain bazlı snapshot indeksi (SQLite)"""
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path('snapshot_index.sqlite3')
+        self.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        with _write_lock:
+            self.create_schema()
+
+    def create_schema(self):
+        """Tabloları oluşturur ve eski şemayı taşır (yazma kilidi tutulurken çağrılır)"""
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS captures (
+                query_key TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                original TEXT NOT NULL,
+                statuscode TEXT,
+                mimetype TEXT,
+                length TEXT,
+                digest TEXT
+            )
+        """)
+        self.migrate()
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS captures_identity ON captures "
+            "(query_key, timestamp, original, IFNULL(statuscode, ''), IFNULL(digest, ''))"
+        )
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS queries (
+                query_key TEXT PRIMARY KEY,
+                domain TEXT NOT NULL,
+                newest_timestamp TEXT,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                complete INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def migrate(self):
+        """Sadece timestamp/original tutan eski indeks tablosuna yeni CDX alanlarını ekler.
+
+        Eski kayıtlarda bu alanlar NULL kalır (bilinmiyor); yeni sorgular farklı 'fl'
+        ile yapıldığı için farklı anahtarla baştan indekslenir.
+        """
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(captures)")}
+        for column in EXTRA_COLUMNS:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE captures ADD COLUMN {column} TEXT")
+        self.migrate_identity()
+
+    def migrate_identity(self):
+        """Eski tablodaki UNIQUE (query_key, timestamp, original) kısıtını kaldırır.
+
+        Bu kısıt aynı timestamp+original'a sahip farklı durum/digest'li satırları sessizce
+        atıyordu; tablo kısıtsız yeniden oluşturulur (sıra korunur), kimlik captures_identity
+        indeksiyle sağlanır.
+        """
+        sql = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'captures'"
+        ).fetchone()[0]
+        if 'UNIQUE' not in sql:
+            return
+        columns = ', '.join(('query_key',) + CDX_ROW_FIELDS)
+        self.conn.execute("ALTER TABLE captures RENAME TO captures_old")
+        self.conn.execute("""
+            CREATE TABLE captures (
+                query_key TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                original TEXT NOT NULL,
+                statuscode TEXT,
+                mimetype TEXT,
+                length TEXT,
+                digest TEXT
+            )
+        """)
+        self.conn.execute(f"INSERT INTO captures ({columns}) SELECT {columns} FROM captures_old ORDER BY rowid")
+        self.conn.execute("DROP TABLE captures_old")
+
+    def close(self):
+        self.conn.close()
+
+    def get_state(self, query_key):
+        """Tamamlanmış bir indeks varsa (newest_timestamp, row_count) döndürür, yoksa None"""
+        row = self.conn.execute(
+            "SELECT newest_timestamp, row_count FROM queries WHERE query_key = ? AND complete = 1",
+            (query_key,)
+        ).fetchone()
+        return row
+
+    def iter_rows(self, query_key):
+        """İndekslenmiş CDX satırlarını (CDX_ROW_FIELDS sırasıyla) eklenme sırasıyla döndürür"""
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(CDX_ROW_FIELDS)} FROM captures WHERE query_key = ? ORDER BY rowid",
+            (query_key,)
+        )
+        while True:
+            batch = cursor.fetchmany(INSERT_BATCH_SIZE)
+            if not batch:
+                break
+            yield from batch
+
+    def rows_since(self, query_key, timestamp):
+        """Verilen timestamp ve sonrasındaki kayıtların kimliklerini (row_identity) döndürür"""
+        return set(self.conn.execute(
+            f"SELECT {', '.join(IDENTITY_FIELDS)} FROM captures WHERE query_key = ? AND timestamp >= ?",
+            (query_key, timestamp)
+        ))
+
+    def begin_full(self, query_key, domain):
+        """Yarım kalmış eski kayıtları silip tam indekslemeye başlar"""
+        with _write_lock:
+            self.conn.execute("DELETE FROM captures WHERE query_key = ?", (query_key,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO queries (query_key, domain, newest_timestamp, row_count, complete, updated_at) "
+                "VALUES (?, ?, NULL, 0, 0, ?)",
+                (query_key, domain, datetime.now().isoformat(timespec='seconds'))
+            )
+            self.conn.commit()
+
+    def add_rows(self, query_key, rows):
+        """CDX satırlarını (CDX_ROW_FIELDS sırasıyla, eksik alanlar NULL) toplu ekler; zaten olanlar atlanır"""
+        if not rows:
+            return
+        width = len(CDX_ROW_FIELDS)
+        with _write_lock:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO captures (query_key, {', '.join(CDX_ROW_FIELDS)}) "
+                f"VALUES ({', '.join('?' * (width + 1))})",
+                ((query_key, *row[:width], *([None] * (width - len(row)))) for row in rows)
+            )
+            self.conn.commit()
+
+    def finish(self, query_key, newest_timestamp):
+        """İndekslemeyi tamamlanmış olarak işaretler ve en yeni timestamp'i kaydeder"""
+        with _write_lock:
+            count = self.conn.execute(
+                "SELECT COUNT(*) FROM captures WHERE query_key = ?", (query_key,)
+            ).fetchone()[0]
+            self.conn.execute(
+                "UPDATE queries SET newest_timestamp = ?, row_count = ?, complete = 1, updated_at = ? WHERE query_key = ?",
+                (newest_timestamp, count, datetime.now().isoformat(timespec='seconds'), query_key)
+            )
+            self.conn.commit()
+            return count
+
+    def clear_domain(self, domain):
+        """Bir domainin tüm indeks kayıtlarını siler"""
+        with _write_lock:
+            keys = [row[0] for row in self.conn.execute(
+                "SELECT query_key FROM queries WHERE domain = ?", (domain,)
+            )]
+            for key in keys:
+                self.conn.execute("DELETE FROM captures WHERE query_key = ?", (key,))
+            self.conn.execute("DELETE FROM queries WHERE domain = ?", (domain,))
+            self.conn.commit()
+            return len(keys)
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""
+Sütun bazlı snapshot deposu
+Her capture için ayrı sözlük tutmak yerine URL'leri tek bir tabloda, timestamp'leri
+tamsayı dizisinde saklar; archive URL'si gerektiğinde üretilir. CDX'in statuscode,
+mimetype, length ve digest alanları da sütun olarak tutulur (mimetype ve digest tablolu).
+"""
+
+import re
+from array import array
+
+from url_classifier import HTML_MIMETYPES, base_mimetype
+
+ARCHIVE_URL_PREFIX = "https://web.archive.org/web/"
+RAW_MODIFIER = 'id_'  # Wayback'in araç çubuğu ve bağlantı yeniden yazımı olmadan orijinal yanıtı veren mod
+IMAGE_MODIFIER = 'im_'  # Görsel capture modu (en yakın görsel capture'ına yönlenir)
+_CAPTURE_PREFIX_RE = re.compile(r'^(https?://web\.archive\.org/web/\d+)(?:[a-z]{2}_)?/')
+MIN_CAPTURE_LENGTH = 1024  # CDX length (sıkıştırılmış kayıt boyutu) bundan küçükse boş/yönlendirme sayfasıdır
+UNKNOWN = '-'  # CDX'te bilinmeyen alan değeri
+REVISIT_MIMETYPE = 'warc/revisit'  # İçeriği daha önceki (aynı digest'li) bir capture'a işaret eden kayıt
+DUPLICATE_DIGEST = "aynı içerik"  # Aynı digest'li daha iyi bir capture zaten denenecek
+
+
+def timestamp_to_int(timestamp):
+    """CDX timestamp'ini (YYYYMMDDhhmmss) tamsayıya çevirir; kısa olanlar sıfırla tamamlanır"""
+    return int(timestamp.ljust(14, '0'))
+
+
+def int_to_timestamp(value):
+    """Tamsayı timestamp'i 14 haneli CDX formatına geri çevirir"""
+    return f"{value:014d}"
+
+
+def capture_url(timestamp, original_url, raw=False):
+    """Capture adresini üretir; raw=True ise ham (id_) capture adresi"""
+    return f"{ARCHIVE_URL_PREFIX}{timestamp}{RAW_MODIFIER if raw else ''}/{original_url}"
+
+
+def raw_capture_url(archive_url):
+    """Bir Wayback capture adresini ham (id_) adrese çevirir; capture adresi değilse aynen döndürür"""
+    return _CAPTURE_PREFIX_RE.sub(lambda match: f"{match.group(1)}{RAW_MODIFIER}/", archive_url, count=1)
+
+
+def _int_field(value, unknown):
+    """CDX sayı alanını tamsayıya çevirir ('-', boş veya None ise unknown)"""
+    return int(value) if value and value.isdigit() else unknown
+
+
+def _intern(value, table, lookup):
+    """Tekrarlanan metin alanını tabloya bir kez ekleyip sırasını döndürür (bilinmiyorsa -1)"""
+    if not value or value == UNKNOWN:
+        return -1
+    value_id = lookup.get(value)
+    if value_id is None:
+        value_id = lookup[value] = len(table)
+        table.append(value)
+    return value_id
+
+
+class SnapshotStore:
+    """Snapshot'ları sütunlar halinde tutan kap (URL tablosu + url id / timestamp dizileri)"""
+
+    def __init__(self):
+        self.urls = []              # Tekil orijinal URL'ler
+        self.url_lookup = {}        # orijinal URL -> urls içindeki sıra
+        self.url_ids = array('i')   # capture -> URL id
+        self.timestamps = array('q')  # capture -> YYYYMMDDhhmmss (tamsayı)
+        self.statuses = array('h')  # capture -> HTTP durum kodu (0: bilinmiyor)
+        self.mimetypes = []         # Tekil mimetype'lar
+        self.mimetype_lookup = {}
+        self.mimetype_ids = array('h')  # capture -> mimetype id (-1: bilinmiyor)
+        self.lengths = array('i')   # capture -> CDX length (-1: bilinmiyor)
+        self.digests = []           # Tekil içerik özetleri (aynı içerikli capture'lar aynı id'yi alır)
+        self.digest_lookup = {}
+        self.digest_ids = array('i')  # capture -> digest id (-1: bilinmiyor)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        for index in range(len(self.timestamps)):
+            yield SnapshotRecord(self, index)
+
+    def __getitem__(self, index):
+        return SnapshotRecord(self, index)
+
+    def append(self, timestamp, original_url, statuscode=None, mimetype=None, length=None, digest=None):
+        """Bir CDX satırını (CDX_ROW_FIELDS sırasıyla, eksik alanlar bilinmiyor sayılır) ekler ve sırasını döndürür"""
+        url_id = self.url_lookup.get(original_url)
+        if url_id is None:
+            url_id = len(self.urls)
+            self.urls.append(original_url)
+            self.url_lookup[original_url] = url_id
+        self.url_ids.append(url_id)
+        self.timestamps.append(timestamp_to_int(timestamp))
+        self.statuses.append(_int_field(statuscode, 0))
+        self.mimetype_ids.append(_intern(mimetype, self.mimetypes, self.mimetype_lookup))
+        self.lengths.append(min(_int_field(length, -1), 2 ** 31 - 1))
+        self.digest_ids.append(_intern(digest, self.digests, self.digest_lookup))
+        return len(self.timestamps) - 1
+
+    def original_url(self, index):
+        return self.urls[self.url_ids[index]]
+
+    def timestamp(self, index):
+        return int_to_timestamp(self.timestamps[index])
+
+    def archive_url(self, index):
+        return capture_url(self.timestamp(index), self.original_url(index))
+
+    def statuscode(self, index):
+        return self.statuses[index] or None
+
+    def mimetype(self, index):
+        mimetype_id = self.mimetype_ids[index]
+        return self.mimetypes[mimetype_id] if mimetype_id >= 0 else None
+
+    def length(self, index):
+        length = self.lengths[index]
+        return length if length >= 0 else None
+
+    def digest(self, index):
+        digest_id = self.digest_ids[index]
+        return self.digests[digest_id] if digest_id >= 0 else None
+
+    def extraction_skip_reason(self, index):
+        """Capture içerik çekmeye değmiyorsa nedenini, değiyorsa None döndürür.
+
+        Sadece CDX'te bilinen alanlara bakılır; alan yoksa (eski indeks) capture denenir.
+        """
+        status = self.statuses[index]
+        if status and status != 200:
+            return f"HTTP {status}"
+        mimetype = self.mimetype(index)
+        if mimetype == REVISIT_MIMETYPE:
+            return None  # Kayıt küçüktür ama Wayback önceki içeriği oynatır
+        if mimetype and base_mimetype(mimetype) not in HTML_MIMETYPES:
+            return mimetype
+        length = self.lengths[index]
+        if 0 <= length < MIN_CAPTURE_LENGTH:
+            return f"{length} bayt"
+        return None
+
+    def iter_rows(self):
+        """Kayıtları CDX satırları (CDX_ROW_FIELDS sırasıyla) olarak döndürür"""
+        urls, mimetypes, digests = self.urls, self.mimetypes, self.digests
+        for url_id, value, status, mimetype_id, length, digest_id in zip(
+                self.url_ids, self.timestamps, self.statuses, self.mimetype_ids, self.lengths, self.digest_ids):
+            yield (int_to_timestamp(value), urls[url_id],
+                   str(status) if status else UNKNOWN,
+                   mimetypes[mimetype_id] if mimetype_id >= 0 else UNKNOWN,
+                   str(length) if length >= 0 else UNKNOWN,
+                   digests[digest_id] if digest_id >= 0 else UNKNOWN)
+
+    def record(self, index, key=None, timeline=None):
+        """Gruplanmış bir capture için kayıt görünümü döndürür"""
+        return SnapshotRecord(self, index, key, timeline)
+
+    def timeline(self, indices, presorted=False):
+        """Verilen capture sıralarından zamana göre sıralı ortak bir zaman çizelgesi oluşturur"""
+        return UrlTimeline(self, indices, presorted)
+
+
+class UrlTimeline:
+    """Bir URL anahtarının tüm capture'ları, eskiden yeniye sıralı.
+
+    Gruptaki her kayıt aynı nesneyi paylaşır; eleman erişimi timestamp
+    string'leri döndürdüğü için eski 'all_snapshots' listesinin yerine geçer.
+    """
+
+    __slots__ = ('store', 'indices', 'values')
+
+    def __init__(self, store, indices, presorted=False):
+        timestamps = store.timestamps
+        self.store = store
+        if presorted:
+            self.indices = indices if isinstance(indices, array) else array('i', indices)
+        else:
+            self.indices = array('i', sorted(indices, key=timestamps.__getitem__))
+        self.values = array('q', map(timestamps.__getitem__, self.indices))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        for value in self.values:
+            yield int_to_timestamp(value)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [int_to_timestamp(value) for value in self.values[position]]
+        return int_to_timestamp(self.values[position])
+
+    def __eq__(self, other):
+        if isinstance(other, UrlTimeline):
+            return self.values == other.values
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def newest_first(self):
+        """Timestamp'leri yeniden eskiye döndürür (içerik çekerken denenecek sıra)"""
+        return [int_to_timestamp(value) for value in reversed(self.values)]
+
+    def extraction_captures(self):
+        """İçerik çekmeye değer capture'ları denenecek sırayla döndürür.
+
+        CDX alanlarına göre boş/yönlendirme/HTML olmayan capture'lar istek yapılmadan
+        elenir. Kalanlar beklenen kaliteye göre sıralanır (önce durum 200, sonra büyük
+        length, sonra yeni) ve aynı digest'li (bayt bayt aynı) capture'lardan sadece
+        ilki tutulur. ((timestamp, orijinal URL) listesi, {neden: atlanan sayısı}) döner.
+
+        URL anahtarı farklı orijinal URL'leri (şema, www, port, index.html ...) gruplayabildiği
+        için her capture kendi orijinal URL'siyle istenmelidir; aksi halde Wayback başka bir
+        URL'nin en yakın capture'ına yönlendirir.
+        """
+        store = self.store
+        statuses, lengths, digest_ids = store.statuses, store.lengths, store.digest_ids
+        candidates = []
+        skipped = {}
+        for index, value in zip(self.indices, self.values):
+            reason = store.extraction_skip_reason(index)
+            if reason is None:
+                # Bilinmeyen durum/length (0/-1) bilinen iyi değerlerin arkasına düşer
+                candidates.append((statuses[index] != 200, -lengths[index], -value, digest_ids[index], index))
+            else:
+                skipped[reason] = skipped.get(reason, 0) + 1
+        candidates.sort()
+        captures = []
+        seen_digests = set()
+        for _, _, value, digest_id, index in candidates:
+            if digest_id >= 0:
+                if digest_id in seen_digests:
+                    skipped[DUPLICATE_DIGEST] = skipped.get(DUPLICATE_DIGEST, 0) + 1
+                    continue
+                seen_digests.add(digest_id)
+            captures.append((int_to_timestamp(-value), store.original_url(index)))
+        return captures, skipped
+
+    def latest_index(self):
+        """En yeni capture'ın depodaki sırası"""
+        return self.indices[-1] if self.indices else None
+
+    def __repr__(self):
+        return f"UrlTimeline({len(self.values)} capture)"
+
+
+class RecordList:
+    """Bir URL anahtarının bir kategorideki capture'ları.
+
+    Liste gibi okunur (len, indeks, döngü, reverse); SnapshotRecord görünümleri
+    her capture için önceden değil, erişildikçe üretilir.
+    """
+
+    __slots__ = ('timeline', 'key', 'indices', 'newest_first')
+
+    def __init__(self, timeline, key, indices=None):
+        self.timeline = timeline
+        self.key = key
+        self.indices = timeline.indices if indices is None else indices  # Eskiden yeniye
+        self.newest_first = False
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self.indices)))]
+        size = len(self.indices)
+        if position < 0:
+            position += size
+        if not 0 <= position < size:
+            raise IndexError(position)
+        if self.newest_first:
+            position = size - 1 - position
+        return SnapshotRecord(self.timeline.store, self.indices[position], self.key, self.timeline)
+
+    def __iter__(self):
+        store, key, timeline = self.timeline.store, self.key, self.timeline
+        indices = reversed(self.indices) if self.newest_first else self.indices
+        for index in indices:
+            yield SnapshotRecord(store, index, key, timeline)
+
+    def reverse(self):
+        self.newest_first = not self.newest_first
+
+    def __repr__(self):
+        return f"RecordList({self.key!r}, {len(self.indices)} capture)"
+
+
+class SnapshotRecord:
+    """Depodaki tek bir capture'ın görünümü.
+
+    Eski url_info sözlükleriyle uyumlu olması için ['url'], .get() ve sonradan
+    eklenen alanlar ('failed', 'fail_reason' gibi) desteklenir.
+    """
+
+    __slots__ = ('store', 'index', 'key', 'timeline', 'extra')
+
+    FIELDS = ('url', 'archive_url', 'timestamp', 'all_snapshots', 'original_url',
+              'statuscode', 'mimetype', 'length', 'digest')
+
+    def __init__(self, store, index, key=None, timeline=None):
+        self.store = store
+        self.index = index
+        self.key = key            # Gruplama anahtarı (smart_url_key), ham capture'da None
+        self.timeline = timeline  # Aynı anahtarın UrlTimeline'ı (grup içinde paylaşılır)
+        self.extra = None         # Sonradan eklenen alanlar, gerekince oluşturulur
+
+    @property
+    def original_url(self):
+        return self.store.original_url(self.index)
+
+    @property
+    def url(self):
+        return self.key if self.key is not None else self.original_url
+
+    @property
+    def timestamp(self):
+        return self.store.timestamp(self.index)
+
+    @property
+    def timestamp_value(self):
+        return self.store.timestamps[self.index]
+
+    @property
+    def archive_url(self):
+        return self.store.archive_url(self.index)
+
+    @property
+    def all_snapshots(self):
+        return self.timeline
+
+    @property
+    def statuscode(self):
+        return self.store.statuscode(self.index)
+
+    @property
+    def mimetype(self):
+        return self.store.mimetype(self.index)
+
+    @property
+    def length(self):
+        return self.store.length(self.index)
+
+    @property
+    def digest(self):
+        return self.store.digest(self.index)
+
+    def __getitem__(self, name):
+        if self.extra and name in self.extra:
+            return self.extra[name]
+        if name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                return value
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        if self.extra is None:
+            self.extra = {}
+        self.extra[name] = value
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def keys(self):
+        names = [name for name in self.FIELDS if name in self]
+        if self.extra:
+            names.extend(name for name in self.extra if name not in names)
+        return names
+
+    def to_dict(self):
+        return {name: self[name] for name in self.keys()}
+
+    def __eq__(self, other):
+        if isinstance(other, SnapshotRecord):
+            return (self.url, self.original_url, self.timestamp_value) == (other.url, other.original_url, other.timestamp_value)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.url, self.original_url, self.timestamp_value))
+
+    def __repr__(self):
+        return f"SnapshotRecord({self.url!r}, {self.timestamp!r})"
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Asenkron istek motoru testleri
+Yerel bir http.server taslağına karşı eşzamanlılık, 429/Retry-After ve aiohttp
+yokken requests'e geri dönüş davranışını doğrular.
+
+Kullanım: python -m pytest tests  (veya python -m unittest discover tests)
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import archive_http  # noqa: E402
+import async_fetch  # noqa: E402
+import html_cache  # noqa: E402
+
+SLOW_DELAY = 0.3  # /slow isteklerinin sunucuda beklediği süre (sn)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/slow: bekleyip 200, /throttle: ilk istekte 429 + Retry-After, sonra 200"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if self.path.startswith('/slow'):
+                time.sleep(SLOW_DELAY)
+                self.reply(200, b'ok')
+            elif self.path.startswith('/throttle'):
+                with server.lock:
+                    server.throttle_hits += 1
+                    first = server.throttle_hits == 1
+                if first:
+                    self.reply(429, b'slow down', {'Retry-After': '1'})
+                else:
+                    self.reply(200, b'ok')
+            else:
+                self.reply(404, b'not found')
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512  # Eşzamanlı bağlantılar listen kuyruğunda beklemesin
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.throttle_hits = 0
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class AsyncFetchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        # Testler ortak hız denetleyicisini ve önbellek ayarını değiştirmesin
+        self.saved_controller = archive_http.RATE_CONTROLLER
+        archive_http.RATE_CONTROLLER = archive_http.AdaptiveRateController(1000)
+        self.saved_cache_mb = html_cache._max_bytes // (1024 * 1024)
+        html_cache.configure(0)
+
+    def tearDown(self):
+        async_fetch.disable()
+        archive_http.RATE_CONTROLLER = self.saved_controller
+        html_cache.configure(self.saved_cache_mb)
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@unittest.skipUnless(async_fetch.is_available(), "aiohttp kurulu değil")
+class EngineTests(AsyncFetchTestCase):
+
+    def test_requests_run_concurrently(self):
+        engine = async_fetch.enable(max_in_flight=50)
+        urls = [self.server.url(f'/slow?{i}') for i in range(50)]
+        start = time.monotonic()
+        results = list(engine.iter_fetch(urls))
+        elapsed = time.monotonic() - start
+        self.assertEqual([url for url, _ in results], urls)
+        self.assertTrue(all(response.status_code == 200 for _, response in results))
+        # Sıralı 50 * 0.3 = 15 sn sürerdi
+        self.assertLess(elapsed, 5)
+        self.assertGreater(self.server.peak, 10)
+
+    def test_in_flight_limit(self):
+        engine = async_fetch.enable(max_in_flight=5)
+        list(engine.iter_fetch([self.server.url(f'/slow?{i}') for i in range(20)]))
+        self.assertLessEqual(self.server.peak, 5)
+
+    def test_429_backs_off_and_honours_retry_after(self):
+        async_fetch.enable()
+        controller = archive_http.RATE_CONTROLLER
+        rate_before = controller.rate
+        first = archive_http.get(self.server.url('/throttle'))
+        self.assertEqual(first.status_code, 429)
+        self.assertLess(controller.rate, rate_before)
+        start = time.monotonic()
+        second = archive_http.get(self.server.url('/throttle'))
+        self.assertEqual(second.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+
+    def test_connection_errors_become_requests_exceptions(self):
+        async_fetch.enable()
+        with self.assertRaises(archive_http.requests.exceptions.ConnectionError):
+            archive_http.get('http://127.0.0.1:1/', timeout=5)
+
+    def test_disable_restores_requests_session(self):
+        async_fetch.enable()
+        async_fetch.disable()
+        self.assertIsNone(archive_http.get_engine())
+        self.assertEqual(archive_http.get(self.server.url('/slow')).status_code, 200)
+
+
+class FallbackTests(AsyncFetchTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.saved_aiohttp = async_fetch.aiohttp
+        async_fetch.aiohttp = None
+
+    def tearDown(self):
+        async_fetch.aiohttp = self.saved_aiohttp
+        super().tearDown()
+
+    def test_enable_fails_without_aiohttp(self):
+        self.assertFalse(async_fetch.is_available())
+        with self.assertRaises(RuntimeError):
+            async_fetch.enable()
+        self.assertIsNone(archive_http.get_engine())
+
+    def test_requests_still_work_without_aiohttp(self):
+        try:
+            async_fetch.enable()
+        except RuntimeError:
+            pass
+        response = archive_http.get(self.server.url('/slow'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+AIMD hız denetleyicisi testleri
+Sağlıklı yanıtlarla hızın üst sınıra kadar artmasını, 429/503'te yarıya inmesini
+ve diğer hata kodlarının hızı değiştirmemesini doğrular.
+
+Kullanım: python -m pytest tests  (veya python -m unittest discover tests)
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import archive_http  # noqa: E402
+
+
+class AdaptiveRateControllerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = archive_http.AdaptiveRateController(1.0, max_rate=2.0)
+
+    def test_default_controller_starts_below_ceiling(self):
+        self.assertLess(archive_http.DEFAULT_START_RATE, archive_http.DEFAULT_MAX_RATE)
+
+    def test_healthy_responses_raise_rate_up_to_max_then_429_halves(self):
+        controller = self.controller
+        previous = controller.rate
+        for _ in range(5):
+            controller.record(200)
+            self.assertGreater(controller.rate, previous)
+            previous = controller.rate
+        for _ in range(50):
+            controller.record(200)
+        self.assertAlmostEqual(controller.rate, 2.0)
+        controller.record(429, retry_after=0)
+        self.assertAlmostEqual(controller.rate, 1.0)
+
+    def test_503_halves_rate(self):
+        self.controller.record(503, retry_after=0)
+        self.assertAlmostEqual(self.controller.rate, 0.5)
+
+    def test_other_errors_are_neutral(self):
+        for status in (404, 410, 500, 502, 504):
+            self.controller.record(status)
+            self.assertAlmostEqual(self.controller.rate, 1.0)
+
+    def test_redirects_count_as_healthy(self):
+        self.controller.record(302)
+        self.assertAlmostEqual(self.controller.rate, 1.0 + archive_http.RATE_INCREASE)
+
+    def test_lowering_max_rate_caps_current_rate(self):
+        for _ in range(50):
+            self.controller.record(200)
+        self.controller.set_max_rate(1.5)
+        self.assertAlmostEqual(self.controller.rate, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+URL kanonikleştirme
+normalize_url / smart_url_key / kategori sonuçlarını ham orijinal URL'ye göre
+sınırlı bir önbellekte tutar; CDX çıktısında binlerce kez tekrarlanan URL'ler
+keşif, URL seçim penceresi ve içerik çekme sırasında tek sözlük aramasına iner
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from url_classifier import classify_url, classify_path, URL_JUNK, URL_BLOG_POST
+
+CANONICAL_CACHE_SIZE = 200000
+
+# page_category: uzantıya bakmadan yol kurallarıyla kategori (mimetype HTML derse kullanılır)
+CanonicalUrl = namedtuple('CanonicalUrl', ['normalized', 'key', 'category', 'port', 'page_category'])
+
+
+def normalize_url(url):
+    """URL'yi normalize eder"""
+    # Port numarasını kaldır - liste için normalize et
+    parsed = urlparse(url)
+    if parsed.port:
+        url = url.replace(f":{parsed.port}", "")
+    return url
+
+
+def smart_url_key(url):
+    """Aynı içeriğin varyasyonlarını (feed, amp, index.html, www...) tek anahtarda toplar"""
+    parsed = urlparse(url)
+    path = parsed.path
+    # Varyasyonları (feed, amp, embed, print, trackback) ana yazıya bağla
+    for suffix in ['/feed', '/amp', '/embed', '/print', '/trackback']:
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+    # Sonunda / varsa kaldır (kök dizin hariç)
+    if path.endswith('/') and path != '/':
+        path = path[:-1]
+    # index.html, index.php, index.htm kaldır
+    for idx in ['index.html', 'index.php', 'index.htm']:
+        if path.endswith('/'+idx):
+            path = path[:-(len(idx)+1)]
+    # .html, .htm kaldır
+    for ext in ['.html', '.htm']:
+        if path.endswith(ext):
+            path = path[:-len(ext)]
+    # Anahtar host önekiyle başlar; alt alan adları (blog., m., en.) birbirine karışmaz.
+    # Sadece baştaki www kaldırılır, host içindeki 'www.' dizgisine dokunulmaz
+    netloc = parsed.netloc.lower()
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    return f"{netloc}{path}".lower()
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonicalize(original_url):
+    """Ham orijinal URL için (normalized, key, category, port, page_category) döndürür; sonuç önbelleğe alınır"""
+    port = urlparse(original_url).port
+    normalized = original_url.replace(f":{port}", "") if port else original_url
+    category = classify_url(normalized)
+    if category >= URL_BLOG_POST or category == URL_JUNK:
+        page_category = category
+    else:
+        page_category = classify_path(normalized)
+    return CanonicalUrl(normalized, smart_url_key(normalized), category, port, page_category)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def url_domain(url):
+    """URL'nin (archive.org URL'si ise orijinal sitenin) domainini port dahil döndürür"""
+    parsed_url = urlparse(url if url.startswith('http') else f'http://{url}')
+    # Eğer archive.org URL'si ise, orijinal domain'i çıkar
+    if 'web.archive.org' in parsed_url.netloc:
+        path_parts = parsed_url.path.split('/')
+        if len(path_parts) > 5:
+            # /web/timestamp/http/www.domain.com/path formatından orijinal URL'yi al
+            original_url = 'http://' + '/'.join(path_parts[5:])
+            return urlparse(original_url).netloc
+    return parsed_url.netloc  # Bu port'u da içerir
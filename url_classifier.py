@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+URL sınıflandırıcı
+Her URL'yi bir kez ayrıştırıp önceden derlenmiş desenlerle tek geçişte kategori
+koduna çevirir (eski is_junk_url / is_extra_junk / is_image / is_document /
+is_blog_post / is_page zinciriyle aynı sonuçları verir). CDX mimetype'ı biliniyorsa
+uzantıdan yapılan görsel/doküman tahmini capture bazında düzeltilir.
+"""
+
+import re
+from urllib.parse import urlparse
+
+# Kategori kodları; categorize_and_group_urls sözlüğündeki anahtarlarla aynı sırada
+URL_JUNK = -1
+URL_IMAGE = 0
+URL_DOCUMENT = 1
+URL_BLOG_POST = 2
+URL_PAGE = 3
+URL_OTHER = 4
+CATEGORY_NAMES = ('images', 'documents', 'blog_posts', 'pages', 'other')
+MIME_HTML = 5  # mimetype_category: HTML sayfa, kategori URL yolundan belirlenir
+
+JUNK_PATTERNS = [
+    r'wp-login\.php', r'wp-admin', r'/feed/', r'/comments/feed/',
+    r'/sitemap\.xml', r'/robots\.txt', r'\.json$', r'\.xml$', r'\.css$', r'\.js$',
+    r'\?replytocom', r'\.gz$', r'\.zip$', r'\.rar$', r'\.tar\.gz$'
+]
+EXTRA_JUNK_PATTERNS = [
+    r'wp-json', r'wp-includes', r'wp-content', r'contact-form-7', r'oembed',
+    r'\.(?:js|css|jpg|jpeg|png|gif|svg|ico|xml|json|woff|ttf|pdf|zip|gz|tar|mp4|mp3|webp'
+    r'|avi|mov|wmv|flv|mkv|apk|exe|bin|dmg|msi|rar)$'
+]
+JUNK_RE = re.compile('|'.join(JUNK_PATTERNS), re.IGNORECASE)
+EXTRA_JUNK_RE = re.compile('|'.join(EXTRA_JUNK_PATTERNS), re.IGNORECASE)
+
+# Sınıflandırmada ikisi tek desende: önce alt dizgiler, sonra tek bir uzantı grubu
+ANY_JUNK_RE = re.compile(
+    r'wp-(?:login\.php|admin|json|includes|content)|contact-form-7|oembed'
+    r'|/(?:feed/|sitemap\.xml|robots\.txt)|\?replytocom'
+    r'|\.(?:js|css|json|xml|jpg|jpeg|png|gif|svg|ico|webp|woff|ttf|pdf|zip|gz|tar|rar'
+    r'|mp4|mp3|avi|mov|wmv|flv|mkv|apk|exe|bin|dmg|msi)$',
+    re.IGNORECASE
+)
+# ASCII URL'lerde aynı kontrol küçük harfli metin üzerinde düz alt dizgi/uzantı aramasıyla yapılır
+JUNK_SUBSTRINGS = (
+    'wp-login.php', 'wp-admin', 'wp-json', 'wp-includes', 'wp-content', 'contact-form-7', 'oembed',
+    '/feed/', '/sitemap.xml', '/robots.txt', '?replytocom'
+)
+JUNK_EXTENSIONS = (
+    '.js', '.css', '.json', '.xml', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico', '.webp', '.woff',
+    '.ttf', '.pdf', '.zip', '.gz', '.tar', '.rar', '.mp4', '.mp3', '.avi', '.mov', '.wmv', '.flv',
+    '.mkv', '.apk', '.exe', '.bin', '.dmg', '.msi'
+)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg', '.ico')
+DOCUMENT_EXTENSIONS = ('.pdf', '.doc', '.docx', '.txt', '.rtf', '.xls', '.xlsx', '.ppt', '.pptx')
+
+HTML_MIMETYPES = ('text/html', 'application/xhtml+xml')
+DOCUMENT_MIMETYPES = (
+    'application/pdf', 'application/msword', 'application/rtf', 'text/rtf', 'text/plain',
+    'application/vnd.ms-excel', 'application/vnd.ms-powerpoint'
+)
+DOCUMENT_MIMETYPE_PREFIXES = ('application/vnd.openxmlformats-officedocument.', 'application/vnd.oasis.opendocument.')
+
+# is_blog_post'un ilk üç kuralı (küçük harfli path üzerinde)
+BLOG_POST_RE = re.compile(
+    r'\.(?:html|php|asp|aspx|htm)$'
+    r'|^/\d{4}/\d{2}/.+'
+    r'|/(?:blog|post|yazi|makale|haber|entry|story)/'
+)
+DIGITS_RE = re.compile(r'^\d+$')
+
+PAGE_RE = re.compile(
+    r'/page/|/sayfa/|/index|/home|^/$'
+    r'|/kategori/|/category/|/etiket/|/tag/'
+    r'|/author/|/yazar/|/arsiv/|/archive/'
+    r'|/search/|\?s=|^/\d{4}/\d{2}(?:/\d{2})?/?$'
+)
+
+
+def is_junk_url(url):
+    """İstenmeyen/sistem URL'si mi?"""
+    return JUNK_RE.search(url) is not None
+
+
+def is_extra_junk(url):
+    """WordPress sistem yolu veya statik/medya dosyası mı?"""
+    return EXTRA_JUNK_RE.search(url) is not None
+
+
+def is_image(url):
+    return url.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def is_document(url):
+    return url.lower().endswith(DOCUMENT_EXTENSIONS)
+
+
+def is_blog_post_path(path):
+    """Küçük harfe çevrilmiş path blog yazısına mı benziyor?"""
+    if BLOG_POST_RE.search(path):
+        return True
+    # Son segmenti sayı olmayanlar (ve en az iki segment)
+    segments = path.strip('/')
+    return '/' in segments and not DIGITS_RE.match(segments.rsplit('/', 1)[-1])
+
+
+def is_blog_post(url):
+    return is_blog_post_path(urlparse(url).path.lower())
+
+
+def is_page(url):
+    return PAGE_RE.search(urlparse(url).path.lower()) is not None
+
+
+def base_mimetype(mimetype):
+    """'text/html; charset=utf-8' -> 'text/html'"""
+    return mimetype.split(';', 1)[0].strip().lower()
+
+
+def mimetype_category(mimetype):
+    """CDX mimetype'ından kategori kodu: URL_IMAGE, URL_DOCUMENT, MIME_HTML veya belirsizse None"""
+    if not mimetype:
+        return None
+    mimetype = base_mimetype(mimetype)
+    if mimetype.startswith('image/'):
+        return URL_IMAGE
+    if mimetype in DOCUMENT_MIMETYPES or mimetype.startswith(DOCUMENT_MIMETYPE_PREFIXES):
+        return URL_DOCUMENT
+    if mimetype in HTML_MIMETYPES:
+        return MIME_HTML
+    return None
+
+
+def classify_path(url):
+    """Uzantıya bakmadan sadece yola göre yazı / sayfa / diğer kodunu döndürür"""
+    path = urlparse(url).path.lower()
+    if is_blog_post_path(path):
+        return URL_BLOG_POST
+    if PAGE_RE.search(path):
+        return URL_PAGE
+    return URL_OTHER
+
+
+def refine_category(category, page_category, mime_category):
+    """URL'den tahmin edilen kategoriyi capture'ın mimetype kategorisiyle düzeltir.
+
+    Görsel/doküman mimetype'ı uzantıdan bağımsız kazanır; uzantı görsel/doküman dese de
+    sunucu HTML döndürdüyse (ek sayfası gibi) yol kuralları uygulanır.
+    """
+    if category == URL_JUNK or mime_category is None:
+        return category
+    if mime_category == MIME_HTML:
+        return page_category if category in (URL_IMAGE, URL_DOCUMENT) else category
+    return mime_category
+
+
+def classify_url(url):
+    """Normalize edilmiş URL için kategori kodunu döndürür (URL_JUNK ise listeye alınmaz)"""
+    lowered = url.lower()
+    if url.isascii() and not url.endswith('\n'):
+        # Hızlı yol: büyük/küçük harf duyarsız regex ile birebir aynı sonucu verir
+        if lowered.endswith(JUNK_EXTENSIONS) or any(part in lowered for part in JUNK_SUBSTRINGS):
+            return URL_JUNK
+    elif ANY_JUNK_RE.search(url):
+        return URL_JUNK
+    if lowered.endswith(IMAGE_EXTENSIONS):
+        return URL_IMAGE
+    if lowered.endswith(DOCUMENT_EXTENSIONS):
+        return URL_DOCUMENT
+    path = urlparse(url).path.lower()
+    if is_blog_post_path(path):
+        return URL_BLOG_POST
+    if PAGE_RE.search(path):
+        return URL_PAGE
+    return URL_OTHER